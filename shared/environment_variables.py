@@ -11,6 +11,159 @@ AI_API_URL = os.environ.get("AI_API_URL", "https://api.dashboard.vericore.dfusio
 
 USE_HTML_PARSER_API = os.environ.get("USE_HTML_PARSER_API", "False").lower() == 'true'
 HTML_PARSER_API_URL = os.environ.get("HTML_PARSER_API_URL", "https://api.snippet-fetcher.vericore.dfusion.ai")
+# Micro-batch concurrent parser API renders into POST /render_batch (falls back to /render if the server lacks it).
+# The remote parser service must implement /render_batch (see HtmlParserApiClient) before this is turned on
+USE_HTML_PARSER_API_BATCHING = os.environ.get("USE_HTML_PARSER_API_BATCHING", "False").lower() == 'true'
+HTML_PARSER_API_BATCH_MAX_SIZE = int(os.environ.get("HTML_PARSER_API_BATCH_MAX_SIZE", "16"))
+HTML_PARSER_API_BATCH_MAX_WAIT_MS = float(os.environ.get("HTML_PARSER_API_BATCH_MAX_WAIT_MS", "20"))
+HTML_PARSER_API_MAX_CONCURRENT_BATCHES = int(os.environ.get("HTML_PARSER_API_MAX_CONCURRENT_BATCHES", "4"))
+
+# Snippet fetcher: in-memory page cache (successful FetchPageResult per URL, LRU bounded by total page text size)
+USE_PAGE_CACHE = os.environ.get("USE_PAGE_CACHE", "True").lower() == 'true'
+PAGE_CACHE_MAX_BYTES = int(os.environ.get("PAGE_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+PAGE_CACHE_TTL_SECONDS = float(os.environ.get("PAGE_CACHE_TTL_SECONDS", "600"))
+
+# Snippet fetcher: on-disk page store (survives restarts; stale HTTP pages are revalidated with ETag/Last-Modified)
+USE_PAGE_STORE = os.environ.get("USE_PAGE_STORE", "True").lower() == 'true'
+# Absolute, so the store does not move with the working directory the validator is started from
+PAGE_STORE_DIR = os.path.abspath(os.path.expanduser(os.environ.get("PAGE_STORE_DIR", "~/.cache/vericore/page_store")))
+PAGE_STORE_HTTP_TTL_SECONDS = float(os.environ.get("PAGE_STORE_HTTP_TTL_SECONDS", str(15 * 60)))
+PAGE_STORE_SELENIUM_TTL_SECONDS = float(os.environ.get("PAGE_STORE_SELENIUM_TTL_SECONDS", str(6 * 60 * 60)))
+PAGE_STORE_MAX_AGE_SECONDS = float(os.environ.get("PAGE_STORE_MAX_AGE_SECONDS", str(7 * 24 * 60 * 60)))
+# Entries older than PAGE_STORE_MAX_AGE_SECONDS are pruned by a background task this often
+PAGE_STORE_PRUNE_INTERVAL_SECONDS = float(os.environ.get("PAGE_STORE_PRUNE_INTERVAL_SECONDS", str(60 * 60)))
+
+# Snippet fetcher: URL canonicalization for page cache / page store keys (https, no tracking params or fragment) and memory of permanent (301/308) redirects, so later fetches go straight to the final URL
+USE_URL_CANONICALIZATION = os.environ.get("USE_URL_CANONICALIZATION", "True").lower() == 'true'
+REDIRECT_MEMORY_MAX_ENTRIES = int(os.environ.get("REDIRECT_MEMORY_MAX_ENTRIES", "50000"))
+REDIRECT_MEMORY_TTL_SECONDS = float(os.environ.get("REDIRECT_MEMORY_TTL_SECONDS", str(24 * 60 * 60)))
+
+# Snippet fetcher: popularity prefetch - pages cited at least PAGE_PREFETCH_MIN_CITATIONS times (decaying counts) are
+# refreshed into the page cache every interval while no validation fetch is running, within a concurrency and
+# downloaded-bytes budget per interval
+USE_PAGE_PREFETCH = os.environ.get("USE_PAGE_PREFETCH", "False").lower() == 'true'
+PAGE_PREFETCH_MAX_PAGES = int(os.environ.get("PAGE_PREFETCH_MAX_PAGES", "50"))
+PAGE_PREFETCH_MIN_CITATIONS = int(os.environ.get("PAGE_PREFETCH_MIN_CITATIONS", "3"))
+PAGE_PREFETCH_INTERVAL_SECONDS = float(os.environ.get("PAGE_PREFETCH_INTERVAL_SECONDS", "60"))
+PAGE_PREFETCH_CONCURRENCY = int(os.environ.get("PAGE_PREFETCH_CONCURRENCY", "2"))
+PAGE_PREFETCH_MAX_BYTES_PER_INTERVAL = int(os.environ.get("PAGE_PREFETCH_MAX_BYTES_PER_INTERVAL", str(20 * 1024 * 1024)))
+PAGE_PREFETCH_IDLE_SECONDS = float(os.environ.get("PAGE_PREFETCH_IDLE_SECONDS", "2"))
+
+# Snippet verification: normalized page text cached per page text (LRU bounded by the size of page + normalized text)
+NORMALIZED_TEXT_CACHE_MAX_BYTES = int(os.environ.get("NORMALIZED_TEXT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Verify snippets citing the same page together (one exact-match scan for all, pyahocorasick if installed). A lone
+# snippet is not held back; while a batch for its page runs, the next ones are collected for up to
+# SNIPPET_VERIFICATION_BATCH_MAX_WAIT_MS
+USE_SNIPPET_VERIFICATION_BATCHING = os.environ.get("USE_SNIPPET_VERIFICATION_BATCHING", "True").lower() == 'true'
+SNIPPET_VERIFICATION_BATCH_MAX_WAIT_MS = float(os.environ.get("SNIPPET_VERIFICATION_BATCH_MAX_WAIT_MS", "5"))
+# Snippet validation compute (page normalization + snippet matching in worker processes, sentence embeddings in threads)
+# runs on bounded per-stage pools instead of the event loop. Event-loop lag is sampled and logged with the pool stats
+USE_COMPUTE_POOL = os.environ.get("USE_COMPUTE_POOL", "True").lower() == 'true'
+COMPUTE_POOL_TEXT_MATCH_WORKERS = int(os.environ.get("COMPUTE_POOL_TEXT_MATCH_WORKERS", "2"))
+COMPUTE_POOL_EMBEDDING_WORKERS = int(os.environ.get("COMPUTE_POOL_EMBEDDING_WORKERS", "5"))
+LOOP_LAG_SAMPLE_INTERVAL_MS = float(os.environ.get("LOOP_LAG_SAMPLE_INTERVAL_MS", "50"))
+LOOP_LAG_STALL_MS = float(os.environ.get("LOOP_LAG_STALL_MS", "100"))
+LOOP_LAG_LOG_INTERVAL_SECONDS = float(os.environ.get("LOOP_LAG_LOG_INTERVAL_SECONDS", "60"))
+
+# Quality model (roberta-large-mnli): concurrent (snippet, statement) pairs are queued for up to the max wait and run
+# as padded batches of similar token length (longest <= max padding ratio x shortest) instead of one forward pass each
+USE_QUALITY_MODEL_BATCHING = os.environ.get("USE_QUALITY_MODEL_BATCHING", "True").lower() == 'true'
+QUALITY_MODEL_BATCH_MAX_SIZE = int(os.environ.get("QUALITY_MODEL_BATCH_MAX_SIZE", "16"))
+QUALITY_MODEL_BATCH_MAX_WAIT_MS = float(os.environ.get("QUALITY_MODEL_BATCH_MAX_WAIT_MS", "10"))
+QUALITY_MODEL_BATCH_MAX_PADDING_RATIO = float(os.environ.get("QUALITY_MODEL_BATCH_MAX_PADDING_RATIO", "1.5"))
+QUALITY_MODEL_MAX_CONCURRENT_BATCHES = int(os.environ.get("QUALITY_MODEL_MAX_CONCURRENT_BATCHES", "2"))
+
+# Snippet fetcher: per-host adaptive scheduler (global cap on concurrent fetches, AIMD limit per host)
+FETCH_GLOBAL_CONCURRENCY = int(os.environ.get("FETCH_GLOBAL_CONCURRENCY", "20"))
+FETCH_HOST_INITIAL_CONCURRENCY = float(os.environ.get("FETCH_HOST_INITIAL_CONCURRENCY", "2"))
+FETCH_HOST_MIN_CONCURRENCY = float(os.environ.get("FETCH_HOST_MIN_CONCURRENCY", "1"))
+FETCH_HOST_MAX_CONCURRENCY = float(os.environ.get("FETCH_HOST_MAX_CONCURRENCY", "8"))
+FETCH_HOST_SLOW_LATENCY_SECONDS = float(os.environ.get("FETCH_HOST_SLOW_LATENCY_SECONDS", "10"))
+
+# Snippet fetcher: clean HTML in a process pool (off the event-loop process); pages under HTML_CLEAN_POOL_MIN_BYTES use a thread
+USE_HTML_CLEAN_POOL = os.environ.get("USE_HTML_CLEAN_POOL", "True").lower() == 'true'
+HTML_CLEAN_POOL_WORKERS = int(os.environ.get("HTML_CLEAN_POOL_WORKERS", "4"))
+HTML_CLEAN_POOL_MIN_BYTES = int(os.environ.get("HTML_CLEAN_POOL_MIN_BYTES", str(32 * 1024)))
+
+# Snippet fetcher: stream HTTP bodies, skip non-HTML content types and stop reading after FETCH_MAX_BYTES (decoded).
+# The cap is a memory guard, far above article sizes: a snippet past it is not found, so a cut page is reported in
+# the statement response (page_truncated)
+USE_STREAMING_FETCH = os.environ.get("USE_STREAMING_FETCH", "True").lower() == 'true'
+FETCH_MAX_BYTES = int(os.environ.get("FETCH_MAX_BYTES", str(32 * 1024 * 1024)))
+# Extract page text while the streamed body downloads (same output as clean_html, no DOM); needs USE_STREAMING_FETCH.
+# The extraction runs on the event loop and its text bypasses the clean pool and HTML_CLEANER_BACKEND, so it
+# defaults off when the clean pool is on (pages are then cleaned in the pool once downloaded)
+USE_STREAMING_EXTRACTION = os.environ.get(
+    "USE_STREAMING_EXTRACTION", "False" if USE_HTML_CLEAN_POOL else "True"
+).lower() == 'true'
+# Page text extractor used by clean_html: "bs4" (BeautifulSoup) or "lxml" (lxml.html tree walk, same text, much faster)
+HTML_CLEANER_BACKEND = os.environ.get("HTML_CLEANER_BACKEND", "bs4").lower()
+
+# Snippet fetcher: HTTP connection pool limits (keepalive must outlive the warm pool interval)
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+
+# Snippet fetcher: traffic archive. "record" appends every response (headers, raw body, timing) to a gzip archive,
+# "replay" serves all fetches (HTTP, HTML parser API, Selenium pages) from it with recorded latencies x scale
+SNIPPET_FETCHER_MODE = os.environ.get("SNIPPET_FETCHER_MODE", "live").lower()
+TRAFFIC_ARCHIVE_PATH = os.environ.get("TRAFFIC_ARCHIVE_PATH", "traffic_archive.jsonl.gz")
+TRAFFIC_REPLAY_LATENCY_SCALE = float(os.environ.get("TRAFFIC_REPLAY_LATENCY_SCALE", "1"))
+
+# Snippet fetcher: cookie jars - one per host (LRU over hosts), each capped in cookies
+COOKIE_JAR_MAX_HOSTS = int(os.environ.get("COOKIE_JAR_MAX_HOSTS", "1000"))
+COOKIE_JAR_MAX_COOKIES_PER_HOST = int(os.environ.get("COOKIE_JAR_MAX_COOKIES_PER_HOST", "50"))
+
+# Snippet fetcher: DNS cache (getaddrinfo results kept for the TTL; failed lookups for the negative TTL)
+USE_DNS_CACHE = os.environ.get("USE_DNS_CACHE", "True").lower() == 'true'
+DNS_CACHE_TTL_SECONDS = float(os.environ.get("DNS_CACHE_TTL_SECONDS", "300"))
+DNS_CACHE_NEGATIVE_TTL_SECONDS = float(os.environ.get("DNS_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+
+# Snippet fetcher: warm pool - keep connections open to the most-cited hosts (a HEAD / per host per interval)
+USE_CONNECTION_WARM_POOL = os.environ.get("USE_CONNECTION_WARM_POOL", "False").lower() == 'true'
+CONNECTION_WARM_POOL_HOSTS = int(os.environ.get("CONNECTION_WARM_POOL_HOSTS", "50"))
+CONNECTION_WARM_POOL_INTERVAL_SECONDS = float(os.environ.get("CONNECTION_WARM_POOL_INTERVAL_SECONDS", "30"))
+
+# Snippet fetcher: hedged requests - a second request when the first is slower than the host's p90 latency,
+# capped globally at HEDGE_BUDGET_RATIO extra requests per request (bursts up to HEDGE_BUDGET_BURST)
+USE_HEDGED_REQUESTS = os.environ.get("USE_HEDGED_REQUESTS", "False").lower() == 'true'
+HEDGE_LATENCY_PERCENTILE = float(os.environ.get("HEDGE_LATENCY_PERCENTILE", "90"))
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "10"))
+HEDGE_MIN_DELAY_SECONDS = float(os.environ.get("HEDGE_MIN_DELAY_SECONDS", "1"))
+HEDGE_BUDGET_RATIO = float(os.environ.get("HEDGE_BUDGET_RATIO", "0.1"))
+HEDGE_BUDGET_BURST = float(os.environ.get("HEDGE_BUDGET_BURST", "10"))
+
+# Snippet fetcher: learned host routing - host path prefixes whose plain HTTP keeps getting 403 (and Selenium works)
+# go straight to Selenium; the route is re-probed with plain HTTP after HOST_ROUTING_REPROBE_SECONDS. Off by default:
+# a routed page is scored on its Selenium page_source text, which can differ from the HTTP text
+USE_HOST_ROUTING = os.environ.get("USE_HOST_ROUTING", "False").lower() == 'true'
+HOST_ROUTING_SELENIUM_AFTER_BLOCKS = int(os.environ.get("HOST_ROUTING_SELENIUM_AFTER_BLOCKS", "2"))
+HOST_ROUTING_REPROBE_SECONDS = float(os.environ.get("HOST_ROUTING_REPROBE_SECONDS", str(6 * 60 * 60)))
+
+# Snippet fetcher: circuit breaker for hosts/URLs that keep failing. "enforce" skips the fetch while open
+# (snippet scored as could_not_extract_html_from_url, status circuit_open), "observe" only logs, "off" disables
+CIRCUIT_BREAKER_MODE = os.environ.get("CIRCUIT_BREAKER_MODE", "observe").lower()
+CIRCUIT_BREAKER_HOST_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_BREAKER_HOST_FAILURE_THRESHOLD", "3"))
+CIRCUIT_BREAKER_URL_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_BREAKER_URL_FAILURE_THRESHOLD", "2"))
+CIRCUIT_BREAKER_BASE_COOLDOWN_SECONDS = float(os.environ.get("CIRCUIT_BREAKER_BASE_COOLDOWN_SECONDS", "30"))
+CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS = float(os.environ.get("CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS", str(30 * 60)))
+
+# Snippet fetcher: Selenium fallback driver pool (pre-warmed at startup, recycled after N pages or M MB of Chrome RSS)
+SELENIUM_MAX_DRIVERS = int(os.environ.get("SELENIUM_MAX_DRIVERS", "5"))
+SELENIUM_PREWARM_DRIVERS = int(os.environ.get("SELENIUM_PREWARM_DRIVERS", "1"))
+SELENIUM_DRIVER_MAX_PAGES = int(os.environ.get("SELENIUM_DRIVER_MAX_PAGES", "50"))
+SELENIUM_DRIVER_MAX_RSS_MB = float(os.environ.get("SELENIUM_DRIVER_MAX_RSS_MB", "1024"))
+
+# Snippet fetcher: Selenium render profile: "full" (regular Chrome) or "light" (no images/fonts/CSS/media, eager page load)
+SELENIUM_RENDER_PROFILE = os.environ.get("SELENIUM_RENDER_PROFILE", "full").lower()
+
+# Snippet fetcher: Selenium render-completion detection (DOM stable + network idle). A page that has not settled by
+# the cap is read as it stands; only a known bot-challenge interstitial is waited on up to the longer challenge cap
+SELENIUM_RENDER_MAX_WAIT_SECONDS = float(os.environ.get("SELENIUM_RENDER_MAX_WAIT_SECONDS", "3"))
+SELENIUM_RENDER_CHALLENGE_MAX_WAIT_SECONDS = float(os.environ.get("SELENIUM_RENDER_CHALLENGE_MAX_WAIT_SECONDS", "12"))
+SELENIUM_RENDER_POLL_INTERVAL_SECONDS = float(os.environ.get("SELENIUM_RENDER_POLL_INTERVAL_SECONDS", "0.1"))
+SELENIUM_RENDER_STABLE_POLLS = int(os.environ.get("SELENIUM_RENDER_STABLE_POLLS", "3"))
+SELENIUM_RENDER_NETWORK_IDLE_MS = float(os.environ.get("SELENIUM_RENDER_NETWORK_IDLE_MS", "500"))
 
 VERICORE_VALIDATOR_VERSION = os.environ.get("VERICORE_VALIDATOR_VERSION", "v0.0.43.4")
 
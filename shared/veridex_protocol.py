@@ -9,6 +9,8 @@ import bittensor as bt
 SNIPPET_FETCHER_STATUS_OK = "ok"
 SNIPPET_FETCHER_STATUS_ERROR = "error"
 SNIPPET_FETCHER_STATUS_NOT_RUN = "not_run"
+SNIPPET_FETCHER_STATUS_SKIPPED = "skipped"
+SNIPPET_FETCHER_STATUS_CIRCUIT_OPEN = "circuit_open"  # only with CIRCUIT_BREAKER_MODE=enforce (default observe never sets it)
 
 
 @dataclass
@@ -20,8 +22,18 @@ class FetchPageResult:
     fetch_by_http_time_secs: float = -1.0  # -1 if NA
     fetch_by_selenium_time_secs: float = -1.0  # -1 if NA
     cleaning_html_time_secs: float = -1.0  # -1 if not run
+    cleaning_html_queue_wait_secs: float = -1.0  # part of cleaning_html_time_secs spent waiting for a clean worker; -1 if not run
+    cleaning_html_parse_secs: float = -1.0  # part of cleaning_html_time_secs spent parsing/extracting text; -1 if not run
     fetch_by_http_status: str = SNIPPET_FETCHER_STATUS_NOT_RUN  # SNIPPET_FETCHER_STATUS_*
     fetch_by_selenium_status: str = SNIPPET_FETCHER_STATUS_NOT_RUN
+    from_page_cache: bool = False  # True when served from the snippet fetcher's page cache (no fetch for this caller)
+    from_page_store: bool = False  # True when the page body came from the on-disk page store (fresh entry or 304 revalidation)
+    truncated: bool = False  # True when the HTTP body exceeded FETCH_MAX_BYTES and only the first FETCH_MAX_BYTES were cleaned
+    selenium_pool_wait_secs: float = -1.0  # part of fetch_by_selenium_time_secs spent waiting for a free driver; -1 if NA
+    http_dns_secs: float = -1.0  # part of fetch_by_http_time_secs spent resolving DNS; -1 if no new connection was opened
+    http_connect_secs: float = -1.0  # part of fetch_by_http_time_secs spent on TCP connect; -1 if no new connection was opened
+    http_tls_secs: float = -1.0  # part of fetch_by_http_time_secs spent on TLS handshakes; -1 if no new TLS connection was opened
+    page_bytes: int = -1  # size of the page body downloaded (HTTP body or rendered HTML); -1 if nothing was downloaded
 
 
 @dataclass
@@ -36,6 +48,10 @@ class StatementResponseTiming:
     cleaning_html_time_taken_secs: float = -1
     fetch_by_http_status: str = SNIPPET_FETCHER_STATUS_NOT_RUN
     fetch_by_selenium_status: str = SNIPPET_FETCHER_STATUS_NOT_RUN
+    http_dns_secs: float = -1  # part of fetch_by_http_time_secs spent resolving DNS; -1 if no new connection was opened
+    http_connect_secs: float = -1  # part of fetch_by_http_time_secs spent on TCP connect; -1 if no new connection was opened
+    http_tls_secs: float = -1  # part of fetch_by_http_time_secs spent on TLS handshakes; -1 if no new TLS connection was opened
+    selenium_pool_wait_secs: float = -1  # part of fetch_by_selenium_time_secs spent waiting for a free driver; -1 if NA
 
 
 @dataclass
@@ -151,6 +167,7 @@ class VericoreStatementResponse():
   cleaning_html_time_taken_secs: float = -1  # Time spent in clean_html; -1 if not run
   fetch_by_http_status: str = SNIPPET_FETCHER_STATUS_NOT_RUN  # SNIPPET_FETCHER_STATUS_*
   fetch_by_selenium_status: str = SNIPPET_FETCHER_STATUS_NOT_RUN  # SNIPPET_FETCHER_STATUS_*
+  page_truncated: bool = False  # True when the page body exceeded FETCH_MAX_BYTES and only its first FETCH_MAX_BYTES were searched
   timing: typing.Optional["StatementResponseTiming"] = None  # Nested timing DTO; legacy fields above kept for compatibility
   sentiment: float = 0.0
   conviction: float = 0.0
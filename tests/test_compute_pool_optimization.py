@@ -0,0 +1,106 @@
+"""
+Benchmark for the validation compute pool: event-loop blocking time while concurrent snippet verifications
+normalize and match multi-megabyte pages. Inline (the previous behaviour: normalization and
+verify_snippets_in_page called on the event loop) vs. validator.compute_pool (one verify_snippets_in_page_text call
+per page on worker processes).
+A LoopLagMonitor samples the loop throughout; with the pool the loop must stay responsive (no stalls of the
+size of a page normalization) and every verification must return the same result.
+"""
+import asyncio
+import random
+import time
+
+from validator.compute_pool import ComputePool, ComputeStage, LoopLagMonitor, STAGE_TEXT_MATCH
+from validator.snippet_matcher import verify_snippets_in_page_text
+from validator.text_normalizer import normalize_text
+
+PAGE_SIZES = [("1 MB", 1024 * 1024), ("5 MB", 5 * 1024 * 1024)]
+CONCURRENT_PAGES = 4
+SNIPPET_CHARS = 200
+FUZZY_THRESHOLD = 0.94
+MIN_FUZZY_LENGTH = 25
+WORDS = "The “Great” Pyramid — of Giza [1] was built for Pharaoh Khufu, around 2560 BC; Ünïcödé text…".split()
+
+
+def make_page(rng: random.Random, chars: int) -> str:
+    words = []
+    size = 0
+    while size < chars:
+        word = rng.choice(WORDS) + str(rng.randrange(1000))
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+async def verify(run, page: str, snippet: str) -> bool:
+    matches = await run(STAGE_TEXT_MATCH, verify_snippets_in_page_text, page, [normalize_text(snippet)],
+                        FUZZY_THRESHOLD, MIN_FUZZY_LENGTH)
+    return matches[0].found
+
+
+async def warm_up(pool: ComputePool):
+    await asyncio.gather(*(pool.run(STAGE_TEXT_MATCH, normalize_text, "warm up") for _ in range(2)))
+
+
+async def measure(pool: ComputePool, pages: list[str], snippets: list[str]) -> tuple[float, dict, list[bool]]:
+    monitor = LoopLagMonitor(interval_secs=0.01, stall_secs=0.1)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    found = await asyncio.gather(*(verify(pool.run, page, snippet) for page, snippet in zip(pages, snippets)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    return elapsed, monitor.stats(), found
+
+
+def run_tests():
+    print("=" * 80)
+    print("COMPUTE POOL: event-loop blocking during snippet verification, inline vs worker pool")
+    print("=" * 80)
+
+    rng = random.Random(42)
+    all_passed = True
+    for name, size in PAGE_SIZES:
+        pages = [make_page(rng, size) for _ in range(CONCURRENT_PAGES)]
+        snippets = []
+        for i, page in enumerate(pages):
+            start = rng.randrange(len(page) - SNIPPET_CHARS)
+            # Half copied from the page, half from another page
+            snippets.append(page[start:start + SNIPPET_CHARS] if i % 2 == 0 else make_page(rng, SNIPPET_CHARS))
+        print(f"\n{CONCURRENT_PAGES} concurrent verifications on {name} pages")
+        print("-" * 40)
+
+        results = {}
+        for label, enabled in (("inline", False), ("pool", True)):
+            pool = ComputePool(
+                [ComputeStage(STAGE_TEXT_MATCH, max_workers=2, processes=True)],
+                enabled=enabled,
+            )
+            if enabled:
+                # Start the workers before measuring
+                asyncio.run(warm_up(pool))
+            elapsed, lag, found = asyncio.run(measure(pool, pages, snippets))
+            pool.shutdown()
+            results[label] = (lag, found)
+            print(f"  {label:<7} wall {elapsed:6.2f}s   loop blocked {lag['blocked_secs']:6.3f}s   "
+                  f"max lag {lag['max_lag_secs'] * 1000:7.1f} ms   stalls {lag['stalls']}")
+
+        inline_lag, inline_found = results["inline"]
+        pool_lag, pool_found = results["pool"]
+        same = inline_found == pool_found == [i % 2 == 0 for i in range(CONCURRENT_PAGES)]
+        responsive = pool_lag["stalls"] == 0 and pool_lag["max_lag_secs"] < inline_lag["max_lag_secs"]
+        print(f"  Max loop lag reduced {inline_lag['max_lag_secs'] / max(pool_lag['max_lag_secs'], 1e-3):.1f}x")
+        print(f"  Same verification results: {'✅ PASS' if same else '❌ FAIL'}")
+        print(f"  Event loop stays responsive with the pool: {'✅ PASS' if responsive else '❌ FAIL'}")
+        if not (same and responsive):
+            all_passed = False
+
+    print("\n" + "=" * 80)
+    print(f"All page sizes passed: {'✅ YES' if all_passed else '❌ NO'}")
+    return all_passed
+
+
+if __name__ == "__main__":
+    passed = run_tests()
+    exit(0 if passed else 1)
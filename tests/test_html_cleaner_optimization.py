@@ -0,0 +1,94 @@
+"""
+Benchmark + parity check for the clean_html backends: BeautifulSoup (bs4) vs lxml tree walk (lxml),
+plus the streaming extractor used while downloading. Reports throughput on small, medium and 5 MB pages.
+"""
+import random
+import time
+
+from validator.html_clean_pool import HTML_CLEANER_BACKEND_BS4, HTML_CLEANER_BACKEND_LXML, clean_html_text
+from validator.html_text_extractor import extract_text
+
+WORDS = (
+    "the pyramid was built for pharaoh khufu around 2560 bc and remained the tallest man made structure "
+    "for more than 3800 years electric vehicle sales rose sharply according to the agency report"
+).split()
+
+
+def make_page(target_bytes: int, seed: int = 0) -> str:
+    """Article-like page: nav, paragraphs with inline markup, scripts, ads, asides and comments."""
+    rnd = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html><html><head><title>Benchmark page</title>"
+        "<style>body { font-family: sans-serif }</style><script>var config = {};</script></head><body>"
+        "<nav><ul><li><a href='/'>Home</a></li><li><a href='/world'>World</a></li></ul></nav><article>"
+    ]
+    size = len(parts[0])
+    while size < target_bytes:
+        words = rnd.choices(WORDS, k=rnd.randint(20, 80))
+        words[rnd.randrange(len(words))] = f"<b>{rnd.choice(WORDS)}</b>"
+        words[rnd.randrange(len(words))] = f"<a href='/x'>{rnd.choice(WORDS)}</a>"
+        block = f"<p>{' '.join(words)} [{rnd.randint(1, 40)}]</p>" + rnd.choice([
+            "<script>window.dataLayer.push({event: 'view'});</script>",
+            "<aside>Related stories</aside>",
+            "<ins class='adsbygoogle'>Advertisement</ins>",
+            "<!-- analytics -->",
+            "<div class='share'><span>Share</span><span>Tweet</span></div>",
+            "",
+        ])
+        parts.append(block)
+        size += len(block)
+    parts.append("</article><footer>Example News</footer></body></html>")
+    return "".join(parts)
+
+
+PAGE_SIZES = [
+    ("small (20 KB)", 20 * 1024, 200),
+    ("medium (300 KB)", 300 * 1024, 20),
+    ("large (5 MB)", 5 * 1024 * 1024, 2),
+]
+
+BACKENDS = [
+    ("bs4", lambda html: clean_html_text(html, HTML_CLEANER_BACKEND_BS4)),
+    ("lxml", lambda html: clean_html_text(html, HTML_CLEANER_BACKEND_LXML)),
+    ("streaming", extract_text),
+]
+
+
+def run_tests():
+    print("=" * 80)
+    print("CLEAN_HTML BACKENDS: bs4 vs lxml tree walk vs streaming extractor")
+    print("=" * 80)
+
+    all_passed = True
+    for name, size, repeat in PAGE_SIZES:
+        html = make_page(size, seed=size)
+        page_mb = len(html.encode("utf-8")) / (1024 * 1024)
+        print(f"\n{name}: {page_mb:.2f} MB x {repeat}")
+        print("-" * 40)
+
+        texts = {}
+        timings = {}
+        for backend, clean in BACKENDS:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                texts[backend] = clean(html)
+            timings[backend] = (time.perf_counter() - start) / repeat
+            print(
+                f"  {backend:<10} {timings[backend] * 1000:9.2f} ms/page "
+                f"{page_mb / timings[backend]:8.2f} MB/s {1 / timings[backend]:9.1f} pages/s"
+            )
+
+        matches = texts["lxml"] == texts["bs4"] and texts["streaming"] == texts["bs4"]
+        print(f"  Speedup lxml vs bs4: {timings['bs4'] / timings['lxml']:.2f}x")
+        print(f"  Identical text: {'✅ PASS' if matches else '❌ FAIL'}")
+        if not matches:
+            all_passed = False
+
+    print("\n" + "=" * 80)
+    print(f"All pages identical: {'✅ YES' if all_passed else '❌ NO'}")
+    return all_passed
+
+
+if __name__ == "__main__":
+    passed = run_tests()
+    exit(0 if passed else 1)
@@ -0,0 +1,101 @@
+"""
+Benchmark + correctness check for quality model micro-batching: the snippets of concurrent requests scored one
+(snippet, statement) pair per forward pass (asyncio.to_thread per pair behind threading.Semaphore(5), the previous
+behaviour) vs. validator.inference_batcher.InferenceBatcher (pairs queued for a few ms, grouped by token length and
+run as padded batches). Uses a randomly initialised RoBERTa of roberta-base shape (runs offline); the real model is
+roberta-large with the same architecture. Batched probabilities must match the batch-of-1 ones.
+"""
+import asyncio
+import random
+import threading
+import time
+
+import torch
+from transformers import RobertaConfig, RobertaForSequenceClassification
+
+from validator.inference_batcher import InferenceBatcher
+
+PAD_TOKEN_ID = 1
+VOCAB_SIZE = 50265
+REQUEST_SIZES = [("1 request x 15 snippets", 1, 15), ("4 requests x 15 snippets", 4, 15)]
+
+torch.manual_seed(0)
+model = RobertaForSequenceClassification(RobertaConfig(
+    vocab_size=VOCAB_SIZE, hidden_size=768, num_hidden_layers=12, num_attention_heads=12, intermediate_size=3072,
+    num_labels=3, pad_token_id=PAD_TOKEN_ID,
+))
+model.eval()
+model_lock = threading.Semaphore(5)
+
+
+def make_pair(rng: random.Random) -> list[int]:
+    """Token ids of <s> snippet </s></s> statement </s>: snippets are 30-250 tokens, statements 15-40."""
+    snippet = [rng.randrange(3, VOCAB_SIZE) for _ in range(rng.randint(30, 250))]
+    statement = [rng.randrange(3, VOCAB_SIZE) for _ in range(rng.randint(15, 40))]
+    return [0] + snippet + [2, 2] + statement + [2]
+
+
+def forward(encodings: list[list[int]]) -> list[list[float]]:
+    longest = max(len(ids) for ids in encodings)
+    input_ids = torch.tensor([ids + [PAD_TOKEN_ID] * (longest - len(ids)) for ids in encodings])
+    attention_mask = torch.tensor([[1] * len(ids) + [0] * (longest - len(ids)) for ids in encodings])
+    with model_lock:
+        with torch.no_grad():
+            logits = model(input_ids=input_ids, attention_mask=attention_mask).logits
+            return torch.softmax(logits, dim=-1).tolist()
+
+
+def score_single(ids: tuple[int, ...]) -> list[float]:
+    return forward([list(ids)])[0]
+
+
+async def run_single(pairs: list[tuple[int, ...]]) -> list:
+    return await asyncio.gather(*(asyncio.to_thread(score_single, ids) for ids in pairs))
+
+
+async def run_batched(pairs: list[tuple[int, ...]]) -> tuple[list, dict]:
+    batcher = InferenceBatcher(lambda ids: (list(ids), len(ids)), forward, max_batch_size=16, max_wait_secs=0.01)
+    results = await asyncio.gather(*(batcher.submit(ids) for ids in pairs))
+    await batcher.aclose()
+    return results, batcher.stats()
+
+
+def run_tests():
+    print("=" * 80)
+    print("QUALITY MODEL: one forward pass per pair vs micro-batched padded forward passes")
+    print("=" * 80)
+
+    rng = random.Random(42)
+    forward([make_pair(rng)])  # warm up
+    all_passed = True
+    for name, requests, snippets in REQUEST_SIZES:
+        pairs = [tuple(make_pair(rng)) for _ in range(requests * snippets)]
+        print(f"\n{name} ({len(pairs)} pairs)")
+        print("-" * 40)
+
+        start = time.perf_counter()
+        single = asyncio.run(run_single(pairs))
+        single_secs = time.perf_counter() - start
+        start = time.perf_counter()
+        batched, stats = asyncio.run(run_batched(pairs))
+        batched_secs = time.perf_counter() - start
+
+        print(f"  one pair per pass  {single_secs:6.2f}s   ({len(pairs)} forward passes)")
+        print(f"  micro-batched      {batched_secs:6.2f}s   ({stats['batches']} forward passes, "
+              f"avg batch {stats['avg_batch_size']:.1f}, padding efficiency {stats['padding_efficiency']:.2f}, "
+              f"max queue wait {stats['max_queue_wait_ms']:.1f} ms)")
+        print(f"  Speedup: {single_secs / batched_secs:.1f}x")
+        max_diff = max(abs(a - b) for s, b_ in zip(single, batched) for a, b in zip(s, b_))
+        same = max_diff < 1e-4
+        print(f"  Same probabilities (max diff {max_diff:.1e}): {'✅ PASS' if same else '❌ FAIL'}")
+        if not same:
+            all_passed = False
+
+    print("\n" + "=" * 80)
+    print(f"All runs matched: {'✅ YES' if all_passed else '❌ NO'}")
+    return all_passed
+
+
+if __name__ == "__main__":
+    passed = run_tests()
+    exit(0 if passed else 1)
@@ -0,0 +1,137 @@
+"""
+Benchmark for the Selenium fallback render profiles: "full" (current) vs "light" (resources blocked, eager load).
+Serves a local page corpus (article text + heavy images, fonts, CSS and video, with simulated latency), fetches it
+with one driver per profile and reports pages/minute, Chrome RSS and whether the extracted text is identical.
+Needs Chrome + chromedriver (the validator's Selenium setup).
+"""
+import functools
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from validator.html_clean_pool import clean_html_text
+from validator.render_completion import wait_for_render_completion
+from validator.selenium_render_profile import (
+    SELENIUM_RENDER_PROFILE_FULL,
+    SELENIUM_RENDER_PROFILE_LIGHT,
+    apply_render_profile_cdp,
+    apply_render_profile_options,
+)
+
+PAGE_COUNT = 20
+RESOURCE_LATENCY_SECS = 0.05
+WORDS = "the pyramid was built for pharaoh khufu around 2560 bc electric vehicle sales rose sharply".split()
+
+
+class SlowResourceHandler(SimpleHTTPRequestHandler):
+    """Serves the corpus directory; non-HTML resources are delayed like a real CDN round trip."""
+
+    def do_GET(self):
+        if not self.path.endswith(".html"):
+            time.sleep(RESOURCE_LATENCY_SECS)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def build_corpus(directory: str):
+    rnd = random.Random(0)
+    for name, size in [("hero.png", 2 * 1024 * 1024), ("font.woff2", 200 * 1024), ("clip.mp4", 4 * 1024 * 1024)]:
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(rnd.randbytes(size))
+    with open(os.path.join(directory, "site.css"), "w") as f:
+        f.write("@font-face { font-family: x; src: url(font.woff2); }\n" + "p { margin: 1em }\n" * 5000)
+    for i in range(PAGE_COUNT):
+        paragraphs = "".join(f"<p>{' '.join(rnd.choices(WORDS, k=60))}</p>" for _ in range(30))
+        images = "".join(f"<img src='hero.png?v={i}-{k}'>" for k in range(5))
+        html = (
+            "<!DOCTYPE html><html><head><title>Article</title>"
+            f"<link rel='stylesheet' href='site.css?v={i}'></head><body><article>{paragraphs}</article>{images}"
+            f"<video src='clip.mp4?v={i}' autoplay muted></video>"
+            "<script>document.querySelector('article').insertAdjacentHTML('beforeend', '<p>rendered by js</p>');</script>"
+            "</body></html>"
+        )
+        with open(os.path.join(directory, f"page{i}.html"), "w") as f:
+            f.write(html)
+
+
+def create_driver(profile: str):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    apply_render_profile_options(chrome_options, profile)
+    driver = webdriver.Chrome(options=chrome_options)
+    apply_render_profile_cdp(driver, profile)
+    return driver
+
+
+def chrome_rss_mb(driver) -> float:
+    try:
+        import psutil
+    except ImportError:
+        return float("nan")
+    process = psutil.Process(driver.service.process.pid)
+    return sum(p.memory_info().rss for p in [process] + process.children(recursive=True)) / (1024 * 1024)
+
+
+def run_profile(profile: str, base_url: str) -> tuple[float, float, list[str]]:
+    driver = create_driver(profile)
+    try:
+        texts = []
+        start = time.perf_counter()
+        for i in range(PAGE_COUNT):
+            driver.get(f"{base_url}/page{i}.html")
+            wait_for_render_completion(driver, max_wait_secs=3)
+            texts.append(clean_html_text(driver.page_source))
+        elapsed = time.perf_counter() - start
+        return PAGE_COUNT / elapsed * 60, chrome_rss_mb(driver), texts
+    finally:
+        driver.quit()
+
+
+def run_tests():
+    print("=" * 80)
+    print("SELENIUM RENDER PROFILE: full vs light (resources blocked, eager page load)")
+    print("=" * 80)
+
+    try:
+        import selenium  # noqa: F401
+    except ImportError:
+        print("❌ Selenium not installed")
+        return False
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_corpus(directory)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(SlowResourceHandler, directory=directory))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            results = {}
+            for profile in (SELENIUM_RENDER_PROFILE_FULL, SELENIUM_RENDER_PROFILE_LIGHT):
+                results[profile] = run_profile(profile, base_url)
+                pages_per_min, rss_mb, _ = results[profile]
+                print(f"  {profile:<6} {pages_per_min:8.1f} pages/min   Chrome RSS {rss_mb:8.1f} MB")
+        finally:
+            server.shutdown()
+
+    full_rate, _, full_texts = results[SELENIUM_RENDER_PROFILE_FULL]
+    light_rate, _, light_texts = results[SELENIUM_RENDER_PROFILE_LIGHT]
+    same_text = full_texts == light_texts
+    faster = light_rate > full_rate
+    print("-" * 40)
+    print(f"  Speedup light vs full: {light_rate / full_rate:.2f}x {'✅ PASS' if faster else '❌ FAIL'}")
+    print(f"  Identical text: {'✅ PASS' if same_text else '❌ FAIL'}")
+    return same_text and faster
+
+
+if __name__ == "__main__":
+    passed = run_tests()
+    exit(0 if passed else 1)
@@ -0,0 +1,100 @@
+"""
+Benchmark + parity check for snippet verification text normalization: the previous inline normalizer (NFKC plus six
+re.sub passes over the whole page for every snippet) vs. validator.text_normalizer (precompiled patterns, one
+str.translate pass for quotes/dashes/punctuation, normalized page text cached per page). Five snippets are verified
+against each page, as when several statements of one miner response cite the same source.
+"""
+import random
+import re
+import time
+import unicodedata
+
+from validator.text_normalizer import NormalizedTextCache, normalize_text
+
+
+def legacy_normalize_text(text):
+    text = unicodedata.normalize("NFKC", text or "")
+    text = re.sub(r"\[\s*\d+\s*\]", '', text)
+    text = re.sub(r'["“”‘’`´]', "'", text)
+    text = re.sub(r'[–—−]', '-', text)
+    text = re.sub(r"[^\w\s'-]", '', text)
+    text = text.lower()
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+WORDS = (
+    "The Great Pyramid of Giza “was” built — for the pharaoh Khufu [ 12 ] around 2560 BC, and it's (remained) "
+    "the tallest man-made structure; café naïve’s 3−2 résumé [4] – «quoted» ﬁne ½"
+).split()
+PAGE_SIZES = [("100 KB", 100 * 1024), ("1 MB", 1024 * 1024), ("5 MB", 5 * 1024 * 1024)]
+SNIPPETS_PER_PAGE = 5
+
+
+def make_page(target_chars: int, rng: random.Random) -> str:
+    words = []
+    size = 0
+    while size < target_chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def legacy_verify(page: str, snippets: list[str]) -> list[bool]:
+    return [legacy_normalize_text(snippet) in legacy_normalize_text(page) for snippet in snippets]
+
+
+def cached_verify(cache: NormalizedTextCache, page: str, snippets: list[str]) -> list[bool]:
+    return [normalize_text(snippet) in cache.normalize(page) for snippet in snippets]
+
+
+def run_tests():
+    print("=" * 80)
+    print(f"TEXT NORMALIZATION: inline re.sub normalizer vs shared normalizer + page cache ({SNIPPETS_PER_PAGE} snippets/page)")
+    print("=" * 80)
+
+    rng = random.Random(42)
+    all_passed = True
+    for name, size in PAGE_SIZES:
+        page = make_page(size, rng)
+        snippets = []
+        for _ in range(SNIPPETS_PER_PAGE):
+            start = rng.randrange(0, len(page) - 300)
+            snippets.append(page[start:start + 200])
+        print(f"\n{name} page, {SNIPPETS_PER_PAGE} snippets")
+        print("-" * 40)
+
+        start = time.perf_counter()
+        legacy_page = legacy_normalize_text(page)
+        legacy_one = time.perf_counter() - start
+        start = time.perf_counter()
+        new_page = normalize_text(page)
+        new_one = time.perf_counter() - start
+        print(f"  One page, uncached:  legacy {legacy_one * 1000:8.2f} ms  new {new_one * 1000:8.2f} ms  "
+              f"({legacy_one / new_one:.2f}x)")
+
+        start = time.perf_counter()
+        legacy_found = legacy_verify(page, snippets)
+        legacy_secs = time.perf_counter() - start
+        cache = NormalizedTextCache(max_bytes=256 * 1024 * 1024)
+        start = time.perf_counter()
+        new_found = cached_verify(cache, page, snippets)
+        new_secs = time.perf_counter() - start
+        print(f"  {SNIPPETS_PER_PAGE} snippets:          legacy {legacy_secs * 1000:8.2f} ms  new {new_secs * 1000:8.2f} ms  "
+              f"({legacy_secs / new_secs:.2f}x)")
+        print(f"  Page cache: {cache.stats()}")
+
+        correct = new_page == legacy_page and new_found == legacy_found
+        print(f"  Normalized text and verdicts identical: {'✅ PASS' if correct else '❌ FAIL'}")
+        if not correct:
+            all_passed = False
+
+    print("\n" + "=" * 80)
+    print(f"Parity with the inline normalizer: {'✅ YES' if all_passed else '❌ NO'}")
+    return all_passed
+
+
+if __name__ == "__main__":
+    passed = run_tests()
+    exit(0 if passed else 1)
@@ -0,0 +1,92 @@
+"""Unit tests for prefix-based charset resolution (validator.charset) and raw-body cleaning in SnippetFetcher."""
+import codecs
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.charset import (
+    CHARSET_SOURCE_BOM,
+    CHARSET_SOURCE_DEFAULT,
+    CHARSET_SOURCE_DETECTED,
+    CHARSET_SOURCE_HTTP,
+    CHARSET_SOURCE_META,
+    DETECT_BYTES,
+    decode_html,
+    normalize_charset,
+    resolve_charset,
+)
+from validator.html_clean_pool import HtmlCleanPool
+
+TEXT = "Café crème brûlée – déjà vu"
+META_PAGE = f'<html><head><meta charset="windows-1252"></head><body><p>{TEXT}</p></body></html>'.encode("cp1252")
+
+
+def test_labels_map_to_browser_encodings():
+    assert normalize_charset("ISO-8859-1") == "cp1252"
+    assert normalize_charset("us-ascii") == "cp1252"
+    assert normalize_charset("GB2312") == "gb18030"
+    assert normalize_charset("UTF-16") == "utf-8"
+    assert normalize_charset("utf8") == "utf-8"
+    assert normalize_charset("no-such-charset") is None
+
+
+def test_resolution_order():
+    assert resolve_charset("text/html; charset=utf-8", codecs.BOM_UTF8 + b"<html>") == ("utf-8-sig", CHARSET_SOURCE_BOM)
+    assert resolve_charset("text/html; charset=ISO-8859-1", META_PAGE) == ("cp1252", CHARSET_SOURCE_HTTP)
+    assert resolve_charset("text/html", META_PAGE) == ("cp1252", CHARSET_SOURCE_META)
+    http_equiv = b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">'
+    assert resolve_charset(None, http_equiv) == ("shift_jis", CHARSET_SOURCE_META)
+    assert resolve_charset("text/html", "<p>plain ütf-8</p>".encode("utf-8")) == ("utf-8", CHARSET_SOURCE_DEFAULT)
+
+
+def test_unlabelled_page_is_detected_from_a_bounded_prefix():
+    text = "日本語のウェブページの本文です。"
+    body = ("<html><body>" + f"<p>{text}</p>" * 10000 + "</body></html>").encode("shift_jis")
+    assert len(body) > DETECT_BYTES
+    encoding, source = resolve_charset("text/html", body)
+    assert source == CHARSET_SOURCE_DETECTED
+    assert text in decode_html(body[:200], encoding)
+
+
+def test_streaming_resolution_waits_for_enough_bytes():
+    assert resolve_charset("text/html", b"<html><head>", final=False) is None
+    assert resolve_charset("text/html; charset=utf-8", b"<html>", final=False) == ("utf-8", CHARSET_SOURCE_HTTP)
+    assert resolve_charset("text/html", META_PAGE + b" " * 4096, final=False) == ("cp1252", CHARSET_SOURCE_META)
+
+
+@pytest.mark.asyncio
+async def test_pool_decodes_raw_bodies_in_the_worker():
+    pool = HtmlCleanPool(max_workers=1, min_pool_bytes=64)
+    try:
+        result = await pool.clean(META_PAGE, "cp1252")
+    finally:
+        pool.shutdown()
+    assert result.in_pool is True
+    assert result.text == TEXT
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+@pytest.mark.asyncio
+async def test_meta_labelled_page_is_not_mojibake(streaming):
+    from validator.snippet_fetcher import SnippetFetcher
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=META_PAGE)
+
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("validator.snippet_fetcher.USE_STREAMING_FETCH", streaming):
+        response = await fetcher.send_get_request("req", 1, "https://example.fr/page")
+        result = await fetcher.fetch_entire_page("req", 1, "https://example.fr/page")
+    await fetcher.client.aclose()
+
+    assert response.encoding == "cp1252"
+    assert response.charset_source == CHARSET_SOURCE_META
+    assert TEXT in response.text
+    assert result.cleaned_html == TEXT
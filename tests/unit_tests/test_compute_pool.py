@@ -0,0 +1,75 @@
+"""Unit tests for the off-event-loop validation compute pool (validator.compute_pool)."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.compute_pool import ComputePool, ComputeStage, LoopLagMonitor
+from validator.snippet_matcher import PageSnippetBatcher
+from validator.text_normalizer import normalize_text
+
+
+def _thread_name(_: int) -> str:
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_thread_stage_runs_off_the_loop_and_records_stats():
+    pool = ComputePool([ComputeStage("embedding", max_workers=2)])
+    try:
+        names = await asyncio.gather(*(pool.run("embedding", _thread_name, i) for i in range(4)))
+    finally:
+        pool.shutdown()
+    assert all(name.startswith("compute-embedding") for name in names)
+    stats = pool.stats()["stages"]["embedding"]
+    assert stats["tasks"] == 4 and stats["failed"] == 0 and stats["inline"] == 0
+
+
+@pytest.mark.asyncio
+async def test_process_stage_returns_the_same_result():
+    pool = ComputePool([ComputeStage("text_match", max_workers=1, processes=True)])
+    text = "“Smart” quotes — and dashes [1] in Ünïcödé TEXT"
+    try:
+        assert await pool.run("text_match", normalize_text, text) == normalize_text(text)
+    finally:
+        pool.shutdown()
+    assert pool.stats()["stages"]["text_match"]["tasks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_pool_runs_inline_and_counts_failures():
+    pool = ComputePool([ComputeStage("text_match", max_workers=1, processes=True)], enabled=False)
+    assert await pool.run("text_match", _thread_name, 0) == threading.current_thread().name
+    with pytest.raises(ZeroDivisionError):
+        await pool.run("text_match", lambda: 1 / 0)
+    stats = pool.stats()["stages"]["text_match"]
+    assert stats["inline"] == 2 and stats["tasks"] == 1 and stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_detects_a_blocking_call():
+    monitor = LoopLagMonitor(interval_secs=0.01, stall_secs=0.05)
+    monitor.start()
+    await asyncio.sleep(0.03)
+    time.sleep(0.2)  # blocks the loop
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+    stats = monitor.stats()
+    assert stats["stalls"] >= 1
+    assert stats["max_lag_secs"] >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_snippet_batcher_runs_batches_on_the_pool():
+    pool = ComputePool([ComputeStage("text_match", max_workers=1)])
+    batcher = PageSnippetBatcher(0.94, 25, max_wait_secs=0.01, run=lambda fn, *args: pool.run("text_match", fn, *args))
+    page = "the great pyramid of giza was built for the pharaoh khufu"
+    try:
+        results = await asyncio.gather(batcher.verify(page, "pharaoh khufu"), batcher.verify(page, "babylon"))
+    finally:
+        pool.shutdown()
+    assert [match.found for match in results] == [True, False]
+    assert pool.stats()["stages"]["text_match"]["tasks"] == 1
@@ -0,0 +1,108 @@
+"""Unit tests for per-host bounded cookie jars (validator.cookie_jars)."""
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.cookie_jars import CookieJarTransport, HostCookieJars, refusing_cookie_jar
+
+
+def _client(jars: HostCookieJars, handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=CookieJarTransport(httpx.MockTransport(handler), jars),
+        cookies=refusing_cookie_jar(),
+        follow_redirects=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_cookies_are_kept_per_host_across_requests_and_redirects():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, request.headers.get("cookie")))
+        if request.url.path == "/login":
+            return httpx.Response(302, headers={"location": "/home", "set-cookie": "session=abc; Path=/"})
+        if request.url.host == "other.example":
+            return httpx.Response(200, headers={"set-cookie": "other=1; Path=/"})
+        return httpx.Response(200)
+
+    jars = HostCookieJars()
+    async with _client(jars, handler) as client:
+        await client.get("https://site.example/login")
+        await client.get("https://other.example/")
+        await client.get("https://site.example/page")
+        assert len(client.cookies.jar) == 0  # nothing for httpx to copy per request
+
+    assert seen == [
+        ("site.example", None),
+        ("site.example", "session=abc"),  # redirect hop already carries the cookie
+        ("other.example", None),
+        ("site.example", "session=abc"),  # and other.example's cookie is not sent here
+    ]
+    assert jars.stats()["hosts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_parent_domain_cookies_follow_cross_subdomain_redirects():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, request.headers.get("cookie")))
+        if request.url.host == "example.com":
+            return httpx.Response(301, headers={
+                "location": "https://www.example.com/article",
+                "set-cookie": "cf_clearance=ok; Domain=.example.com; Path=/",
+            })
+        if request.url.host == "www.example.com":
+            return httpx.Response(200, headers={"set-cookie": "host_only=1; Path=/"})
+        return httpx.Response(200)
+
+    jars = HostCookieJars()
+    async with _client(jars, handler) as client:
+        await client.get("https://example.com/article")
+        await client.get("https://news.example.com/story")
+
+    assert seen == [
+        ("example.com", None),
+        ("www.example.com", "cf_clearance=ok"),  # apex -> www. redirect keeps the parent-domain cookie
+        ("news.example.com", "cf_clearance=ok"),  # sibling subdomain gets it too, but not www.'s host-only cookie
+    ]
+    assert jars.stats()["hosts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_hosts_are_evicted():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"set-cookie": "id=1; Path=/"})
+
+    jars = HostCookieJars(max_hosts=2)
+    async with _client(jars, handler) as client:
+        await client.get("https://a.example/")
+        await client.get("https://b.example/")
+        await client.get("https://a.example/")  # a is now most recently used
+        await client.get("https://c.example/")
+
+    assert jars.get("a.example") is not None
+    assert jars.get("b.example") is None
+    assert jars.get("c.example") is not None
+    assert jars.stats()["evicted_hosts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cookies_per_host_are_capped_oldest_first():
+    count = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal count
+        count += 1
+        return httpx.Response(200, headers={"set-cookie": f"c{count}=v; Path=/"})
+
+    jars = HostCookieJars(max_cookies_per_host=3)
+    async with _client(jars, handler) as client:
+        for _ in range(5):
+            await client.get("https://tracker.example/")
+
+    names = sorted(cookie.name for cookie in jars.get("tracker.example").jar)
+    assert names == ["c3", "c4", "c5"]
+    assert jars.stats()["evicted_cookies"] == 2
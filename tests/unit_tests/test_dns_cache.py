@@ -0,0 +1,253 @@
+"""Unit tests for the DNS cache, the timing network backend (validator.dns_cache) and the connection warm pool."""
+import asyncio
+import socket
+from unittest.mock import patch
+
+import httpcore
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.connection_warmer import ConnectionWarmer
+from validator.host_scheduler import HostScheduler
+from validator.dns_cache import (
+    CachingNetworkBackend,
+    ConnectionTiming,
+    DnsCache,
+    current_connection_timing,
+    install_network_backend,
+)
+
+
+class CountingResolver:
+    def __init__(self, addresses=("127.0.0.1",), delay=0.0):
+        self.addresses = list(addresses)
+        self.delay = delay
+        self.fail = False
+        self.calls = 0
+
+    async def __call__(self, host, port):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return self.addresses
+
+
+def _cache(resolver, ttl_secs=300, negative_ttl_secs=30) -> DnsCache:
+    cache = DnsCache(ttl_secs=ttl_secs, negative_ttl_secs=negative_ttl_secs)
+    cache._getaddrinfo = resolver
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_cached_until_ttl():
+    resolver = CountingResolver()
+    cache = _cache(resolver, ttl_secs=0.05)
+    assert await cache.resolve("example.com", 443) == ["127.0.0.1"]
+    assert await cache.resolve("example.com", 443) == ["127.0.0.1"]
+    assert resolver.calls == 1
+    assert cache.stats()["hits"] == 1
+
+    await asyncio.sleep(0.06)
+    await cache.resolve("example.com", 443)
+    assert resolver.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_resolution():
+    resolver = CountingResolver(delay=0.05)
+    cache = _cache(resolver)
+    results = await asyncio.gather(*(cache.resolve("example.com", 443) for _ in range(10)))
+    assert all(r == ["127.0.0.1"] for r in results)
+    assert resolver.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_are_negatively_cached_and_stale_addresses_survive_resolver_errors():
+    resolver = CountingResolver()
+    resolver.fail = True
+    cache = _cache(resolver)
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            await cache.resolve("missing.example", 443)
+    assert resolver.calls == 1
+
+    resolver = CountingResolver()
+    cache = _cache(resolver, ttl_secs=0.05)
+    await cache.resolve("example.com", 443)
+    await asyncio.sleep(0.06)
+    resolver.fail = True
+    assert await cache.resolve("example.com", 443) == ["127.0.0.1"]  # expired but better than failing
+    assert cache.stats()["stale_hits"] == 1
+
+
+async def _serve_http(reader, writer):
+    while True:
+        request = b""
+        while not request.endswith(b"\r\n\r\n"):
+            data = await reader.read(1024)
+            if not data:
+                writer.close()
+                return
+            request += data
+        writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/html\r\ncontent-length: 11\r\n\r\n<p>page</p>")
+        await writer.drain()
+
+
+@pytest.mark.asyncio
+async def test_backend_resolves_through_cache_and_records_connection_timing():
+    server = await asyncio.start_server(_serve_http, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    resolver = CountingResolver()
+    cache = _cache(resolver)
+    transport = httpx.AsyncHTTPTransport()
+    assert install_network_backend(transport, CachingNetworkBackend(cache))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        timings = []
+        for _ in range(2):
+            timing = ConnectionTiming()
+            token = current_connection_timing.set(timing)
+            try:
+                response = await client.get(f"http://evidence.test:{port}/article")
+            finally:
+                current_connection_timing.reset(token)
+            assert response.text == "<p>page</p>"
+            timings.append(timing)
+
+    server.close()
+    first, second = timings
+    assert first.new_connections == 1
+    assert first.dns_secs >= 0 and first.connect_secs >= 0
+    assert first.tls_secs == -1.0  # plain HTTP
+    assert second == ConnectionTiming()  # pooled connection reused: no setup cost
+    assert resolver.calls == 1
+
+
+class BlackholeBackend(httpcore.AsyncNetworkBackend):
+    """Connections to blackholed addresses hang until their timeout; the rest go to the real backend."""
+
+    def __init__(self, blackholed):
+        self.blackholed = set(blackholed)
+        self.attempts = []
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.attempts.append(host)
+        if host in self.blackholed:
+            await asyncio.sleep(timeout if timeout is not None else 3600)
+            raise httpcore.ConnectTimeout(f"{host} timed out")
+        return await self._backend.connect_tcp(host, port, timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_blackholed_first_address_falls_through_to_the_next_one():
+    server = await asyncio.start_server(_serve_http, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    cache = _cache(CountingResolver(addresses=["2001:db8::1", "127.0.0.1"]))
+    fake = BlackholeBackend(["2001:db8::1"])
+    backend = CachingNetworkBackend(cache, backend=fake)
+
+    start = asyncio.get_running_loop().time()
+    stream = await backend.connect_tcp("evidence.test", port, timeout=5)
+    elapsed = asyncio.get_running_loop().time() - start
+    await stream.aclose()
+    server.close()
+    assert fake.attempts == ["2001:db8::1", "127.0.0.1"]
+    assert elapsed < 1  # the connection attempt delay, not the 5 s connect timeout
+
+    # Every address blackholed: the whole race is bounded by the connect timeout
+    backend = CachingNetworkBackend(_cache(CountingResolver(addresses=["2001:db8::1", "2001:db8::2"])),
+                                    backend=BlackholeBackend(["2001:db8::1", "2001:db8::2"]))
+    start = asyncio.get_running_loop().time()
+    with pytest.raises(httpcore.ConnectTimeout):
+        await backend.connect_tcp("evidence.test", port, timeout=0.5)
+    assert asyncio.get_running_loop().time() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_addresses_invalidate_the_cache_entry():
+    resolver = CountingResolver(addresses=["127.0.0.1"])
+    cache = _cache(resolver)
+    backend = CachingNetworkBackend(cache)
+    # Grab a free port and close it so the connection is refused
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    with pytest.raises(httpcore.ConnectError):
+        await backend.connect_tcp("evidence.test", port, timeout=5)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_pings_most_cited_origins():
+    heads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        heads.append((request.method, str(request.url)))
+        return httpx.Response(200)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        warmer = ConnectionWarmer(client, max_hosts=2, interval_secs=60)
+        for url in ["https://a.com/1", "https://a.com/2", "https://a.com/3", "https://b.com/x", "https://b.com/y", "https://c.com/z"]:
+            warmer.record(url)
+        origins = await warmer.warm_once()
+
+    assert origins == ["https://a.com", "https://b.com"]
+    assert sorted(heads) == [("HEAD", "https://a.com/"), ("HEAD", "https://b.com/")]
+    assert warmer.stats()["warmed"] == 2
+    # Counts decay: c.com (cited once) is dropped, a.com and b.com remain
+    assert "https://c.com" not in warmer.top_origins()
+
+
+@pytest.mark.asyncio
+async def test_warm_requests_use_fetch_headers_and_host_slots():
+    scheduler = HostScheduler(global_limit=10, initial_host_limit=4)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.host, request.headers["user-agent"], scheduler.stats()["in_flight"]))
+        return httpx.Response(429 if request.url.host == "busy.com" else 200)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        warmer = ConnectionWarmer(
+            client, max_hosts=2, interval_secs=60,
+            headers=lambda url: {"User-Agent": f"Browser for {url}"}, scheduler=scheduler,
+        )
+        warmer.record("https://a.com/1")
+        warmer.record("https://busy.com/1")
+        await warmer.warm_once()
+
+    assert sorted((host, agent) for host, agent, _ in seen) == [
+        ("a.com", "Browser for https://a.com/"), ("busy.com", "Browser for https://busy.com/")
+    ]
+    assert all(in_flight >= 1 for _, _, in_flight in seen)  # sent inside a host slot
+    # A throttled warm request backs the host off like a fetch; a quick 200 to a HEAD does not grow the limit
+    assert scheduler.host_limit("busy.com") == 2
+    assert scheduler.host_limit("a.com") == 4
+    assert scheduler.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_result_reports_connection_timing():
+    from validator.snippet_fetcher import SnippetFetcher
+
+    server = await asyncio.start_server(_serve_http, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+    fetcher.dns_cache._getaddrinfo = CountingResolver()
+    with patch("validator.snippet_fetcher.USE_STREAMING_FETCH", False):
+        result = await fetcher.fetch_entire_page("req", 1, f"http://evidence.test:{port}/article")
+    await fetcher.client.aclose()
+    server.close()
+
+    assert result.cleaned_html == "page"
+    assert result.http_dns_secs >= 0
+    assert result.http_connect_secs >= 0
+    assert result.http_tls_secs == -1.0
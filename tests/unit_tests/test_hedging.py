@@ -0,0 +1,109 @@
+"""Unit tests for hedged page requests (validator.hedging and SnippetFetcher._send_hedged_get_request)."""
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.hedging import HedgeBudget, HostLatencyTracker
+
+
+def test_percentile_needs_history():
+    tracker = HostLatencyTracker(min_samples=10)
+    for i in range(9):
+        tracker.record("a.example", i / 10)
+    assert tracker.percentile("a.example", 90) is None
+    tracker.record("a.example", 0.9)
+    assert tracker.percentile("a.example", 90) == pytest.approx(0.8)
+    assert tracker.percentile("b.example", 90) is None
+
+
+def test_budget_caps_hedges():
+    budget = HedgeBudget(ratio=0.25, burst=2)
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()  # burst used up
+    for _ in range(4):
+        budget.on_request()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.stats()["hedges"] == 3
+    assert budget.stats()["denied"] == 2
+
+
+def _fetcher_with(handler):
+    from validator.snippet_fetcher import SnippetFetcher
+
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+    fetcher.latency_tracker = HostLatencyTracker(min_samples=5)
+    fetcher.hedge_budget = HedgeBudget(ratio=0.1, burst=5)
+    for _ in range(5):
+        fetcher.latency_tracker.record("slow.example", 0.05)
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_hedge_wins():
+    user_agents = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        user_agents.append(request.headers["user-agent"])
+        if len(user_agents) == 1:
+            await asyncio.sleep(5)  # stuck primary
+        return httpx.Response(200, headers={"content-type": "text/html"}, text="<p>page</p>")
+
+    fetcher = _fetcher_with(handler)
+    with patch("validator.snippet_fetcher.HEDGE_MIN_DELAY_SECONDS", 0.05):
+        start = time.perf_counter()
+        response = await fetcher._send_hedged_get_request("req", 1, "slow.example", "https://slow.example/a")
+        elapsed = time.perf_counter() - start
+    await fetcher.client.aclose()
+
+    assert response.status_code == 200
+    assert elapsed < 1
+    assert len(user_agents) == 2 and user_agents[0] != user_agents[1]
+    assert fetcher.hedge_budget.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_and_unknown_hosts_are_not_hedged():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        return httpx.Response(200, headers={"content-type": "text/html"}, text="<p>page</p>")
+
+    fetcher = _fetcher_with(handler)
+    with patch("validator.snippet_fetcher.HEDGE_MIN_DELAY_SECONDS", 0.05):
+        await fetcher._send_hedged_get_request("req", 1, "slow.example", "https://slow.example/a")
+        await fetcher._send_hedged_get_request("req", 1, "new.example", "https://new.example/a")
+    await fetcher.client.aclose()
+
+    assert calls == ["slow.example", "new.example"]
+    assert fetcher.hedge_budget.stats()["hedges"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_does_not_replace_primary_success():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            await asyncio.sleep(0.3)
+            return httpx.Response(200, headers={"content-type": "text/html"}, text="<p>primary</p>")
+        return httpx.Response(503)
+
+    fetcher = _fetcher_with(handler)
+    with patch("validator.snippet_fetcher.HEDGE_MIN_DELAY_SECONDS", 0.05):
+        response = await fetcher._send_hedged_get_request("req", 1, "slow.example", "https://slow.example/a")
+    await fetcher.client.aclose()
+
+    assert response.status_code == 200
+    assert response.text == "<p>primary</p>"
+    assert fetcher.hedge_budget.stats()["hedge_wins"] == 0
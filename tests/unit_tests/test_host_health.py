@@ -0,0 +1,146 @@
+"""Unit tests for the snippet fetcher's failure memory / circuit breaker (validator.host_health)."""
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from shared.veridex_protocol import SNIPPET_FETCHER_STATUS_CIRCUIT_OPEN
+from validator.host_health import (
+    CIRCUIT_BREAKER_MODE_ENFORCE,
+    CIRCUIT_BREAKER_MODE_OBSERVE,
+    CIRCUIT_BREAKER_MODE_OFF,
+    HostHealth,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch("validator.host_health.time.monotonic", clock):
+        yield clock
+
+
+def _health(mode=CIRCUIT_BREAKER_MODE_ENFORCE) -> HostHealth:
+    return HostHealth(mode=mode, host_failure_threshold=3, url_failure_threshold=2, base_cooldown_secs=30, max_cooldown_secs=100)
+
+
+def test_host_opens_after_consecutive_failures_and_cooldown_doubles(clock):
+    health = _health()
+    for i in range(3):
+        assert health.check(f"https://slow.example/{i}") is None
+        health.record(f"https://slow.example/{i}", None)  # timeout
+
+    assert "host circuit open" in health.check("https://slow.example/other")
+    assert health.check("https://fine.example/page") is None
+
+    # After the cool-down one probe goes through; the others wait for its outcome
+    clock.now += 31
+    assert health.check("https://slow.example/probe") is None
+    assert health.check("https://slow.example/other") is not None
+
+    health.record("https://slow.example/probe", 429)
+    clock.now += 31
+    assert health.check("https://slow.example/other") is not None  # re-opened for 60s
+    clock.now += 30
+    assert health.check("https://slow.example/probe2") is None
+
+    health.record("https://slow.example/probe2", 200)
+    assert health.check("https://slow.example/other") is None
+    assert health.snapshot()["open_hosts"] == []
+
+
+def test_cooldown_is_capped(clock):
+    health = _health()
+    for _ in range(8):
+        health.record("https://down.example/", 429)
+        clock.now += 1
+        health._hosts._breakers["down.example"].open_until = clock.now  # skip the wait, keep the history
+        health.check("https://down.example/")
+    health.record("https://down.example/", 429)
+    (host,) = health.snapshot()["open_hosts"]
+    assert host["cooldown_remaining_secs"] <= 100
+
+
+def test_not_found_only_affects_the_url(clock):
+    health = _health()
+    for _ in range(2):
+        health.record("https://news.example/missing", 404)
+    assert health.check("https://news.example/missing") == "URL circuit open"
+    assert health.check("https://news.example/present") is None
+    assert not health.is_host_open("news.example")
+
+
+def test_erroring_urls_cannot_open_an_honest_host(clock):
+    health = _health()
+    for i in range(5):
+        health.record(f"https://en.wikipedia.org/w/index.php?title=bogus{i}", 500)
+        health.record(f"https://en.wikipedia.org/w/forbidden{i}", 403)
+    assert health.check("https://en.wikipedia.org/wiki/Giza_pyramid_complex") is None
+    assert not health.is_host_open("en.wikipedia.org")
+    health.record("https://en.wikipedia.org/w/index.php?title=bogus0", 500)
+    assert health.check("https://en.wikipedia.org/w/index.php?title=bogus0") == "URL circuit open"
+
+
+def test_probe_answered_with_an_error_closes_the_host(clock):
+    health = _health()
+    for i in range(3):
+        health.record(f"https://slow.example/{i}", None)
+    clock.now += 31
+    assert health.check("https://slow.example/bogus") is None  # the probe
+    health.record("https://slow.example/bogus", 500)
+    assert health.check("https://slow.example/real") is None
+
+
+def test_observe_mode_never_short_circuits(clock):
+    health = _health(CIRCUIT_BREAKER_MODE_OBSERVE)
+    for _ in range(3):
+        health.record("https://blocked.example/", 429)
+    assert health.check("https://blocked.example/") is None
+    assert health.snapshot()["would_short_circuit"] == 1
+    assert health.is_host_open("blocked.example")
+
+    off = _health(CIRCUIT_BREAKER_MODE_OFF)
+    for _ in range(5):
+        off.record("https://blocked.example/", 429)
+    assert off.check("https://blocked.example/") is None
+    assert off.snapshot()["tracked_hosts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_fetcher_short_circuits_open_hosts():
+    from validator.snippet_fetcher import SnippetFetcher
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(429)
+
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+    fetcher.host_health = _health()
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    for i in range(3):
+        await fetcher.fetch_entire_page("req", 1, f"https://down.example/{i}")
+    start = time.perf_counter()
+    result = await fetcher.fetch_entire_page("req", 1, "https://down.example/4")
+    assert time.perf_counter() - start < 1
+    await fetcher.client.aclose()
+
+    assert len(requests) == 3
+    assert result.cleaned_html == ""
+    assert result.fetch_by_http_status == SNIPPET_FETCHER_STATUS_CIRCUIT_OPEN
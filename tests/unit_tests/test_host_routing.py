@@ -0,0 +1,100 @@
+"""Unit tests for learned host routing (validator.host_routing) and its use in SnippetFetcher.render_page."""
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from shared.veridex_protocol import SNIPPET_FETCHER_STATUS_NOT_RUN, SNIPPET_FETCHER_STATUS_OK
+from validator.host_routing import HOST_ROUTE_HTTP, HOST_ROUTE_SELENIUM, HostRouter, route_key
+
+
+def test_host_is_routed_to_selenium_after_repeated_blocks():
+    router = HostRouter(selenium_after_blocks=2)
+    router.record_http("blocked.example", 403, selenium_ok=True)
+    assert router.route("blocked.example") == HOST_ROUTE_HTTP
+    router.record_http("blocked.example", 403, selenium_ok=True)
+    assert router.route("blocked.example") == HOST_ROUTE_SELENIUM
+    assert router.route("other.example") == HOST_ROUTE_HTTP
+
+
+def test_blocks_selenium_cannot_pass_or_timeouts_do_not_route_to_selenium():
+    router = HostRouter(selenium_after_blocks=2)
+    for _ in range(3):
+        router.record_http("hard.example", 403, selenium_ok=False)
+        router.record_http("slow.example", None)
+    assert router.route("hard.example") == HOST_ROUTE_HTTP
+    assert router.route("slow.example") == HOST_ROUTE_HTTP
+
+
+def test_stale_route_is_reprobed_once_and_http_success_switches_back():
+    router = HostRouter(selenium_after_blocks=1, reprobe_secs=100)
+    with patch("validator.host_routing.time.monotonic", return_value=1000.0):
+        router.record_http("site.example", 403, selenium_ok=True)
+    with patch("validator.host_routing.time.monotonic", return_value=1050.0):
+        assert router.route("site.example") == HOST_ROUTE_SELENIUM
+    with patch("validator.host_routing.time.monotonic", return_value=1101.0):
+        assert router.route("site.example") == HOST_ROUTE_HTTP  # the probe
+        assert router.route("site.example") == HOST_ROUTE_SELENIUM  # everyone else while it runs
+        router.record_http("site.example", 200)
+        assert router.route("site.example") == HOST_ROUTE_HTTP
+    assert router.stats()["reprobes"] == 1
+
+
+def test_failed_direct_selenium_goes_back_to_http_first():
+    router = HostRouter(selenium_after_blocks=1)
+    router.record_http("site.example", 403, selenium_ok=True)
+    router.record_selenium("site.example", ok=False)
+    assert router.route("site.example") == HOST_ROUTE_HTTP
+
+
+def test_routes_are_scoped_to_the_blocked_path_prefix():
+    assert route_key("https://Site.example/news/2024/story?id=1") == "site.example/news"
+    assert route_key("https://site.example/story") == "site.example/"
+    router = HostRouter(selenium_after_blocks=1)
+    router.record_http(route_key("https://site.example/premium/a"), 403, selenium_ok=True)
+    assert router.route(route_key("https://site.example/premium/b")) == HOST_ROUTE_SELENIUM
+    assert router.route(route_key("https://site.example/news/c")) == HOST_ROUTE_HTTP
+    assert router.route(route_key("https://site.example/d")) == HOST_ROUTE_HTTP
+
+
+class SeleniumPage:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+        self.headers = {}
+
+
+@pytest.mark.asyncio
+async def test_render_page_skips_http_for_learned_hosts():
+    from validator.snippet_fetcher import SnippetFetcher
+
+    http_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        http_requests.append(str(request.url))
+        return httpx.Response(403, text="blocked")
+
+    async def fake_selenium(request_id, miner_uid, url):
+        return SeleniumPage("<html><body><p>rendered</p></body></html>")
+
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+    fetcher.host_router = HostRouter(selenium_after_blocks=2)
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    fetcher._fetch_with_selenium = fake_selenium
+
+    with patch("validator.snippet_fetcher.SELENIUM_AVAILABLE", True):
+        for i in range(2):
+            await fetcher.fetch_entire_page("req", 1, f"https://blocked.example/{i}")
+        assert len(http_requests) == 2
+        result = await fetcher.fetch_entire_page("req", 1, "https://blocked.example/3")
+    await fetcher.client.aclose()
+
+    assert len(http_requests) == 2  # no doomed HTTP attempt
+    assert result.cleaned_html == "rendered"
+    assert result.fetch_by_http_status == SNIPPET_FETCHER_STATUS_NOT_RUN
+    assert result.fetch_by_selenium_status == SNIPPET_FETCHER_STATUS_OK
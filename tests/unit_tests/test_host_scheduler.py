@@ -0,0 +1,109 @@
+"""Unit tests for the per-host adaptive fetch scheduler (validator.host_scheduler)."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.host_scheduler import HostScheduler
+
+
+async def _hold(scheduler, host, release: asyncio.Event, order: list, status=200, latency=0.1):
+    async with scheduler.slot(host) as slot:
+        order.append(host)
+        await release.wait()
+        slot.record(status, latency)
+
+
+@pytest.mark.asyncio
+async def test_global_limit_caps_total_in_flight():
+    scheduler = HostScheduler(global_limit=3, initial_host_limit=8)
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.ensure_future(_hold(scheduler, f"host{i}", release, order)) for i in range(6)]
+    await asyncio.sleep(0.01)
+    assert scheduler.stats()["in_flight"] == 3
+    assert scheduler.stats()["waiting"] == 3
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.stats()["in_flight"] == 0
+    assert len(order) == 6
+
+
+@pytest.mark.asyncio
+async def test_host_limit_does_not_block_other_hosts():
+    scheduler = HostScheduler(global_limit=10, initial_host_limit=1)
+    slow_release = asyncio.Event()
+    order = []
+    slow = [asyncio.ensure_future(_hold(scheduler, "slow.example", slow_release, order)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+
+    async with scheduler.slot("fast.example") as slot:
+        slot.record(200, 0.05)  # got a slot although slow.example has queued requests
+
+    assert order == ["slow.example"]
+    slow_release.set()
+    await asyncio.gather(*slow)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_dispatched_round_robin_between_hosts():
+    scheduler = HostScheduler(global_limit=1, initial_host_limit=4)
+    release = asyncio.Event()
+    order = []
+    first = asyncio.ensure_future(_hold(scheduler, "a", release, order))
+    await asyncio.sleep(0.01)
+    queued = [asyncio.ensure_future(_hold(scheduler, "a", release, order)) for _ in range(3)]
+    queued += [asyncio.ensure_future(_hold(scheduler, "b", release, order)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(first, *queued)
+    assert order == ["a", "a", "b", "a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_throttling_halves_limit_and_success_grows_it():
+    scheduler = HostScheduler(global_limit=10, initial_host_limit=4, min_host_limit=1, max_host_limit=8)
+
+    async with scheduler.slot("h") as slot:
+        slot.record(429, 0.1)
+    assert scheduler.host_limit("h") == 2
+
+    for _ in range(4):
+        async with scheduler.slot("h") as slot:
+            slot.record(200, 0.1)
+    assert scheduler.host_limit("h") > 3
+
+
+@pytest.mark.asyncio
+async def test_burst_of_failures_decreases_once_per_round_trip():
+    scheduler = HostScheduler(global_limit=10, initial_host_limit=8)
+    release = asyncio.Event()
+    tasks = [
+        asyncio.ensure_future(_hold(scheduler, "h", release, [], status=None, latency=5.0))
+        for _ in range(6)
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.host_limit("h") == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = HostScheduler(global_limit=1, initial_host_limit=1)
+    release = asyncio.Event()
+    holder = asyncio.ensure_future(_hold(scheduler, "h", release, []))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.ensure_future(_hold(scheduler, "h", release, []))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    release.set()
+    await holder
+    assert scheduler.stats()["in_flight"] == 0
+    assert scheduler.stats()["waiting"] == 0
+
+    async with scheduler.slot("h") as slot:
+        slot.record(200, 0.1)
@@ -0,0 +1,70 @@
+"""Unit tests for process-pool HTML cleaning (validator.html_clean_pool)."""
+import os
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.html_clean_pool import HtmlCleanPool, clean_html_text
+
+SMALL_PAGE = "<html><body><p>Small page</p><script>x()</script></body></html>"
+LARGE_PAGE = "<html><body>" + "<p>Paragraph text é</p><aside>ad</aside>" * 2000 + "</body></html>"
+
+
+def test_clean_html_text_drops_excluded_tags():
+    assert clean_html_text(SMALL_PAGE) == "Small page"
+
+
+@pytest.mark.asyncio
+async def test_small_pages_bypass_the_pool():
+    pool = HtmlCleanPool(max_workers=1, min_pool_bytes=1024)
+    result = await pool.clean(SMALL_PAGE)
+    assert result.text == "Small page"
+    assert result.in_pool is False
+    assert pool._executor is None
+    assert pool.stats()["thread_runs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_large_pages_are_cleaned_in_worker_process():
+    pool = HtmlCleanPool(max_workers=1, min_pool_bytes=1024)
+    try:
+        result = await pool.clean(LARGE_PAGE)
+        assert result.in_pool is True
+        assert result.text == clean_html_text(LARGE_PAGE)
+        assert result.queue_wait_secs >= 0
+        assert result.parse_secs > 0
+        assert pool.stats()["pool_runs"] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_falls_back_and_recovers():
+    pool = HtmlCleanPool(max_workers=1, min_pool_bytes=1024)
+    try:
+        await pool.clean(LARGE_PAGE)
+        for process in list(pool._executor._processes.values()):
+            process.kill()
+            process.join()
+        result = await pool.clean(LARGE_PAGE)
+        assert result.text == clean_html_text(LARGE_PAGE)
+        assert pool._executor is None  # recreated on the next pooled page
+
+        result = await pool.clean(LARGE_PAGE)
+        assert result.in_pool is True
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_workers_are_not_forked_from_the_validator_and_skip_its_modules():
+    pool = HtmlCleanPool(max_workers=1, min_pool_bytes=1024)
+    try:
+        await pool.clean(LARGE_PAGE)
+        executor = pool._get_executor()
+        assert executor.submit(os.getppid).result() != os.getpid()  # started by the forkserver
+        loaded = executor.submit(eval, "[m for m in ('bittensor', 'torch') if m in __import__('sys').modules]")
+        assert loaded.result() == []
+    finally:
+        pool.shutdown()
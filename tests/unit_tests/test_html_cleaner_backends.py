@@ -0,0 +1,94 @@
+"""
+Parity tests for the clean_html backends (HTML_CLEANER_BACKEND): the lxml tree backend must produce the same
+page text as BeautifulSoup, and therefore the same snippet verification outcome.
+"""
+import random
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.html_clean_pool import (
+    HTML_CLEANER_BACKEND_BS4,
+    HTML_CLEANER_BACKEND_LXML,
+    clean_html_text,
+)
+
+PARAGRAPHS = [
+    "The Great Pyramid of Giza was built for the Fourth Dynasty pharaoh Khufu [1] around 2560 BC.",
+    "Electric vehicle sales rose 35% in 2023 — according to the IEA’s “Global EV Outlook”.",
+    "Researchers found that the drug reduced symptoms in 62 percent of patients (n=1,204).",
+    "Central banks raised interest rates in response to persistent inflation [ 12 ] across Europe.",
+    "Le café était fermé; the owners said it would reopen in the spring of 2025.",
+]
+
+
+def _article_page(rnd: random.Random) -> str:
+    body = []
+    for paragraph in rnd.sample(PARAGRAPHS, k=rnd.randint(2, len(PARAGRAPHS))):
+        words = paragraph.split(" ")
+        cut = rnd.randint(1, len(words) - 1)
+        # Inline markup in the middle of a sentence, as real article pages have
+        body.append(f"<p>{' '.join(words[:cut])} <a href='#'>{words[cut]}</a> {' '.join(words[cut + 1:])}</p>")
+        body.append(rnd.choice([
+            "<script>window.dataLayer = [];</script>",
+            "<aside class='related'>Related: Ten facts about pyramids</aside>",
+            "<ins class='adsbygoogle'>Advertisement</ins>",
+            "<!-- tracking pixel -->",
+            "<noscript><img src='pixel.gif'>Enable JavaScript</noscript>",
+            "<style>.x { color: red }</style>",
+            "<iframe src='https://video.example'>Video</iframe>",
+            "",
+        ]))
+    return (
+        "<!DOCTYPE html><html><head><title>Article</title><meta charset='utf-8'></head><body>"
+        "<nav><ul><li>Home</li><li>World</li></ul></nav><article><h1>Headline</h1>"
+        + "".join(body)
+        + "</article><footer>© 2024 Example News</footer></body></html>"
+    )
+
+
+def _corpus(count: int = 60, seed: int = 7) -> list[str]:
+    rnd = random.Random(seed)
+    pages = [_article_page(rnd) for _ in range(count)]
+    pages += [
+        "",
+        "plain text",
+        "<p>unclosed <b>bold <i>italic</p> after",
+        "<html><body>x</body></html> trailing text",
+        '<?xml version="1.0" encoding="utf-8"?><html><body><p>xhtml</p></body></html>',
+        "\N{BYTE ORDER MARK}<p>bom</p>",
+        "<ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby><template><p>hidden</p></template>",
+    ]
+    return pages
+
+
+def test_lxml_backend_matches_bs4_text():
+    for html in _corpus():
+        assert clean_html_text(html, HTML_CLEANER_BACKEND_LXML) == clean_html_text(html, HTML_CLEANER_BACKEND_BS4), html
+
+
+@pytest.mark.asyncio
+async def test_lxml_backend_gives_same_snippet_verification_outcome():
+    from validator.snippet_validator import SnippetValidator
+
+    validator = SnippetValidator()
+    rnd = random.Random(11)
+    snippets = PARAGRAPHS + [
+        "Khufu around 2560 BC",
+        "electric vehicle sales rose 35 percent in 2022",  # wrong fact
+        "the drug reduced symptoms in 62 percent of patients",
+        "Advertisement",  # only inside <ins>
+        "Ten facts about pyramids",  # only inside <aside>
+        "Enable JavaScript",  # only inside <noscript>
+    ]
+    outcomes = 0
+    for html in _corpus(count=20):
+        bs4_text = clean_html_text(html, HTML_CLEANER_BACKEND_BS4)
+        lxml_text = clean_html_text(html, HTML_CLEANER_BACKEND_LXML)
+        for snippet in rnd.sample(snippets, k=4):
+            bs4_found = await validator._verify_snippet_in_rendered_page("req", 1, bs4_text, snippet, "https://example.com")
+            lxml_found = await validator._verify_snippet_in_rendered_page("req", 1, lxml_text, snippet, "https://example.com")
+            assert bs4_found == lxml_found, (snippet, html)
+            outcomes += bs4_found
+    assert outcomes > 0  # the corpus exercises positive verifications too
@@ -0,0 +1,143 @@
+"""Unit tests for the micro-batching HTML parser API client against the local stub server (offline)."""
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+pytest.importorskip("fastapi")
+
+from validator.html_parser_api_client import HtmlParserApiClient
+from validator.html_parser_api_stub import create_app
+
+
+def _stub_app():
+    async def fetch_html(url: str) -> tuple[int, str]:
+        await asyncio.sleep(5 if url.endswith("/slow") else 0.01)
+        if url.endswith("/missing"):
+            return 404, "<html><body>Not found</body></html>"
+        return 200, f"<html><body><p>Page {url}</p>{'<p>filler text</p>' * 200}</body></html>"
+
+    return create_app(fetch_html)
+
+
+def _client(app, **kwargs) -> HtmlParserApiClient:
+    return HtmlParserApiClient("http://parser.test", transport=httpx.ASGITransport(app=app), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_renders_are_batched_and_deduplicated():
+    app = _stub_app()
+    client = _client(app, max_batch_size=16, max_wait_secs=0.05)
+    urls = [f"https://news.example/{i % 5}" for i in range(10)] + ["https://news.example/missing"]
+    responses = await asyncio.gather(*(client.render(url) for url in urls))
+    await client.aclose()
+
+    assert app.state.batch_calls == 1
+    assert app.state.render_calls == 0
+    assert app.state.urls_fetched == 6  # 5 distinct pages + missing
+    assert client.stats()["urls_deduplicated"] == 5
+    for url, response in zip(urls[:10], responses[:10]):
+        assert response.status_code == 200
+        assert f"Page {url}" in response.text
+    assert responses[-1].status_code == 404
+    # Deduplicated callers still get their own response objects (they are annotated per caller)
+    assert responses[0] is not responses[5]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting():
+    app = _stub_app()
+    client = _client(app, max_batch_size=4, max_wait_secs=10)
+    responses = await asyncio.wait_for(
+        asyncio.gather(*(client.render(f"https://news.example/{i}") for i in range(8))), timeout=2
+    )
+    await client.aclose()
+    assert all(r.status_code == 200 for r in responses)
+    assert app.state.batch_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_responses_are_gzip_compressed():
+    app = _stub_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, headers={"Accept-Encoding": "gzip"}) as raw:
+        request = raw.build_request("POST", "http://parser.test/render_batch", json={"urls": ["https://news.example/1"]})
+        response = await raw.send(request, stream=True)
+        raw_bytes = b"".join([chunk async for chunk in response.aiter_raw()])
+        await response.aclose()
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw_bytes).startswith(b'{"url"')
+
+
+@pytest.mark.asyncio
+async def test_slow_url_does_not_hold_up_the_rest_of_its_batch():
+    # httpx.ASGITransport buffers whole responses, so the stub's streamed reply is replayed line by line here
+    async def handler(request: httpx.Request) -> httpx.Response:
+        urls = json.loads(request.content)["urls"]
+
+        async def lines():
+            # Completion order: the slow page comes last
+            for url in sorted(urls, key=lambda url: url.endswith("/slow")):
+                if url.endswith("/slow"):
+                    await asyncio.sleep(5)
+                yield (json.dumps({"url": url, "status_code": 200, "html": f"<p>Page {url}</p>"}) + "\n").encode()
+
+        return httpx.Response(200, headers={"content-type": "application/x-ndjson"}, content=lines())
+
+    client = HtmlParserApiClient(
+        "http://parser.test", transport=httpx.MockTransport(handler),
+        max_batch_size=4, max_wait_secs=0.01, url_timeout_secs=0.5,
+    )
+    loop = asyncio.get_running_loop()
+    finished_at = {}
+
+    async def render(url):
+        response = await client.render(url)
+        finished_at[url] = loop.time()
+        return response
+
+    start = loop.time()
+    urls = ["https://news.example/slow", "https://news.example/1", "https://news.example/2"]
+    slow, *fast = await asyncio.wait_for(asyncio.gather(*(render(url) for url in urls)), timeout=3)
+    await client.aclose()
+
+    # Partial results: the other pages arrive as soon as they are rendered, the slow one misses its deadline
+    for url, response in zip(urls[1:], fast):
+        assert response.status_code == 200 and f"Page {url}" in response.text
+        assert finished_at[url] - start < 0.3
+    assert slow is None
+    assert client.stats()["urls_timed_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stub_streams_each_url_as_it_finishes():
+    app = _stub_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport) as raw:
+        response = await raw.post(
+            "http://parser.test/render_batch",
+            json={"urls": ["https://news.example/slow", "https://news.example/1"], "timeout_secs": 0.2},
+        )
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    # Completion order, and the URL past the deadline is reported instead of awaited
+    assert [(item["url"], item["status_code"]) for item in items] == [
+        ("https://news.example/1", 200), ("https://news.example/slow", 504),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_single_render_when_server_has_no_batch_endpoint():
+    app = _stub_app()
+    app.router.routes = [r for r in app.router.routes if getattr(r, "path", "") != "/render_batch"]
+    client = _client(app, max_wait_secs=0.01)
+    responses = await asyncio.gather(*(client.render(f"https://news.example/{i}") for i in range(3)))
+    later = await client.render("https://news.example/9")
+    await client.aclose()
+
+    assert all(r.status_code == 200 for r in responses + [later])
+    assert client.batch_supported is False
+    assert app.state.render_calls == 4
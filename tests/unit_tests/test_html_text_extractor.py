@@ -0,0 +1,97 @@
+"""Parity tests: the streaming extractor (validator.html_text_extractor) must match SnippetFetcher.clean_html."""
+import random
+from unittest.mock import patch
+
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+
+from validator.html_text_extractor import StreamingTextExtractor, extract_text
+
+PAGES = [
+    "<html><body><p>Hello <b>world</b>!</p><script>var x = 1;</script><style>p {}</style><p>after</p></body></html>",
+    "﻿<!DOCTYPE html><html><head><title>Title</title></head><body>a<!-- comment -->b<?php echo 1 ?>c</body></html>",
+    "<p>one<aside>side <b>bold</b></aside>two<noscript>no script</noscript>three",
+    "<div><ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby><template><p>template</p></template> end</div>",
+    "plain text only",
+    "",
+    "<table><tr><td>a<td>b</table><p>x</i></b>y</p><iframe>frame text</iframe><ins>ad</ins>z",
+    "<svg><script>bad</script><text>svg text</text></svg><math><mi>x</mi></math>",
+    "<p>café &amp; &nbsp; naïve — “quoted”</p>\r\n<pre>  code\n  block </pre>",
+    "<html><body><div>unclosed <span>span <p>para</div> after div</body></html> trailing",
+    "<script>document.write('<p>x</p>')</script><p>real</p><style>a</style>",
+    "<title>A</title><body><select><option>o1<option>o2</select><textarea> t </textarea>",
+]
+
+
+def _clean_html_reference(html: str) -> str:
+    """Same steps as validator.html_clean_pool.clean_html_text (what SnippetFetcher.clean_html runs)."""
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup.select("script, iframe, ins, aside, noscript"):
+        tag.decompose()
+    return soup.getText(separator=" ", strip=True)
+
+
+def _random_pages(count: int, seed: int = 0) -> list[str]:
+    rnd = random.Random(seed)
+    tags = ["p", "div", "span", "script", "style", "aside", "noscript", "iframe", "ins", "b", "a",
+            "table", "td", "tr", "rt", "rp", "template", "li", "ul", "br", "h1", "section"]
+    texts = ["hello", "wörld", "x < y", "a&amp;b", "  ", "\n", "snippet text here", "😀 emoji", "<!-- c -->", ""]
+    pages = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rnd.randint(1, 60)):
+            tag, text = rnd.choice(tags), rnd.choice(texts)
+            parts.append(rnd.choice([f"<{tag}>{text}", f"{text}</{tag}>", f"<{tag}>{text}</{tag}>", text]))
+        pages.append("".join(parts))
+    return pages
+
+
+def _feed_in_chunks(html: str, rnd: random.Random, max_chunk: int) -> str:
+    extractor = StreamingTextExtractor()
+    pos = 0
+    while pos < len(html):
+        size = rnd.randint(1, max_chunk)
+        extractor.feed(html[pos:pos + size])
+        pos += size
+    return extractor.close()
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_matches_clean_html(html):
+    assert extract_text(html) == _clean_html_reference(html)
+
+
+def test_matches_clean_html_for_any_chunking():
+    rnd = random.Random(1)
+    for html in PAGES + _random_pages(150):
+        expected = _clean_html_reference(html)
+        assert extract_text(html) == expected, html
+        for max_chunk in (1, 7, 64):
+            assert _feed_in_chunks(html, rnd, max_chunk) == expected, html
+
+
+@pytest.mark.asyncio
+async def test_fetcher_uses_streamed_text_instead_of_clean_html():
+    pytest.importorskip("bittensor")
+    from validator.snippet_fetcher import SnippetFetcher
+
+    html = "<html><body><p>Streamed</p><script>skip()</script><p>page text é</p></body></html>"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, content=html.encode("utf-8"))
+
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    # Off by default while the clean pool is on
+    with patch("validator.snippet_fetcher.USE_STREAMING_EXTRACTION", True), \
+            patch.object(fetcher, "clean_html", side_effect=AssertionError("text should come from the stream")):
+        result = await fetcher.fetch_entire_page("req", 1, "https://example.com/page")
+
+    assert result.cleaned_html == _clean_html_reference(html) == "Streamed page text é"
+    assert result.cleaning_html_time_secs >= 0
+    await fetcher.client.aclose()
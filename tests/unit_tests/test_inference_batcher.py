@@ -0,0 +1,75 @@
+"""Unit tests for the dynamic micro-batching inference queue (validator.inference_batcher)."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.inference_batcher import InferenceBatcher, length_buckets
+
+
+class _FakeModel:
+    """encode: the item is its own token length; forward: records each batch and returns length * 10."""
+
+    def __init__(self, fail_length: int | None = None):
+        self.fail_length = fail_length
+        self.batches = []
+
+    def encode(self, item):
+        if item < 0:
+            raise ValueError("cannot tokenize")
+        return item, item
+
+    def forward(self, encodings):
+        self.batches.append(list(encodings))
+        if self.fail_length in encodings:
+            raise RuntimeError("forward failed")
+        return [length * 10 for length in encodings]
+
+
+def test_length_buckets_limit_padding_and_batch_size():
+    lengths = [100, 12, 300, 10, 140, 11, 310, 13]
+    buckets = length_buckets(lengths, max_batch_size=3, max_padding_ratio=1.5)
+    assert [[lengths[i] for i in bucket] for bucket in buckets] == [[10, 11, 12], [13], [100, 140], [300, 310]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_items_are_batched_by_length_and_fanned_back():
+    model = _FakeModel()
+    batcher = InferenceBatcher(model.encode, model.forward, max_batch_size=16, max_wait_secs=0.01, max_padding_ratio=1.5)
+    items = [100, 12, 300, 10, 140, 11, 12]
+    results = await asyncio.gather(*(batcher.submit(item) for item in items))
+    await batcher.aclose()
+
+    assert results == [item * 10 for item in items]
+    assert sorted(map(sorted, model.batches)) == [[10, 11, 12], [100, 140], [300]]  # the repeated 12 is run once
+    stats = batcher.stats()
+    assert stats["submitted"] == 7 and stats["deduplicated"] == 1
+    assert stats["batches"] == 3 and stats["max_batch_size"] == 3
+    assert stats["avg_batch_size"] == 2.0
+    assert stats["max_queue_wait_ms"] >= 5
+    assert 0 < stats["padding_efficiency"] <= 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_flushed_without_waiting():
+    model = _FakeModel()
+    batcher = InferenceBatcher(model.encode, model.forward, max_batch_size=4, max_wait_secs=10)
+    results = await asyncio.wait_for(asyncio.gather(*(batcher.submit(10 + i) for i in range(8))), timeout=2)
+    await batcher.aclose()
+    assert results == [(10 + i) * 10 for i in range(8)]
+    assert batcher.stats()["batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_only_reach_the_items_of_the_failed_batch():
+    model = _FakeModel(fail_length=300)
+    batcher = InferenceBatcher(model.encode, model.forward, max_wait_secs=0.01)
+    results = await asyncio.gather(
+        batcher.submit(10), batcher.submit(-1), batcher.submit(300), batcher.submit(11), return_exceptions=True
+    )
+    await batcher.aclose()
+    assert results[0] == 100 and results[3] == 110
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], RuntimeError)
+    assert batcher.stats()["failed_items"] == 2
@@ -0,0 +1,130 @@
+"""Unit tests for the snippet fetcher page cache and single-flight (validator.page_cache)."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from shared.veridex_protocol import FetchPageResult, SNIPPET_FETCHER_STATUS_OK
+from validator.page_cache import PageCache, SingleFlight, as_cache_hit
+from validator.snippet_fetcher import SnippetFetcher
+
+
+def _result(text: str) -> FetchPageResult:
+    return FetchPageResult(
+        cleaned_html=text,
+        fetch_by_http_time_secs=1.5,
+        cleaning_html_time_secs=0.2,
+        fetch_by_http_status=SNIPPET_FETCHER_STATUS_OK,
+    )
+
+
+def test_page_cache_returns_cached_result():
+    cache = PageCache(max_bytes=1024 * 1024, ttl_secs=60)
+    cache.put("https://example.com/a", _result("page a"))
+    assert cache.get("https://example.com/a").cleaned_html == "page a"
+    assert cache.get("https://example.com/b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_page_cache_does_not_cache_empty_results():
+    cache = PageCache(max_bytes=1024 * 1024, ttl_secs=60)
+    cache.put("https://example.com/a", FetchPageResult())
+    assert cache.get("https://example.com/a") is None
+    assert len(cache) == 0
+
+
+def test_page_cache_evicts_least_recently_used_when_over_byte_budget():
+    # Distinct pages of one size (identical text would be stored and counted once)
+    entry_size = PageCache._entry_size(_result("x" * 1000))
+    cache = PageCache(max_bytes=entry_size * 2, ttl_secs=60)
+    cache.put("a", _result("a" * 1000))
+    cache.put("b", _result("b" * 1000))
+    cache.get("a")  # a becomes most recently used
+    cache.put("c", _result("c" * 1000))
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_page_cache_expires_entries_after_ttl():
+    cache = PageCache(max_bytes=1024 * 1024, ttl_secs=10)
+    with patch("validator.page_cache.time.monotonic", return_value=100.0):
+        cache.put("a", _result("page a"))
+    with patch("validator.page_cache.time.monotonic", return_value=109.0):
+        assert cache.get("a") is not None
+    with patch("validator.page_cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert cache.total_bytes == 0
+
+
+def test_as_cache_hit_zeroes_times_and_keeps_status():
+    hit = as_cache_hit(_result("page"))
+    assert hit.from_page_cache is True
+    assert hit.fetch_by_http_time_secs == 0.0
+    assert hit.fetch_by_selenium_time_secs == -1.0
+    assert hit.cleaning_html_time_secs == 0.0
+    assert hit.fetch_by_http_status == SNIPPET_FETCHER_STATUS_OK
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "done"
+
+    flight = SingleFlight()
+    results = await asyncio.gather(*[flight.run("k", work) for _ in range(5)])
+    assert results == ["done"] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_caller():
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "done"
+
+    flight = SingleFlight()
+    first = asyncio.ensure_future(flight.run("k", work))
+    await started.wait()
+    second = asyncio.ensure_future(flight.run("k", work))
+    first.cancel()
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_fetch_entire_page_deduplicates_and_caches():
+    fetcher = SnippetFetcher()
+    calls = 0
+
+    async def fake_fetch(request_id, miner_uid, url, key):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _result("page text")
+
+    with patch.object(fetcher, "_fetch_and_clean_page", side_effect=fake_fetch):
+        results = await asyncio.gather(*[
+            fetcher.fetch_entire_page("req", uid, "https://example.com/page#section")
+            for uid in range(3)
+        ])
+        cached = await fetcher.fetch_entire_page("req", 4, "https://example.com/page")
+
+    assert calls == 1
+    assert all(r.cleaned_html == "page text" for r in results)
+    assert results[0] is not results[1]
+    assert cached.from_page_cache is True
+    assert cached.fetch_by_http_time_secs == 0.0
+    await fetcher.client.aclose()
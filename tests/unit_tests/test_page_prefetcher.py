@@ -0,0 +1,112 @@
+"""Unit tests for popularity-driven page prefetch (validator.page_prefetcher and its SnippetFetcher wiring)."""
+import asyncio
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.page_prefetcher import PagePrefetcher
+
+
+def _prefetcher(refresh, needs_refresh=lambda key: True, is_idle=lambda: True, **kwargs) -> PagePrefetcher:
+    return PagePrefetcher(refresh, needs_refresh, is_idle, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_only_popular_pages_that_need_it_are_refreshed():
+    refreshed = []
+
+    async def refresh(url: str) -> int:
+        refreshed.append(url)
+        return 100
+
+    prefetcher = _prefetcher(refresh, needs_refresh=lambda key: key != "fresh", min_citations=3)
+    for _ in range(5):
+        prefetcher.record("hot", "https://hot.example/")
+        prefetcher.record("fresh", "https://fresh.example/")
+    prefetcher.record("cold", "https://cold.example/")
+
+    assert await prefetcher.prefetch_once() == 1
+    assert refreshed == ["https://hot.example/"]
+    assert prefetcher.stats()["bytes_fetched"] == 100
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_and_concurrency_are_respected():
+    running = 0
+    peak = 0
+
+    async def refresh(url: str) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return 1000
+
+    prefetcher = _prefetcher(refresh, min_citations=1, max_concurrency=2, max_bytes_per_interval=3000)
+    for i in range(10):
+        prefetcher.record(f"page{i}", f"https://site.example/{i}")
+
+    pages = await prefetcher.prefetch_once()
+    assert peak == 2
+    assert 3 <= pages <= 4  # a worker may start one page before the other's bytes are counted
+
+
+@pytest.mark.asyncio
+async def test_round_stops_when_real_work_arrives():
+    idle = True
+
+    async def refresh(url: str) -> int:
+        nonlocal idle
+        idle = False  # a validation request came in
+        return 10
+
+    prefetcher = _prefetcher(refresh, is_idle=lambda: idle, min_citations=1, max_concurrency=1)
+    for i in range(5):
+        prefetcher.record(f"page{i}", f"https://site.example/{i}")
+    assert await prefetcher.prefetch_once() == 1
+    assert prefetcher.stats()["interrupted"] == 1
+
+
+def test_counts_decay_so_stale_pages_drop_out():
+    prefetcher = _prefetcher(lambda url: None, min_citations=2, decay=0.5)
+    for _ in range(4):
+        prefetcher.record("page", "https://site.example/")
+    assert prefetcher.popular() == [("page", "https://site.example/")]
+    prefetcher._decay()
+    assert prefetcher.popular() == [("page", "https://site.example/")]
+    prefetcher._decay()
+    assert prefetcher.popular() == []
+
+
+@pytest.mark.asyncio
+async def test_snippet_fetcher_prefetches_cited_pages_into_the_cache():
+    from validator.snippet_fetcher import SnippetFetcher
+
+    fetches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetches.append(str(request.url))
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, text="<p>Popular page</p>")
+
+    fetcher = SnippetFetcher()
+    fetcher.page_store = None
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    fetcher.page_prefetcher = PagePrefetcher(
+        fetcher._prefetch_page, fetcher._page_needs_prefetch, lambda: True, min_citations=2
+    )
+
+    for _ in range(3):
+        await fetcher.fetch_entire_page("req", 1, "https://wiki.example/Article")
+    assert len(fetches) == 1  # later citations were page cache hits
+
+    fetcher.page_cache.clear()  # entry expired
+    assert await fetcher.page_prefetcher.prefetch_once() == 1
+    assert len(fetches) == 2
+    result = await fetcher.fetch_entire_page("req", 1, "https://wiki.example/Article")
+    assert result.from_page_cache is True
+    assert fetcher.page_prefetcher.stats()["bytes_fetched"] == len(b"<p>Popular page</p>")
+    await fetcher.client.aclose()
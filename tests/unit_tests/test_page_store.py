@@ -0,0 +1,151 @@
+"""Unit tests for the on-disk page store (validator.page_store) and its use in SnippetFetcher."""
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from shared.veridex_protocol import SNIPPET_FETCHER_STATUS_OK
+from validator.page_store import (
+    DiskPageStore,
+    PAGE_STORE_BACKEND_HTTP,
+    PAGE_STORE_BACKEND_SELENIUM,
+)
+from validator.snippet_fetcher import SnippetFetcher
+
+PAGE_HTML = "<html><body><p>Stored page body text.</p></body></html>"
+
+
+def _rewrite_index(store, stored):
+    store._write_atomic(store._index_path(stored.url), json.dumps(asdict(stored)).encode("utf-8"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DiskPageStore(
+        str(tmp_path / "page_store"),
+        http_ttl_secs=60,
+        selenium_ttl_secs=3600,
+        max_age_secs=7 * 24 * 3600,
+    )
+
+
+def test_save_and_load_round_trip(store):
+    store.save("https://example.com/a", PAGE_HTML, PAGE_STORE_BACKEND_HTTP, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    stored = store.load("https://example.com/a")
+    assert stored is not None
+    assert stored.is_fresh()
+    assert store.read_body(stored) == PAGE_HTML
+    assert stored.conditional_headers() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert store.load("https://example.com/missing") is None
+
+
+def test_selenium_pages_get_longer_ttl(store):
+    http_page = store.save("https://example.com/a", PAGE_HTML, PAGE_STORE_BACKEND_HTTP)
+    selenium_page = store.save("https://example.com/b", PAGE_HTML, PAGE_STORE_BACKEND_SELENIUM)
+    assert selenium_page.ttl_secs > http_page.ttl_secs
+    assert not http_page.is_fresh(now=time.time() + 120)
+    assert selenium_page.is_fresh(now=time.time() + 120)
+
+
+def test_identical_bodies_share_one_blob(store):
+    first = store.save("https://example.com/a", PAGE_HTML, PAGE_STORE_BACKEND_HTTP)
+    second = store.save("https://example.com/b", PAGE_HTML, PAGE_STORE_BACKEND_HTTP)
+    assert first.content_hash == second.content_hash
+    blobs = [f for _, _, files in os.walk(os.path.join(store.root_dir, "blobs")) for f in files]
+    assert len(blobs) == 1
+
+
+def test_prune_removes_old_entries_and_orphan_blobs(store):
+    stored = store.save("https://example.com/a", PAGE_HTML, PAGE_STORE_BACKEND_HTTP)
+    stored.fetched_at = time.time() - store.max_age_secs - 10
+    _rewrite_index(store, stored)
+    blob_path = store._blob_path(stored.content_hash)
+    os.utime(blob_path, (time.time() - 3600, time.time() - 3600))
+
+    store.prune()
+
+    assert store.load("https://example.com/a") is None
+    assert not os.path.exists(blob_path)
+
+
+@pytest.mark.asyncio
+async def test_fetcher_prunes_the_store_in_the_background(store):
+    stored = store.save("https://example.com/a", PAGE_HTML, PAGE_STORE_BACKEND_HTTP)
+    stored.fetched_at = time.time() - store.max_age_secs - 10
+    _rewrite_index(store, stored)
+
+    fetcher = SnippetFetcher()
+    fetcher.page_store = store
+    with patch("validator.snippet_fetcher.PAGE_STORE_PRUNE_INTERVAL_SECONDS", 0.01):
+        fetcher.start_page_store_pruner()
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if store.load("https://example.com/a") is None:
+                break
+    fetcher._page_store_pruner_task.cancel()
+    await fetcher.client.aclose()
+    assert store.load("https://example.com/a") is None
+
+
+@pytest.mark.asyncio
+async def test_fetcher_revalidates_stale_page_with_conditional_request(store):
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, headers={"etag": '"v1"', "content-type": "text/html"}, text=PAGE_HTML)
+
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = store
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    first = await fetcher.fetch_entire_page("req", 1, "https://example.com/page")
+    await asyncio.gather(*fetcher._background_tasks)
+    assert first.cleaned_html == "Stored page body text."
+    assert first.from_page_store is False
+
+    # Make the stored entry stale so the next fetch revalidates instead of serving from disk
+    stored = store.load("https://example.com/page")
+    stored.ttl_secs = 0
+    _rewrite_index(store, stored)
+
+    second = await fetcher.fetch_entire_page("req", 1, "https://example.com/page")
+    assert seen_headers[-1].get("if-none-match") == '"v1"'
+    assert second.cleaned_html == first.cleaned_html
+    assert second.from_page_store is True
+    assert second.fetch_by_http_status == SNIPPET_FETCHER_STATUS_OK
+    await fetcher.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetcher_serves_fresh_page_without_network(store):
+    store.save("https://example.com/page", PAGE_HTML, PAGE_STORE_BACKEND_SELENIUM)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("fresh page store entries must not hit the network")
+
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = store
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    result = await fetcher.fetch_entire_page("req", 1, "https://example.com/page")
+    assert result.cleaned_html == "Stored page body text."
+    assert result.from_page_store is True
+    assert result.fetch_by_selenium_status == SNIPPET_FETCHER_STATUS_OK
+    await fetcher.client.aclose()
@@ -0,0 +1,67 @@
+"""Unit tests for forkserver worker pools (validator.process_pool)."""
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_workers_do_not_rerun_the_entry_point(tmp_path):
+    marker = tmp_path / "imports"
+    entry_point = tmp_path / "entry_point.py"
+    # Stands in for the validator entry point: its top level (which would load the models) must run once
+    entry_point.write_text(textwrap.dedent(f"""
+        import os
+        import sys
+        sys.path.insert(0, {REPO!r})
+        with open({str(marker)!r}, "a") as f:
+            f.write("imported\\n")
+
+        from validator.process_pool import WorkerProcessPool
+
+        if __name__ == "__main__":
+            pool = WorkerProcessPool(2)
+            pids = {{pool.submit(os.getpid).result() for _ in range(4)}}
+            pool.shutdown()
+            assert os.getpid() not in pids
+            print("ok")
+    """))
+    result = subprocess.run([sys.executable, str(entry_point)], capture_output=True, text=True, timeout=120)
+    assert result.stdout.strip() == "ok", result.stderr
+    assert marker.read_text().splitlines() == ["imported"]
+
+
+def test_launching_workers_leaves_main_alone_and_shares_one_preload_list():
+    import threading
+    from multiprocessing import forkserver
+
+    from validator.process_pool import WORKER_PRELOAD_MODULES, WorkerProcessPool
+
+    main = sys.modules["__main__"]
+    swapped = []
+    stop = threading.Event()
+
+    def watch():
+        while not stop.is_set():
+            if sys.modules["__main__"] is not main:
+                swapped.append(True)
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    pools = [WorkerProcessPool(2), WorkerProcessPool(2)]
+    try:
+        for pool in pools:
+            assert {pool.submit(os.getpid).result(timeout=60) for _ in range(4)}
+    finally:
+        stop.set()
+        watcher.join()
+        for pool in pools:
+            pool.shutdown()
+    assert not swapped
+    assert pools[0]._mp_context is pools[1]._mp_context
+    assert forkserver._forkserver._preload_modules == WORKER_PRELOAD_MODULES
@@ -0,0 +1,121 @@
+"""Unit tests for Selenium render-completion detection (validator.render_completion), using scripted snapshots."""
+import time
+
+from validator.render_completion import (
+    RENDER_REASON_CHALLENGE_TIMEOUT,
+    RENDER_REASON_STABLE,
+    RENDER_REASON_TIMEOUT,
+    RenderCompletionDetector,
+    wait_for_render_completion,
+)
+
+
+def _snapshot(node_count=100, text_length=5000, resource_count=10, idle_ms=1000, ready="complete", title="Article"):
+    return {
+        "readyState": ready,
+        "title": title,
+        "nodeCount": node_count,
+        "textLength": text_length,
+        "resourceCount": resource_count,
+        "msSinceLastResponse": idle_ms,
+        "challengeElement": False,
+    }
+
+
+class ScriptedDriver:
+    """Returns the scripted snapshots in order, then repeats the last one."""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = 0
+
+    def execute_script(self, script):
+        snapshot = self.snapshots[min(self.calls, len(self.snapshots) - 1)]
+        self.calls += 1
+        return snapshot
+
+
+def test_ready_page_completes_after_stable_polls_without_fixed_sleep():
+    driver = ScriptedDriver([_snapshot()])
+    start = time.monotonic()
+    result = wait_for_render_completion(driver, max_wait_secs=5, poll_interval_secs=0.01, stable_polls=3)
+    assert result.reason == RENDER_REASON_STABLE
+    assert result.polls == 4  # first snapshot + 3 identical ones
+    assert time.monotonic() - start < 1
+    assert not result.challenge_seen
+
+
+def test_growing_dom_or_busy_network_is_not_stable():
+    detector = RenderCompletionDetector(stable_polls=2, network_idle_ms=500)
+    assert not detector.update(_snapshot(node_count=10))
+    assert not detector.update(_snapshot(node_count=50))  # DOM still growing
+    assert not detector.update(_snapshot(node_count=50, idle_ms=100))  # a resource just finished
+    assert not detector.update(_snapshot(node_count=50, resource_count=11))  # a new request started
+    assert not detector.update(_snapshot(node_count=50, resource_count=11))
+    assert detector.update(_snapshot(node_count=50, resource_count=11))
+
+
+def test_loading_document_is_not_stable():
+    detector = RenderCompletionDetector(stable_polls=1)
+    for _ in range(5):
+        assert not detector.update(_snapshot(ready="loading"))
+    assert detector.update(_snapshot(ready="interactive"))
+
+
+def test_challenge_page_is_waited_out_until_the_real_page_renders():
+    challenge = _snapshot(title="Just a moment...")
+    snapshots = [challenge] * 5 + [_snapshot(title="Real article")]
+    result = wait_for_render_completion(ScriptedDriver(snapshots), max_wait_secs=5, poll_interval_secs=0.01, stable_polls=2)
+    assert result.reason == RENDER_REASON_STABLE
+    assert result.challenge_seen
+    assert result.polls == 8
+
+
+def test_challenge_element_is_detected_without_title():
+    snapshot = _snapshot(title="example.com")
+    snapshot["challengeElement"] = True
+    assert RenderCompletionDetector.is_challenge(snapshot)
+    assert not RenderCompletionDetector.is_challenge(_snapshot())
+
+
+def test_hard_upper_bound():
+    counter = iter(range(10**6))
+    churning = ScriptedDriver([])
+    churning.execute_script = lambda script: _snapshot(node_count=next(counter))
+    result = wait_for_render_completion(churning, max_wait_secs=0.1, poll_interval_secs=0.01)
+    assert result.reason == RENDER_REASON_TIMEOUT
+    assert result.waited_secs < 1
+
+    stuck = ScriptedDriver([_snapshot(title="Attention Required! | Cloudflare")])
+    result = wait_for_render_completion(stuck, max_wait_secs=0.1, poll_interval_secs=0.01)
+    assert result.reason == RENDER_REASON_CHALLENGE_TIMEOUT
+
+
+def test_ordinary_titles_with_challenge_words_are_not_challenges():
+    for title in [
+        "Please wait while we load your article",
+        "Security check results for 2024",
+        "Access denied: the court ruling explained",
+        "One more step toward peace talks",
+        "Just a moment of silence for the victims",
+    ]:
+        assert not RenderCompletionDetector.is_challenge(_snapshot(title=title)), title
+    for title in ["Just a moment...", "  just a moment…", "Attention Required! | Cloudflare", "DDoS-Guard"]:
+        assert RenderCompletionDetector.is_challenge(_snapshot(title=title)), title
+
+
+def test_only_challenges_get_the_longer_cap():
+    counter = iter(range(10**6))
+    churning = ScriptedDriver([])
+    churning.execute_script = lambda script: _snapshot(node_count=next(counter))
+    result = wait_for_render_completion(churning, max_wait_secs=0.05, poll_interval_secs=0.01, challenge_max_wait_secs=5)
+    assert result.reason == RENDER_REASON_TIMEOUT
+    assert result.waited_secs < 0.5
+
+    challenge = _snapshot(title="Just a moment...")
+    snapshots = [challenge] * 20 + [_snapshot(title="Real article")]
+    result = wait_for_render_completion(
+        ScriptedDriver(snapshots), max_wait_secs=0.05, poll_interval_secs=0.01, stable_polls=2, challenge_max_wait_secs=5
+    )
+    assert result.reason == RENDER_REASON_STABLE
+    assert result.challenge_seen
@@ -0,0 +1,137 @@
+"""Unit tests for the Selenium driver pool (validator.selenium_driver_pool), using fake drivers."""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.selenium_driver_pool import SeleniumDriverPool
+
+
+class FakeDriver:
+    def __init__(self, name: int):
+        self.name = name
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeDriverFactory:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.drivers = []
+
+    def __call__(self):
+        if self.fail:
+            return None
+        driver = FakeDriver(len(self.drivers))
+        self.drivers.append(driver)
+        return driver
+
+
+def _pool(factory, max_drivers=2, max_pages=10) -> SeleniumDriverPool:
+    return SeleniumDriverPool(factory, max_drivers=max_drivers, max_pages=max_pages, max_rss_mb=4096)
+
+
+@pytest.mark.asyncio
+async def test_prewarm_creates_drivers_once():
+    factory = FakeDriverFactory()
+    pool = _pool(factory, max_drivers=3)
+    await pool.prewarm(2)
+    assert pool.stats()["idle"] == 2
+
+    pooled = await pool.acquire()
+    assert pooled.driver is factory.drivers[0]
+    await pool.release(pooled)
+    assert len(factory.drivers) == 2  # reused, not re-created
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_idle_driver_is_replaced():
+    factory = FakeDriverFactory()
+    pool = _pool(factory)
+    await pool.prewarm(1)
+    factory.drivers[0].alive = False
+
+    pooled = await pool.acquire()
+    assert pooled.driver is factory.drivers[1]
+    assert factory.drivers[0].quit_called
+    assert pool.stats()["unhealthy"] == 1
+    assert pool.stats()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_driver_is_recycled_after_max_pages_or_failure():
+    factory = FakeDriverFactory()
+    pool = _pool(factory, max_pages=2)
+
+    for _ in range(2):
+        pooled = await pool.acquire()
+        await pool.release(pooled)
+    assert factory.drivers[0].quit_called
+    assert pool.stats()["recycled"] == 1
+
+    pooled = await pool.acquire()
+    pooled.healthy = False  # fetch failed
+    await pool.release(pooled)
+    assert factory.drivers[1].quit_called
+    assert pool.stats()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_callers_wait_when_pool_is_full_and_wait_time_is_reported():
+    factory = FakeDriverFactory()
+    pool = _pool(factory, max_drivers=1)
+    holder = await pool.acquire()
+
+    waiter = asyncio.ensure_future(pool.acquire())
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    assert pool.stats()["waiting"] == 1
+
+    await pool.release(holder)
+    pooled = await waiter
+    assert pooled.driver is factory.drivers[0]
+    assert pooled.wait_secs >= 0.05
+    assert pool.stats()["max_wait_secs"] >= 0.05
+    assert pool.stats()["in_use"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_creation_frees_the_slot():
+    pool = _pool(FakeDriverFactory(fail=True), max_drivers=1)
+    assert await pool.acquire() is None
+    assert pool.stats()["total"] == 0
+
+
+class SlowResetDriver(FakeDriver):
+    def delete_all_cookies(self):
+        time.sleep(0.1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_release_still_returns_the_driver():
+    pool = SeleniumDriverPool(lambda: SlowResetDriver(0), max_drivers=1, max_pages=10, max_rss_mb=4096)
+
+    pooled = await pool.acquire()
+    task = asyncio.create_task(pool.release(pooled))
+    await asyncio.sleep(0.02)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The shielded return finishes on its own: the one slot is free again
+    again = await asyncio.wait_for(pool.acquire(), timeout=2)
+    assert again is pooled
+    assert pool.stats()["in_use"] == 1
@@ -0,0 +1,68 @@
+"""Unit tests for the Selenium fallback render profiles (validator.selenium_render_profile)."""
+import fnmatch
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.webdriver.chrome.options import Options
+
+from validator.selenium_render_profile import (
+    BLOCKED_URL_PATTERNS,
+    SELENIUM_RENDER_PROFILE_FULL,
+    SELENIUM_RENDER_PROFILE_LIGHT,
+    apply_render_profile_cdp,
+    apply_render_profile_options,
+)
+
+
+class RecordingDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+
+
+def _disable_features_switches(options: Options) -> list[str]:
+    return [a for a in options.arguments if a.startswith("--disable-features=")]
+
+
+def test_full_profile_keeps_regular_chrome():
+    options = Options()
+    apply_render_profile_options(options, SELENIUM_RENDER_PROFILE_FULL)
+    assert options.arguments == ["--disable-features=IsolateOrigins,site-per-process"]
+    assert options.page_load_strategy == "normal"
+
+    driver = RecordingDriver()
+    apply_render_profile_cdp(driver, SELENIUM_RENDER_PROFILE_FULL)
+    assert driver.commands == []
+
+
+def test_light_profile_blocks_resources_and_loads_eagerly():
+    options = Options()
+    apply_render_profile_options(options, SELENIUM_RENDER_PROFILE_LIGHT)
+    assert options.page_load_strategy == "eager"
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+    # A single --disable-features switch (Chrome ignores all but the last one)
+    switches = _disable_features_switches(options)
+    assert len(switches) == 1
+    assert "IsolateOrigins" in switches[0] and "Translate" in switches[0]
+
+    driver = RecordingDriver()
+    apply_render_profile_cdp(driver, SELENIUM_RENDER_PROFILE_LIGHT)
+    assert [cmd for cmd, _ in driver.commands] == ["Network.enable", "Network.setBlockedURLs"]
+
+
+@pytest.mark.parametrize("url, blocked", [
+    ("https://cdn.example.com/hero.jpg", True),
+    ("https://cdn.example.com/hero.webp?w=800", True),
+    ("https://fonts.example.com/inter.woff2", True),
+    ("https://example.com/static/site.css?v=3", True),
+    ("https://example.com/clip.mp4", True),
+    ("https://example.com/article/2024/pyramids", False),
+    ("https://example.com/app.js", False),
+    ("https://example.com/api/data.json", False),
+])
+def test_blocked_url_patterns(url, blocked):
+    assert any(fnmatch.fnmatchcase(url, pattern) for pattern in BLOCKED_URL_PATTERNS) == blocked
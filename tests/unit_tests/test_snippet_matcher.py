@@ -0,0 +1,86 @@
+"""Unit tests for batched snippet-in-page verification (validator.snippet_matcher)."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.snippet_matcher import PageSnippetBatcher, find_exact_matches, verify_snippets_in_page
+
+PAGE = "the great pyramid of giza was built for the pharaoh khufu around 2560 bc and remained the tallest structure"
+SNIPPETS = [
+    "built for the pharaoh khufu",
+    "the tallest structure",
+    "hanging gardens of babylon",
+    "",
+    "built for the pharaoh khufu",
+]
+
+
+def test_exact_matches_without_pyahocorasick():
+    with patch("validator.snippet_matcher.AHOCORASICK_AVAILABLE", False):
+        assert find_exact_matches(PAGE, SNIPPETS) == [snippet in PAGE for snippet in SNIPPETS]
+
+
+def test_exact_matches_with_pyahocorasick():
+    pytest.importorskip("ahocorasick")
+    overlapping = SNIPPETS + ["pyramid of giza was", "giza", "khufu around 2560 bc and"]
+    with patch("validator.snippet_matcher.AHOCORASICK_AVAILABLE", True):
+        assert find_exact_matches(PAGE, overlapping) == [snippet in PAGE for snippet in overlapping]
+
+
+def test_only_misses_go_to_the_fuzzy_fallback():
+    snippets = [
+        "built for the pharaoh khufu",
+        "built for the pharoah khufu around 2560 bc",  # one transposition
+        "built for the pharoah khufu around 2560 bc",
+        "pharoah khufu",  # too short for the fuzzy check
+        "hanging gardens of babylon were in iraq",
+    ]
+    with patch("validator.snippet_matcher.fuzzy_ratio", wraps=lambda s, p: 0.97 if "pharoah" in s else 0.4) as ratio:
+        matches = verify_snippets_in_page(PAGE, snippets, fuzzy_threshold=0.94, min_fuzzy_length=25)
+    assert [(m.found, m.exact) for m in matches] == [(True, True), (True, False), (True, False), (False, False), (False, False)]
+    assert matches[1].ratio == 0.97
+    assert ratio.call_count == 2  # the repeated miss is scored once, the exact match and the short snippet never
+
+
+@pytest.mark.asyncio
+async def test_concurrent_snippets_for_a_page_are_verified_together():
+    batcher = PageSnippetBatcher(fuzzy_threshold=0.94, min_fuzzy_length=25, max_wait_secs=0.01)
+    other_page = "an unrelated page about the hanging gardens of babylon"
+    with patch("validator.snippet_matcher.find_exact_matches", wraps=find_exact_matches) as exact:
+        results = await asyncio.gather(
+            batcher.verify(PAGE, "built for the pharaoh khufu"),
+            batcher.verify(PAGE, "the tallest structure"),
+            batcher.verify(other_page, "hanging gardens of babylon"),
+            batcher.verify(PAGE, "hanging gardens of babylon"),
+        )
+    assert [match.found for match in results] == [True, True, True, False]
+    assert exact.call_count == 2  # one scan per page
+    assert batcher.stats() == {"batches": 2, "snippets": 4}
+
+
+@pytest.mark.asyncio
+async def test_lone_snippet_is_not_held_back_by_the_batch_wait():
+    batcher = PageSnippetBatcher(fuzzy_threshold=0.94, min_fuzzy_length=25, max_wait_secs=10)
+    match = await asyncio.wait_for(batcher.verify(PAGE, "built for the pharaoh khufu"), timeout=1)
+    assert match.found
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_does_not_leave_callers_waiting():
+    started = asyncio.Event()
+
+    async def run(fn, *args):
+        started.set()
+        await asyncio.sleep(10)
+
+    batcher = PageSnippetBatcher(fuzzy_threshold=0.94, min_fuzzy_length=25, run=run)
+    waiters = [asyncio.ensure_future(batcher.verify(PAGE, snippet)) for snippet in ("the pharaoh", "the tallest")]
+    await started.wait()
+    for task in list(batcher._tasks):
+        task.cancel()
+
+    results = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
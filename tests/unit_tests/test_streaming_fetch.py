@@ -0,0 +1,86 @@
+"""Unit tests for the streaming, byte-capped HTTP fetch in SnippetFetcher."""
+import gzip
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from shared.veridex_protocol import SNIPPET_FETCHER_STATUS_OK, SNIPPET_FETCHER_STATUS_SKIPPED
+from validator.snippet_fetcher import SnippetFetcher
+
+
+async def _fetcher_with(handler) -> SnippetFetcher:
+    fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+
+@pytest.mark.asyncio
+async def test_body_over_budget_is_truncated():
+    body = b"<html><body><p>" + b"word " * 2000 + b"</p></body></html>"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, content=body)
+
+    fetcher = await _fetcher_with(handler)
+    with patch("validator.snippet_fetcher.FETCH_MAX_BYTES", 1000):
+        response = await fetcher.send_get_request("req", 1, "https://example.com/big")
+        result = await fetcher.fetch_entire_page("req", 1, "https://example.com/big")
+
+    assert response.truncated is True
+    assert len(response.content) == 1000
+    assert response.headers["content-length"] == "1000"  # describes the body we kept
+    assert result.truncated is True
+    assert result.fetch_by_http_status == SNIPPET_FETCHER_STATUS_OK
+    assert result.cleaned_html.startswith("word word")
+    await fetcher.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_small_compressed_body_is_read_whole():
+    html = b"<html><body><p>Compressed page text.</p></body></html>"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "content-encoding": "gzip"},
+            content=gzip.compress(html),
+        )
+
+    fetcher = await _fetcher_with(handler)
+    response = await fetcher.send_get_request("req", 1, "https://example.com/small")
+    assert response.truncated is False
+    assert response.content == html
+    assert "content-encoding" not in response.headers
+
+    result = await fetcher.fetch_entire_page("req", 1, "https://example.com/small")
+    assert result.cleaned_html == "Compressed page text."
+    assert result.truncated is False
+    await fetcher.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_non_html_payload_is_skipped_before_download():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF-1.7 ...")
+
+    fetcher = await _fetcher_with(handler)
+    with patch.object(fetcher, "clean_html", side_effect=AssertionError("non-HTML must not be cleaned")):
+        result = await fetcher.fetch_entire_page("req", 1, "https://example.com/paper.pdf")
+
+    assert result.cleaned_html == ""
+    assert result.fetch_by_http_status == SNIPPET_FETCHER_STATUS_SKIPPED
+    assert result.fetch_by_http_time_secs >= 0
+    await fetcher.client.aclose()
+
+
+def test_missing_content_type_is_treated_as_html():
+    assert SnippetFetcher._is_html_content_type("")
+    assert SnippetFetcher._is_html_content_type("text/html; charset=ISO-8859-1")
+    assert SnippetFetcher._is_html_content_type("Application/XHTML+XML")
+    assert not SnippetFetcher._is_html_content_type("image/png")
@@ -0,0 +1,68 @@
+"""Unit tests for the shared snippet/page text normalizer (validator.text_normalizer)."""
+import random
+import re
+import unicodedata
+
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.text_normalizer import NormalizedTextCache, normalize_text
+
+
+def legacy_normalize_text(text):
+    """The normalizer previously inlined in SnippetValidator._verify_snippet_in_rendered_page."""
+    text = unicodedata.normalize("NFKC", text or "")
+    text = re.sub(r"\[\s*\d+\s*\]", '', text)
+    text = re.sub(r'["“”‘’`´]', "'", text)
+    text = re.sub(r'[–—−]', '-', text)
+    text = re.sub(r"[^\w\s'-]", '', text)
+    text = text.lower()
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+SAMPLES = [
+    None,
+    "",
+    "   \n\t ",
+    "The “Great” Pyramid [ 12 ] was built — around 2560 BC.",
+    "Citations [1][2] [ 3 ]and [x] [١٢] [1a] [[4]]",
+    "It's `quoted´ ‘twice’ and \"plain\"; 3−2 – 1",
+    "ﬁne ｆｕｌｌｗｉｄｔｈ Ⅻ ² ½ № ℃",  # NFKC compatibility forms
+    "İstanbul ΣΊΣΥΦΟΣ Straße ǅemal",  # case mapping that changes length
+    "non breaking em thin​zero　ideographic\x1c\x1d\x1e\x1f\x85",
+    "emoji 🙂 and symbols © ® ™ • … ¶ § † ‡",
+    "Ελληνικά, русский, العربية، 中文。日本語「かな」",
+    "under_score hy-phen -- ' ' '' -",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_the_legacy_normalizer(text):
+    assert normalize_text(text) == legacy_normalize_text(text)
+
+
+def test_matches_the_legacy_normalizer_on_random_unicode():
+    rng = random.Random(1234)
+    alphabet = (
+        "ab Z09[] \t\n'\"`´“”‘’–—−-.,;:!?()_/\\  ​　\x1c"
+        "éÉßİıΣς½²ﬁＡ１٣" + "".join(chr(rng.randrange(0x20, 0x3000)) for _ in range(200))
+    )
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 60)))
+        assert normalize_text(text) == legacy_normalize_text(text), repr(text)
+
+
+def test_page_text_is_normalized_once_and_lru_bounded():
+    cache = NormalizedTextCache(max_bytes=10_000)
+    page = "The “Great” Pyramid [1] was built."
+    assert cache.normalize(page) == legacy_normalize_text(page)
+    assert cache.normalize("".join(list(page))) == legacy_normalize_text(page)  # equal text, different object
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    for i in range(200):
+        cache.normalize(f"page number {i} " * 10)
+    assert cache.stats()["bytes"] <= 10_000
+    assert cache.stats()["entries"] < 200
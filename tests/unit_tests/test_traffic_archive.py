@@ -0,0 +1,132 @@
+"""Unit tests for the recorded-traffic archive and offline replay (validator.traffic_archive)."""
+import gzip
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from validator.traffic_archive import RecordingTransport, ReplayTransport, TrafficArchive
+
+PAGE = b"<html><body><p>Recorded article text</p></body></html>"
+
+
+def _live_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/old":
+        return httpx.Response(301, headers={"location": "https://site.example/new"})
+    if request.url.path == "/new":
+        return httpx.Response(200, headers={"content-type": "text/html", "content-encoding": "gzip"}, content=gzip.compress(PAGE))
+    if request.method == "POST":
+        return httpx.Response(200, text=f"rendered {request.content.decode()}")
+    return httpx.Response(404)
+
+
+async def _record(path: str):
+    archive = TrafficArchive(path)
+    client = httpx.AsyncClient(transport=RecordingTransport(httpx.MockTransport(_live_handler), archive), follow_redirects=True)
+    async with client:
+        live = await client.get("https://site.example/old")
+        await client.post("https://parser.example/render", json={"url": "a"})
+        await client.post("https://parser.example/render", json={"url": "b"})
+    return live
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_recorded_responses_without_network(tmp_path):
+    path = str(tmp_path / "traffic.jsonl.gz")
+    live = await _record(path)
+    assert live.content == PAGE
+
+    replay = ReplayTransport(TrafficArchive(path).load(), latency_scale=0)
+    async with httpx.AsyncClient(transport=replay, follow_redirects=True) as client:
+        response = await client.get("https://site.example/old")
+        rendered_b = await client.post("https://parser.example/render", json={"url": "b"})
+        with pytest.raises(httpx.ConnectError):
+            await client.get("https://site.example/never-recorded")
+
+    assert response.status_code == 200
+    assert response.content == PAGE
+    assert [r.status_code for r in response.history] == [301]
+    assert rendered_b.text == 'rendered {"url":"b"}'  # POSTs are told apart by their body
+    assert replay.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_latency_is_scaled(tmp_path):
+    path = str(tmp_path / "traffic.jsonl.gz")
+    archive = TrafficArchive(path)
+
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        import asyncio
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, text="slow page")
+
+    async with httpx.AsyncClient(transport=RecordingTransport(httpx.MockTransport(slow_handler), archive)) as client:
+        await client.get("https://slow.example/")
+
+    entries = TrafficArchive(path).load()
+    async with httpx.AsyncClient(transport=ReplayTransport(entries, latency_scale=0.5)) as client:
+        start = time.perf_counter()
+        await client.get("https://slow.example/")
+        elapsed = time.perf_counter() - start
+    assert 0.08 < elapsed < 0.2
+
+
+@pytest.mark.asyncio
+async def test_recording_reads_only_what_the_reader_consumes(tmp_path):
+    path = str(tmp_path / "traffic.jsonl.gz")
+    produced = []
+
+    async def huge_body():
+        for i in range(1000):
+            produced.append(i)
+            yield b"x" * 1024
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content_type = "application/pdf" if request.url.path.endswith(".pdf") else "text/html"
+        return httpx.Response(200, headers={"content-type": content_type}, content=huge_body())
+
+    async with httpx.AsyncClient(transport=RecordingTransport(httpx.MockTransport(handler), TrafficArchive(path))) as client:
+        # A capped reader stops after 4 KB; a non-HTML response is closed without reading
+        async with client.stream("GET", "https://big.example/page") as response:
+            received = 0
+            async for chunk in response.aiter_raw():
+                received += len(chunk)
+                if received >= 4096:
+                    break
+        async with client.stream("GET", "https://big.example/file.pdf"):
+            pass
+
+    assert len(produced) == 4
+    entries = TrafficArchive(path).load()
+    assert len(entries[("GET", "https://big.example/page", "")][0].body) == 4096
+    assert entries[("GET", "https://big.example/file.pdf", "")][0].body == b""
+
+
+def test_truncated_archive_loads_complete_records(tmp_path):
+    path = tmp_path / "traffic.jsonl.gz"
+    data = gzip.compress(b'{"method": "GET", "url": "https://a.example/", "status_code": 200, "headers": [], '
+                         b'"body": "", "elapsed_secs": 0.1}\n{"method": "GET", "url": "https://b.ex')
+    path.write_bytes(data[:-12])  # cut off the gzip trailer mid-record
+    entries = TrafficArchive(str(path)).load()
+    assert list(entries) == [("GET", "https://a.example/", "")]
+
+
+@pytest.mark.asyncio
+async def test_snippet_fetcher_replays_pages_offline(tmp_path):
+    from validator.snippet_fetcher import SnippetFetcher
+
+    path = str(tmp_path / "traffic.jsonl.gz")
+    await _record(path)
+    with patch("validator.snippet_fetcher.SNIPPET_FETCHER_MODE", "replay"), \
+            patch("validator.snippet_fetcher.TRAFFIC_ARCHIVE_PATH", path), \
+            patch("validator.snippet_fetcher.TRAFFIC_REPLAY_LATENCY_SCALE", 0):
+        fetcher = SnippetFetcher()
+    fetcher.page_cache = None
+    fetcher.page_store = None
+
+    result = await fetcher.fetch_entire_page("req", 1, "https://site.example/old")
+    await fetcher.client.aclose()
+    assert result.cleaned_html == "Recorded article text"
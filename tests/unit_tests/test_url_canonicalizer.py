@@ -0,0 +1,124 @@
+"""Unit tests for URL canonicalization, the permanent-redirect memory and page text dedupe in the page cache."""
+import httpx
+import pytest
+
+pytest.importorskip("bittensor")
+
+from shared.veridex_protocol import FetchPageResult, SNIPPET_FETCHER_STATUS_OK
+from validator.page_cache import PageCache
+from validator.url_canonicalizer import RedirectMemory, canonicalize_url
+
+
+def test_variants_of_one_article_share_a_key():
+    key = canonicalize_url("https://news.example.com/world/story-1")
+    for variant in (
+        "http://news.example.com/world/story-1",
+        "https://News.Example.com:443/world/story-1",
+        "https://news.example.com/world/story-1?utm_source=x&utm_medium=y&fbclid=abc",
+        "https://news.example.com/world/story-1#comments",
+    ):
+        assert canonicalize_url(variant) == key, variant
+
+
+def test_variants_that_may_serve_other_markup_keep_their_own_key():
+    # Whichever variant is fetched first must not decide the text of the others
+    key = canonicalize_url("https://news.example.com/world/story-1")
+    for variant in (
+        "https://news.example.com/world/story-1/",
+        "https://news.example.com/world/story-1/amp",
+        "https://news.example.com/amp/world/story-1",
+        "https://amp.news.example.com/world/story-1",
+        "https://news.example.com/world/story-1?amp=1",
+        "https://news.example.com/world/story-1?outputType=amp",
+    ):
+        assert canonicalize_url(variant) != key, variant
+
+
+def test_meaningful_differences_are_kept():
+    assert canonicalize_url("https://a.example/p?id=1") != canonicalize_url("https://a.example/p?id=2")
+    assert canonicalize_url("https://a.example/p?b=2&a=1") == canonicalize_url("https://a.example/p?a=1&b=2")
+    assert canonicalize_url("https://a.example:8443/p") == "https://a.example:8443/p"
+    assert canonicalize_url("https://a.example/") == "https://a.example/"
+    assert canonicalize_url("ftp://a.example/file") == "ftp://a.example/file"
+    assert canonicalize_url("https://amp.dev/documentation") == "https://amp.dev/documentation"
+
+
+def test_redirect_memory_follows_chains_and_ignores_loops():
+    memory = RedirectMemory()
+    memory.record("http://old.example/a", "https://old.example/a")
+    memory.record("https://old.example/a", "https://new.example/a")
+    assert memory.resolve("http://old.example/a?utm_source=feed") == "https://new.example/a"
+    assert memory.resolve("https://unknown.example/") == "https://unknown.example/"
+
+    memory.record("https://loop.example/x", "https://loop.example/y")
+    memory.record("https://loop.example/y", "https://loop.example/x")
+    assert memory.resolve("https://loop.example/x") in ("https://loop.example/x", "https://loop.example/y")
+
+
+def test_redirect_memory_expires_entries():
+    memory = RedirectMemory(ttl_secs=0)
+    memory.record("https://old.example/a", "https://new.example/a")
+    assert memory.resolve("https://old.example/a") == "https://old.example/a"
+
+
+def test_page_cache_stores_identical_text_once():
+    cache = PageCache(max_bytes=1024 * 1024, ttl_secs=60)
+    text = "".join(["same article text"] * 100)
+    copy = "".join(["same article text"] * 100)
+    assert text is not copy
+    cache.put("https://mirror-a.example/p", FetchPageResult(cleaned_html=text, fetch_by_http_status=SNIPPET_FETCHER_STATUS_OK))
+    cache.put("https://mirror-b.example/p", FetchPageResult(cleaned_html=copy, fetch_by_http_status=SNIPPET_FETCHER_STATUS_OK))
+    assert cache.get("https://mirror-b.example/p").cleaned_html is cache.get("https://mirror-a.example/p").cleaned_html
+    assert cache.stats()["unique_texts"] == 1
+    assert cache.stats()["deduplicated"] == 1
+    cache._remove("https://mirror-a.example/p")
+    assert cache.stats()["unique_texts"] == 1
+    cache._remove("https://mirror-b.example/p")
+    assert cache.stats()["unique_texts"] == 0
+
+
+def test_page_cache_budget_counts_shared_text_once():
+    text = "".join(["same article text"] * 100)
+    size = PageCache._entry_size(FetchPageResult(cleaned_html=text))
+    cache = PageCache(max_bytes=size + size // 2, ttl_secs=60)
+    for i in range(5):
+        cache.put(f"https://mirror-{i}.example/p", FetchPageResult(cleaned_html="".join(["same article text"] * 100)))
+    assert len(cache) == 5
+    assert cache.total_bytes == size
+    cache.get("https://mirror-0.example/p")
+    cache.get("https://missing.example/p")
+    cache.clear()
+    assert cache.total_bytes == 0
+    stats = cache.stats()
+    assert stats["hits"] == stats["misses"] == stats["deduplicated"] == stats["unique_texts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_permanent_redirect_is_fetched_directly_next_time():
+    from validator.snippet_fetcher import SnippetFetcher
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        if request.url.host == "old.example":
+            return httpx.Response(301, headers={"location": "https://new.example/article"})
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, text="<p>Moved article</p>")
+
+    fetcher = SnippetFetcher()
+    fetcher.page_store = None
+    await fetcher.client.aclose()
+    fetcher.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+
+    first = await fetcher.fetch_entire_page("req", 1, "https://old.example/article")
+    assert first.cleaned_html == "Moved article"
+    assert requests == ["https://old.example/article", "https://new.example/article"]
+
+    # The final URL was cached too, and the old URL now resolves to it
+    fetcher.page_cache.clear()
+    second = await fetcher.fetch_entire_page("req", 1, "http://old.example/article?utm_source=feed")
+    assert second.cleaned_html == "Moved article"
+    assert requests[2:] == ["https://new.example/article"]
+    third = await fetcher.fetch_entire_page("req", 1, "https://new.example/article#comments")
+    assert third.from_page_cache is True
+    await fetcher.client.aclose()
@@ -57,6 +57,9 @@ from shared.wallet_api_key_utils import get_linked_wallet_from_payload
 from shared.log_data import LoggerType
 from shared.proxy_log_handler import register_proxy_log_handler
 from validator.snippet_validator import run_validate_miner_snippet
+from validator.snippet_fetcher import snippet_fetcher
+from validator.compute_pool import compute_pool, loop_lag_monitor, start_loop_lag_monitor
+from validator.quality_model import quality_model_batcher
 from validator.active_tester import StatementGenerator
 
 from dotenv import load_dotenv
@@ -1118,11 +1121,41 @@ async def startup_event():
     print("startup_event")
     app.state.handler = APIQueryHandler()
     print("APIQueryHandler instance created at startup.")
+    # Start Selenium drivers now so the first 403 fallback does not pay Chrome startup (runs in the background)
+    app.state.selenium_prewarm_task = asyncio.create_task(snippet_fetcher.prewarm_selenium_drivers())
+    # Keep connections open to the most-cited evidence hosts (USE_CONNECTION_WARM_POOL)
+    snippet_fetcher.start_connection_warmer()
+    # Refresh the most-cited pages into the page cache while idle (USE_PAGE_PREFETCH)
+    snippet_fetcher.start_page_prefetcher()
+    # Drop expired page store entries in the background (USE_PAGE_STORE)
+    snippet_fetcher.start_page_store_pruner()
+    # Sample event-loop blocking time, logged with the validation compute pool stats
+    start_loop_lag_monitor()
 
 @app.get("/version")
 async def version():
     return VERICORE_VALIDATOR_VERSION
 
+@app.get("/snippet_fetcher/circuit_breaker")
+async def snippet_fetcher_circuit_breaker():
+    # Open host/URL breakers and their remaining cool-down
+    return snippet_fetcher.host_health.snapshot()
+
+@app.get("/snippet_fetcher/selenium_pool")
+async def snippet_fetcher_selenium_pool():
+    # Driver pool occupancy and how long fetches waited for a free driver
+    return snippet_fetcher.selenium_pool.stats()
+
+@app.get("/compute_pool")
+async def compute_pool_stats():
+    # Event-loop lag and per-stage queue wait / run time of the validation compute pool
+    return {
+        "event_loop": loop_lag_monitor.stats(),
+        **compute_pool.stats(),
+        # Batch sizes and queue wait of the quality model micro-batcher
+        "quality_model": quality_model_batcher.stats(),
+    }
+
 @app.post("/veridex_query")
 async def veridex_query(request: Request):
     try:
@@ -0,0 +1,122 @@
+import re
+import codecs
+
+try:
+    from charset_normalizer import from_bytes as detect_from_bytes
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+# Where the page's <meta charset> must appear (the HTML spec prescans 1024 bytes; real pages are sloppier)
+META_SNIFF_BYTES = 4096
+# Unlabelled pages: statistical detection looks at this much of the body, never the whole page
+DETECT_BYTES = 64 * 1024
+
+# HTML with ASCII markup and no BOM is never UTF-16/32, but even-length samples of legacy encodings can score as it
+_DETECT_EXCLUDED = ["utf_16", "utf_16_le", "utf_16_be", "utf_32", "utf_32_le", "utf_32_be"]
+
+CHARSET_SOURCE_BOM = "bom"
+CHARSET_SOURCE_HTTP = "http"
+CHARSET_SOURCE_META = "meta"
+CHARSET_SOURCE_DETECTED = "detected"
+CHARSET_SOURCE_DEFAULT = "default"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# <meta charset="x"> and <meta http-equiv="Content-Type" content="text/html; charset=x">
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+?charset\s*=\s*["']?\s*([a-zA-Z0-9_:.\-]+)""", re.IGNORECASE)
+_CONTENT_TYPE_CHARSET_RE = re.compile(r"""charset\s*=\s*["']?\s*([a-zA-Z0-9_:.\-]+)""", re.IGNORECASE)
+
+# Labels browsers decode differently from Python's codec of the same name (WHATWG Encoding Standard)
+_BROWSER_ENCODING_OVERRIDES = {
+    "iso8859-1": "cp1252",
+    "ascii": "cp1252",
+    "iso8859-9": "cp1254",
+    "tis-620": "cp874",
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+}
+
+
+def normalize_charset(label: str | None) -> str | None:
+    """Python codec name for a charset label as browsers interpret it; None for unknown labels."""
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip().strip("'\"")).name
+    except LookupError:
+        return None
+    name = _BROWSER_ENCODING_OVERRIDES.get(name, name)
+    # A page cannot really be UTF-16 when its label was readable as ASCII (the spec maps it to UTF-8)
+    if name.startswith("utf-16") or name.startswith("utf-32"):
+        return "utf-8"
+    return name
+
+
+def charset_from_content_type(content_type: str | None) -> str | None:
+    match = _CONTENT_TYPE_CHARSET_RE.search(content_type or "")
+    return normalize_charset(match.group(1)) if match else None
+
+
+def sniff_meta_charset(prefix: bytes) -> str | None:
+    match = _META_CHARSET_RE.search(prefix[:META_SNIFF_BYTES])
+    return normalize_charset(match.group(1).decode("ascii", "ignore")) if match else None
+
+
+def _looks_like_utf8(sample: bytes) -> bool:
+    try:
+        sample.decode("utf-8")
+        return True
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample boundary is still UTF-8
+        return e.start >= len(sample) - 3 and e.reason == "unexpected end of data"
+
+
+def detect_charset(sample: bytes) -> tuple[str, str]:
+    """Charset of an unlabelled page from a bounded sample: valid UTF-8, else statistical detection, else cp1252."""
+    sample = sample[:DETECT_BYTES]
+    if _looks_like_utf8(sample):
+        return "utf-8", CHARSET_SOURCE_DEFAULT
+    if CHARSET_NORMALIZER_AVAILABLE:
+        # End the sample on a tag boundary: a multi-byte character cut in half makes the detector reject its codec
+        # ('<' is below every trail-byte range of the CJK encodings)
+        cut = sample.rfind(b"<")
+        if cut > 0:
+            sample = sample[:cut]
+        best = detect_from_bytes(sample, cp_exclusion=_DETECT_EXCLUDED).best()
+        encoding = normalize_charset(best.encoding) if best is not None else None
+        if encoding:
+            return encoding, CHARSET_SOURCE_DETECTED
+    return "cp1252", CHARSET_SOURCE_DEFAULT
+
+
+def resolve_charset(content_type: str | None, prefix: bytes, final: bool = True) -> tuple[str, str] | None:
+    """
+    (encoding, source) for an HTML body, from its first bytes only: BOM, then the HTTP charset, then <meta charset>,
+    then detection on at most DETECT_BYTES. While streaming (final=False) returns None until prefix is long enough
+    to decide: META_SNIFF_BYTES for labelled pages, DETECT_BYTES for unlabelled ones.
+    """
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding, CHARSET_SOURCE_BOM
+    encoding = charset_from_content_type(content_type)
+    if encoding:
+        return encoding, CHARSET_SOURCE_HTTP
+    if not final and len(prefix) < META_SNIFF_BYTES:
+        return None
+    encoding = sniff_meta_charset(prefix)
+    if encoding:
+        return encoding, CHARSET_SOURCE_META
+    if not final and len(prefix) < DETECT_BYTES:
+        return None
+    return detect_charset(prefix)
+
+
+def decode_html(body: bytes, encoding: str) -> str:
+    """Decode like a browser: undecodable bytes become U+FFFD; a leading BOM is dropped."""
+    text = body.decode(encoding, "replace")
+    return text[1:] if text.startswith("\N{BYTE ORDER MARK}") else text
@@ -0,0 +1,205 @@
+import time
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable
+
+import bittensor as bt
+
+from shared.environment_variables import (
+    USE_COMPUTE_POOL,
+    COMPUTE_POOL_TEXT_MATCH_WORKERS,
+    COMPUTE_POOL_EMBEDDING_WORKERS,
+    LOOP_LAG_SAMPLE_INTERVAL_MS,
+    LOOP_LAG_STALL_MS,
+    LOOP_LAG_LOG_INTERVAL_SECONDS,
+)
+from validator.process_pool import WorkerProcessPool, timed_call
+
+# Page text normalization + exact/fuzzy snippet matching (one call per page): long C calls (NFKC, translate, lower)
+# that hold the GIL
+STAGE_TEXT_MATCH = "text_match"
+# Sentence-transformer encodes (context similarity, search page detection): torch releases the GIL
+STAGE_EMBEDDING = "embedding"
+
+
+@dataclass
+class ComputeStage:
+    name: str
+    max_workers: int
+    # Worker processes (for work that holds the GIL) instead of threads; falls back to threads if the pool breaks
+    processes: bool = False
+
+
+@dataclass
+class _StageStats:
+    tasks: int = 0
+    failed: int = 0
+    inline: int = 0
+    queue_wait_secs: float = 0.0
+    run_secs: float = 0.0
+    max_queue_wait_secs: float = 0.0
+    max_run_secs: float = 0.0
+
+    def record(self, queue_wait_secs: float, run_secs: float):
+        self.tasks += 1
+        self.queue_wait_secs += queue_wait_secs
+        self.run_secs += run_secs
+        self.max_queue_wait_secs = max(self.max_queue_wait_secs, queue_wait_secs)
+        self.max_run_secs = max(self.max_run_secs, run_secs)
+
+    def as_dict(self) -> dict:
+        return {
+            "tasks": self.tasks,
+            "failed": self.failed,
+            "inline": self.inline,
+            "avg_queue_wait_secs": self.queue_wait_secs / self.tasks if self.tasks else 0.0,
+            "max_queue_wait_secs": self.max_queue_wait_secs,
+            "avg_run_secs": self.run_secs / self.tasks if self.tasks else 0.0,
+            "max_run_secs": self.max_run_secs,
+        }
+
+
+class ComputePool:
+    """
+    Runs CPU-heavy validation steps off the event loop, each on the bounded worker pool of its stage, with
+    per-stage counts, queue wait and run time. Process stages use WorkerProcessPool workers (fn must be a
+    module-level function of a WORKER_PRELOAD_MODULES module, its arguments picklable; large arguments are pickled on every call, so
+    send a page once per task). With enabled=False everything runs inline on the loop (still timed, so the
+    blocking it causes shows up in stats()).
+    """
+
+    def __init__(self, stages: list[ComputeStage], enabled: bool = True):
+        self.stages = {stage.name: stage for stage in stages}
+        self.enabled = enabled
+        self._executors: dict[str, Executor] = {}
+        self._stats = {stage.name: _StageStats() for stage in stages}
+
+    def _get_executor(self, stage: ComputeStage) -> Executor:
+        executor = self._executors.get(stage.name)
+        if executor is None:
+            if stage.processes:
+                executor = WorkerProcessPool(stage.max_workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=stage.max_workers, thread_name_prefix=f"compute-{stage.name}")
+            self._executors[stage.name] = executor
+        return executor
+
+    async def run(self, stage_name: str, fn: Callable, *args, **kwargs):
+        stage = self.stages[stage_name]
+        stats = self._stats[stage_name]
+        if not self.enabled:
+            stats.inline += 1
+            try:
+                result, _, run_secs = timed_call(fn, *args, **kwargs)
+            except Exception:
+                stats.failed += 1
+                raise
+            stats.record(0.0, run_secs)
+            return result
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(timed_call, fn, *args, **kwargs)
+        submitted_at = time.time()
+        try:
+            result, started_at, run_secs = await loop.run_in_executor(self._get_executor(stage), call)
+        except BrokenProcessPool as e:
+            # A worker died (OOM kill); start a fresh pool next time and run this task in a thread
+            bt.logging.warning(f"Compute pool {stage_name}: worker pool broken, recreating: {e}")
+            self._shutdown_stage(stage_name)
+            stats.inline += 1
+            result, started_at, run_secs = await asyncio.to_thread(call)
+        except Exception:
+            stats.failed += 1
+            raise
+        stats.record(max(0.0, started_at - submitted_at), run_secs)
+        return result
+
+    def _shutdown_stage(self, stage_name: str):
+        executor = self._executors.pop(stage_name, None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        for stage_name in list(self._executors):
+            self._shutdown_stage(stage_name)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "stages": {
+                name: {"max_workers": self.stages[name].max_workers, "processes": self.stages[name].processes, **stats.as_dict()}
+                for name, stats in self._stats.items()
+            },
+        }
+
+
+class LoopLagMonitor:
+    """
+    Measures how long the event loop is blocked: a task sleeps interval_secs at a time and records how late it
+    wakes up. Lag above stall_secs counts as a stall (every other coroutine waited at least that long).
+    """
+
+    def __init__(self, interval_secs: float = 0.05, stall_secs: float = 0.1):
+        self.interval_secs = interval_secs
+        self.stall_secs = stall_secs
+        self.samples = 0
+        self.blocked_secs = 0.0
+        self.max_lag_secs = 0.0
+        self.stalls = 0
+        self._task: asyncio.Task | None = None
+
+    def record(self, lag_secs: float):
+        self.samples += 1
+        self.blocked_secs += lag_secs
+        self.max_lag_secs = max(self.max_lag_secs, lag_secs)
+        if lag_secs > self.stall_secs:
+            self.stalls += 1
+
+    async def run(self, log_interval_secs: float = 0, extra_stats: Callable[[], dict] | None = None):
+        """Sample forever; every log_interval_secs (0 = never) log the lag stats (and extra_stats())."""
+        last_log = time.perf_counter()
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval_secs)
+            now = time.perf_counter()
+            self.record(max(0.0, now - start - self.interval_secs))
+            if log_interval_secs and now - last_log >= log_interval_secs:
+                last_log = now
+                extra = f" | {extra_stats()}" if extra_stats is not None else ""
+                bt.logging.info(f"Event loop lag: {self.stats()}{extra}")
+
+    def start(self, log_interval_secs: float = 0, extra_stats: Callable[[], dict] | None = None):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(log_interval_secs, extra_stats))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "samples": self.samples,
+            "blocked_secs": round(self.blocked_secs, 3),
+            "max_lag_secs": round(self.max_lag_secs, 3),
+            "stalls": self.stalls,
+        }
+
+
+compute_pool = ComputePool(
+    [
+        ComputeStage(STAGE_TEXT_MATCH, COMPUTE_POOL_TEXT_MATCH_WORKERS, processes=True),
+        ComputeStage(STAGE_EMBEDDING, COMPUTE_POOL_EMBEDDING_WORKERS),
+    ],
+    enabled=USE_COMPUTE_POOL,
+)
+loop_lag_monitor = LoopLagMonitor(LOOP_LAG_SAMPLE_INTERVAL_MS / 1000, LOOP_LAG_STALL_MS / 1000)
+
+
+def start_loop_lag_monitor():
+    """Start sampling event-loop lag (called from validator startup), logged with the compute pool stats."""
+    loop_lag_monitor.start(LOOP_LAG_LOG_INTERVAL_SECONDS, compute_pool.stats)
@@ -0,0 +1,116 @@
+import time
+import asyncio
+from collections import Counter
+from typing import Callable
+from urllib.parse import urlparse
+
+import httpx
+import bittensor as bt
+
+from validator.host_scheduler import THROTTLE_STATUS_CODES, HostScheduler
+
+WARM_REQUEST_TIMEOUT_SECONDS = 10
+
+
+class ConnectionWarmer:
+    """
+    Keeps pooled (HTTP/2 where offered) connections open to the most-cited evidence hosts.
+
+    record() counts fetched origins; every interval_secs the top max_hosts origins get a HEAD / request through
+    the shared client, which opens a connection (DNS + TCP + TLS) or keeps an idle one from expiring. Counts
+    decay each round so hosts that stop being cited drop out. The client's keepalive_expiry must be longer than
+    interval_secs for the connections to survive between rounds.
+
+    Warm requests look like the real fetches (headers(url) gives the same browser headers) and take a slot from
+    the host scheduler, so they count against each host's concurrency limit; a throttled or failed warm request
+    backs the host off like a fetch would.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_hosts: int,
+        interval_secs: float,
+        decay: float = 0.5,
+        headers: Callable[[str], dict] | None = None,
+        scheduler: HostScheduler | None = None,
+    ):
+        self.client = client
+        self.max_hosts = max_hosts
+        self.interval_secs = interval_secs
+        self.decay = decay
+        self.headers = headers
+        self.scheduler = scheduler
+        self._counts: Counter[str] = Counter()
+        self.rounds = 0
+        self.warmed = 0
+        self.failed = 0
+
+    def record(self, url: str):
+        parsed = urlparse(url)
+        if parsed.scheme in ("http", "https") and parsed.netloc:
+            self._counts[f"{parsed.scheme}://{parsed.netloc}"] += 1
+
+    def top_origins(self) -> list[str]:
+        return [origin for origin, _ in self._counts.most_common(self.max_hosts)]
+
+    async def _head(self, url: str) -> int:
+        # No redirects: the point is the connection to this origin, not whatever / redirects to
+        response = await self.client.head(
+            url,
+            headers=self.headers(url) if self.headers is not None else None,
+            timeout=WARM_REQUEST_TIMEOUT_SECONDS,
+            follow_redirects=False,
+        )
+        return response.status_code
+
+    async def _warm(self, origin: str) -> bool:
+        url = f"{origin}/"
+        try:
+            if self.scheduler is None:
+                await self._head(url)
+                return True
+            async with self.scheduler.slot(urlparse(origin).hostname or "") as slot:
+                start = time.perf_counter()
+                try:
+                    status_code = await self._head(url)
+                except Exception:
+                    slot.record(None, time.perf_counter() - start)
+                    raise
+                # Only back-off signals: a cheap HEAD answered quickly says nothing about page fetch latency
+                if status_code in THROTTLE_STATUS_CODES:
+                    slot.record(status_code, time.perf_counter() - start)
+                return True
+        except Exception:
+            return False
+
+    async def warm_once(self):
+        origins = self.top_origins()
+        results = await asyncio.gather(*(self._warm(origin) for origin in origins))
+        self.rounds += 1
+        self.warmed += sum(results)
+        self.failed += len(results) - sum(results)
+        for origin in list(self._counts):
+            self._counts[origin] *= self.decay
+            if self._counts[origin] < 0.5:
+                del self._counts[origin]
+        return origins
+
+    async def run(self):
+        """Warm forever (started as a background task at validator startup)."""
+        while True:
+            await asyncio.sleep(self.interval_secs)
+            try:
+                origins = await self.warm_once()
+                if origins:
+                    bt.logging.info(f"Connection warm pool: refreshed {len(origins)} hosts | {self.stats()}")
+            except Exception as e:
+                bt.logging.warning(f"Connection warm pool: round failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "tracked_hosts": len(self._counts),
+            "rounds": self.rounds,
+            "warmed": self.warmed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+import tldextract
+
+# Expired cookies are swept from a site's jar at most once per this many responses from it
+CLEAR_EXPIRED_EVERY = 20
+
+# Bundled public suffix list only: no download on the fetch path
+_extract = tldextract.TLDExtract(suffix_list_urls=())
+
+
+def site_key(host: str) -> str:
+    """
+    Registrable domain of host ("example.co.uk" for www.example.co.uk): the jar a host's cookies live in, so
+    cookies set for a parent domain reach sibling subdomains and survive www. <-> apex redirects. Hosts without
+    one (IP addresses, localhost) get a jar of their own.
+    """
+    extracted = _extract(host)
+    if extracted.domain and extracted.suffix:
+        return f"{extracted.domain}.{extracted.suffix}"
+    return host
+
+
+class HostCookieJars:
+    """
+    One cookie jar per site (registrable domain, see site_key: the session a browser would have with that site),
+    LRU-bounded in both the number of sites and the cookies kept per site. Replaces a single process-wide jar, which
+    grew without limit and which httpx copies in full on every request. Within a site's jar the usual cookie rules
+    apply: host-only cookies are sent to their own host, Domain= cookies to every matching subdomain.
+    """
+
+    def __init__(self, max_hosts: int = 1000, max_cookies_per_host: int = 50):
+        self.max_hosts = max_hosts
+        self.max_cookies_per_host = max_cookies_per_host
+        self._jars: "OrderedDict[str, httpx.Cookies]" = OrderedDict()
+        self._responses_since_sweep: dict[str, int] = {}
+        self.evicted_hosts = 0
+        self.evicted_cookies = 0
+
+    def get(self, host: str) -> httpx.Cookies | None:
+        jar = self._jars.get(host)
+        if jar is not None:
+            self._jars.move_to_end(host)
+        return jar
+
+    def _get_or_create(self, host: str) -> httpx.Cookies:
+        jar = self.get(host)
+        if jar is None:
+            jar = httpx.Cookies()
+            self._jars[host] = jar
+            while len(self._jars) > self.max_hosts:
+                evicted_host, _ = self._jars.popitem(last=False)
+                self._responses_since_sweep.pop(evicted_host, None)
+                self.evicted_hosts += 1
+        return jar
+
+    def add_cookie_header(self, request: httpx.Request):
+        jar = self.get(site_key(request.url.host))
+        if jar is not None and "cookie" not in request.headers:
+            jar.set_cookie_header(request)
+
+    def extract_cookies(self, response: httpx.Response):
+        if "set-cookie" not in response.headers:
+            return
+        host = site_key(response.request.url.host)
+        jar = self._get_or_create(host)
+        jar.extract_cookies(response)
+
+        swept = self._responses_since_sweep.get(host, 0) + 1
+        if swept >= CLEAR_EXPIRED_EVERY or len(jar.jar) > self.max_cookies_per_host:
+            jar.jar.clear_expired_cookies()
+            swept = 0
+        self._responses_since_sweep[host] = swept
+        # Still over the cap: drop the oldest cookies (the jar iterates in insertion order per domain/path)
+        excess = len(jar.jar) - self.max_cookies_per_host
+        if excess > 0:
+            for cookie in list(jar.jar)[:excess]:
+                jar.jar.clear(cookie.domain, cookie.path, cookie.name)
+            self.evicted_cookies += excess
+
+    def clear(self):
+        self._jars.clear()
+        self._responses_since_sweep.clear()
+
+    def __len__(self):
+        return len(self._jars)
+
+    def stats(self) -> dict:
+        return {
+            "hosts": len(self._jars),
+            "cookies": sum(len(jar.jar) for jar in self._jars.values()),
+            "evicted_hosts": self.evicted_hosts,
+            "evicted_cookies": self.evicted_cookies,
+        }
+
+
+def refusing_cookie_jar() -> CookieJar:
+    """Jar for a client whose cookies live in a CookieJarTransport: it never stores anything."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class CookieJarTransport(httpx.AsyncBaseTransport):
+    """
+    Applies HostCookieJars at the transport level: each request (including every redirect hop) gets the cookies of
+    its own site, and Set-Cookie headers go into that site's jar. Give the client a refusing_cookie_jar(): httpx
+    copies the client jar on every request, and an empty one keeps that O(1).
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, jars: HostCookieJars):
+        self.transport = transport
+        self.jars = jars
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.jars.add_cookie_header(request)
+        response = await self.transport.handle_async_request(request)
+        response.request = request
+        self.jars.extract_cookies(response)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
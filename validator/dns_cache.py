@@ -0,0 +1,269 @@
+import time
+import socket
+import asyncio
+import ipaddress
+import contextvars
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import httpcore
+import bittensor as bt
+
+from validator.page_cache import SingleFlight
+
+# Happy eyeballs (RFC 8305): the next resolved address is tried after this long without an answer from the
+# previous ones (or at once when one fails); the first connection wins and the others are cancelled
+CONNECTION_ATTEMPT_DELAY_SECS = 0.25
+
+
+@dataclass
+class ConnectionTiming:
+    """
+    Connection setup cost of one fetch (summed over redirects). Stays -1 when every request reused a pooled
+    connection, which is what the warm pool is for.
+    """
+    dns_secs: float = -1.0
+    connect_secs: float = -1.0  # TCP connect, excluding DNS
+    tls_secs: float = -1.0
+    new_connections: int = 0
+
+    def add(self, field_name: str, secs: float):
+        current = getattr(self, field_name)
+        setattr(self, field_name, secs if current < 0 else current + secs)
+
+
+# Set by the caller around a request; the network backend records into it (connections are opened in the caller's task)
+current_connection_timing: contextvars.ContextVar[ConnectionTiming | None] = contextvars.ContextVar(
+    "current_connection_timing", default=None
+)
+
+
+class DnsCache:
+    """
+    Async DNS cache in front of getaddrinfo. The system resolver does not expose record TTLs, so entries live for
+    ttl_secs (failures for negative_ttl_secs). When a refresh fails, the expired addresses are served for up to
+    another ttl_secs rather than failing the fetch. Concurrent lookups of the same host share one resolution.
+    """
+
+    def __init__(self, ttl_secs: float, negative_ttl_secs: float, max_entries: int = 4096):
+        self.ttl_secs = ttl_secs
+        self.negative_ttl_secs = negative_ttl_secs
+        self.max_entries = max_entries
+        # (host, port) -> (addresses or None for a failed lookup, resolved_at)
+        self._entries: "OrderedDict[tuple[str, int], tuple[list[str] | None, float]]" = OrderedDict()
+        self._single_flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    @staticmethod
+    async def _getaddrinfo(host: str, port: int) -> list[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = []
+        for _, _, _, _, sockaddr in infos:
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+        return addresses
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """IP addresses for host in resolver order; raises socket.gaierror for hosts that do not resolve."""
+        key = (host, port)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            addresses, resolved_at = entry
+            ttl = self.ttl_secs if addresses is not None else self.negative_ttl_secs
+            if now - resolved_at < ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if addresses is None:
+                    raise socket.gaierror(socket.EAI_NONAME, f"{host} did not resolve (cached)")
+                return addresses
+
+        self.misses += 1
+        try:
+            addresses = await self._single_flight.run(f"{host}:{port}", lambda: self._getaddrinfo(host, port))
+        except OSError:
+            if entry is not None and entry[0] is not None and now - entry[1] < 2 * self.ttl_secs:
+                self.stale_hits += 1
+                return entry[0]
+            self._store(key, None)
+            raise
+        self._store(key, addresses)
+        return addresses
+
+    def _store(self, key: tuple[str, int], addresses: list[str] | None):
+        self._entries[key] = (addresses, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, host: str, port: int):
+        self._entries.pop((host, port), None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+        }
+
+
+class _TimedNetworkStream(httpcore.AsyncNetworkStream):
+    """Passes everything through to the real stream; times the TLS handshake."""
+
+    def __init__(self, stream: httpcore.AsyncNetworkStream):
+        self._stream = stream
+
+    async def read(self, max_bytes: int, timeout: float | None = None) -> bytes:
+        return await self._stream.read(max_bytes, timeout=timeout)
+
+    async def write(self, buffer: bytes, timeout: float | None = None) -> None:
+        await self._stream.write(buffer, timeout=timeout)
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+    async def start_tls(self, ssl_context, server_hostname: str | None = None, timeout: float | None = None):
+        start = time.perf_counter()
+        stream = await self._stream.start_tls(ssl_context, server_hostname=server_hostname, timeout=timeout)
+        timing = current_connection_timing.get()
+        if timing is not None:
+            timing.add("tls_secs", time.perf_counter() - start)
+        return _TimedNetworkStream(stream)
+
+    def get_extra_info(self, info: str):
+        return self._stream.get_extra_info(info)
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that resolves hosts through a DnsCache (or plain getaddrinfo when dns_cache is None)
+    and records DNS / TCP connect / TLS time into current_connection_timing. TLS still uses the hostname for SNI
+    and certificate checks: httpcore passes the origin host to start_tls, not the address we connected to.
+    """
+
+    def __init__(self, dns_cache: DnsCache | None = None, backend: httpcore.AsyncNetworkBackend | None = None):
+        self.dns_cache = dns_cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    @staticmethod
+    def _is_ip_address(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    async def connect_tcp(self, host: str, port: int, timeout: float | None = None, local_address: str | None = None, socket_options=None):
+        timing = current_connection_timing.get()
+        if self._is_ip_address(host):
+            addresses = [host]
+        else:
+            start = time.perf_counter()
+            try:
+                if self.dns_cache is not None:
+                    addresses = await asyncio.wait_for(self.dns_cache.resolve(host, port), timeout)
+                else:
+                    addresses = await asyncio.wait_for(DnsCache._getaddrinfo(host, port), timeout)
+            except asyncio.TimeoutError as e:
+                raise httpcore.ConnectTimeout(f"DNS lookup for {host} timed out") from e
+            except OSError as e:
+                raise httpcore.ConnectError(str(e)) from e
+            finally:
+                if timing is not None:
+                    timing.add("dns_secs", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        try:
+            stream = await self._connect_first(addresses, port, timeout, local_address, socket_options)
+        except (httpcore.ConnectError, httpcore.ConnectTimeout):
+            # Every address failed: the cached addresses may be stale, resolve again next time
+            if self.dns_cache is not None:
+                self.dns_cache.invalidate(host, port)
+            raise
+        finally:
+            if timing is not None:
+                timing.add("connect_secs", time.perf_counter() - start)
+        if timing is not None:
+            timing.new_connections += 1
+        return _TimedNetworkStream(stream)
+
+    @staticmethod
+    def _interleave_families(addresses: list[str]) -> list[str]:
+        """Alternate IPv6 and IPv4 addresses (resolver order within each family), starting with the first family."""
+        v6 = [a for a in addresses if ":" in a]
+        v4 = [a for a in addresses if ":" not in a]
+        first, second = (v6, v4) if addresses and ":" in addresses[0] else (v4, v6)
+        interleaved = []
+        for i in range(max(len(first), len(second))):
+            interleaved.extend(family[i] for family in (first, second) if i < len(family))
+        return interleaved
+
+    async def _connect_first(self, addresses: list[str], port: int, timeout, local_address, socket_options):
+        """
+        Happy eyeballs over already-resolved addresses (what anyio.connect_tcp does when given the hostname): a
+        blackholed address (e.g. an unreachable AAAA record) delays the connection by CONNECTION_ATTEMPT_DELAY_SECS,
+        not by the whole connect timeout. timeout bounds the whole race.
+        """
+        if not addresses:
+            raise httpcore.ConnectError("host resolved to no addresses")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        queue = self._interleave_families(addresses)
+        attempts: set[asyncio.Task] = set()
+        last_error = None
+        stream = None
+        try:
+            while stream is None:
+                remaining = deadline - loop.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise httpcore.ConnectTimeout(f"connecting to {len(addresses)} addresses timed out")
+                if queue:
+                    attempts.add(asyncio.create_task(self._backend.connect_tcp(
+                        queue.pop(0), port, timeout=remaining, local_address=local_address, socket_options=socket_options
+                    )))
+                if not attempts:
+                    raise last_error
+                wait_secs = CONNECTION_ATTEMPT_DELAY_SECS if queue else None
+                if remaining is not None:
+                    wait_secs = remaining if wait_secs is None else min(wait_secs, remaining)
+                done, attempts = await asyncio.wait(attempts, timeout=wait_secs, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    error = attempt.exception()
+                    if error is None and stream is None:
+                        stream = attempt.result()
+                    elif error is None:
+                        await attempt.result().aclose()  # lost the race
+                    else:
+                        last_error = error
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+            for result in await asyncio.gather(*attempts, return_exceptions=True):
+                if isinstance(result, httpcore.AsyncNetworkStream):
+                    await result.aclose()
+        return stream
+
+    async def connect_unix_socket(self, path: str, timeout: float | None = None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def install_network_backend(transport, backend: CachingNetworkBackend) -> bool:
+    """
+    Point an httpx.AsyncHTTPTransport's connection pool at backend. httpx has no public option for this,
+    so it sets the pool's network backend directly; returns False (transport unchanged) if that attribute moved.
+    """
+    pool = getattr(transport, "_pool", None)
+    if pool is None or not hasattr(pool, "_network_backend"):
+        bt.logging.warning("Could not install DNS cache network backend: unexpected httpx/httpcore version")
+        return False
+    pool._network_backend = backend
+    return True
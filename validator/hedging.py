@@ -0,0 +1,67 @@
+from collections import OrderedDict, deque
+
+
+class HostLatencyTracker:
+    """Recent HTTP fetch latencies per host (bounded window), for per-host percentiles."""
+
+    def __init__(self, window: int = 50, min_samples: int = 10, max_hosts: int = 4096):
+        self.window = window
+        self.min_samples = min_samples
+        self.max_hosts = max_hosts
+        self._latencies: "OrderedDict[str, deque[float]]" = OrderedDict()
+
+    def record(self, host: str, latency_secs: float):
+        samples = self._latencies.get(host)
+        if samples is None:
+            samples = deque(maxlen=self.window)
+            self._latencies[host] = samples
+            while len(self._latencies) > self.max_hosts:
+                self._latencies.popitem(last=False)
+        self._latencies.move_to_end(host)
+        samples.append(latency_secs)
+
+    def percentile(self, host: str, q: float) -> float | None:
+        """q-th percentile (0-100) of host's recent latencies; None until min_samples are recorded."""
+        samples = self._latencies.get(host)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """
+    Global cap on hedged requests: every primary request earns ratio tokens (up to burst), a hedge spends one.
+    With ratio=0.1 hedges add at most ~10% extra requests over time, plus a short burst.
+    """
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.denied = 0
+
+    def on_request(self):
+        self.requests += 1
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1:
+            self.denied += 1
+            return False
+        self._tokens -= 1
+        self.hedges += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "denied": self.denied,
+            "tokens": round(self._tokens, 2),
+        }
@@ -0,0 +1,192 @@
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import bittensor as bt
+
+CIRCUIT_BREAKER_MODE_ENFORCE = "enforce"  # open breakers short-circuit the fetch (snippet gets could_not_extract_html_from_url)
+CIRCUIT_BREAKER_MODE_OBSERVE = "observe"  # breakers are tracked and logged, every fetch still runs
+CIRCUIT_BREAKER_MODE_OFF = "off"
+CIRCUIT_BREAKER_MODES = (CIRCUIT_BREAKER_MODE_ENFORCE, CIRCUIT_BREAKER_MODE_OBSERVE, CIRCUIT_BREAKER_MODE_OFF)
+
+# Statuses that say something about the whole host (throttled); None = timeout / connection error.
+# Everything else (403, 5xx, 404, ...) only counts against the URL: a miner can cite any number of bogus URLs on
+# an honest host that error out, and must not be able to open the host's breaker for everyone else that way.
+HOST_FAILURE_STATUS_CODES = (429,)
+# Per-URL failures that say nothing either way about the rest of the host (no reset of its failure count)
+URL_ONLY_FAILURE_STATUS_CODES = (403, 500, 502, 503, 504, 520, 521, 522, 523, 524)
+
+# After a cool-down, one probe is let through; other callers stay short-circuited until it reports back
+# (or until this long, in case the probe never reports)
+PROBE_TIMEOUT_SECONDS = 120
+
+
+class _Breaker:
+    def __init__(self):
+        self.failures = 0  # consecutive
+        self.opens = 0  # consecutive times opened; the cool-down doubles with each
+        self.open_until = 0.0
+        self.probing = False
+        self.last_status: int | None = None
+        self.last_failure_at = 0.0
+
+
+class _BreakerSet:
+    """Breakers keyed by host or URL. Bounded: the least recently touched keys are forgotten first."""
+
+    def __init__(self, failure_threshold: int, base_cooldown_secs: float, max_cooldown_secs: float, max_entries: int):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown_secs = base_cooldown_secs
+        self.max_cooldown_secs = max_cooldown_secs
+        self.max_entries = max_entries
+        self._breakers: "OrderedDict[str, _Breaker]" = OrderedDict()
+
+    def allow(self, key: str, now: float) -> bool:
+        breaker = self._breakers.get(key)
+        if breaker is None or breaker.open_until == 0.0:
+            return True
+        if now < breaker.open_until:
+            return False
+        # Cool-down over: half-open, let this caller probe
+        breaker.probing = True
+        breaker.open_until = now + PROBE_TIMEOUT_SECONDS
+        return True
+
+    def is_open(self, key: str, now: float) -> bool:
+        breaker = self._breakers.get(key)
+        return breaker is not None and now < breaker.open_until
+
+    def is_probing(self, key: str) -> bool:
+        breaker = self._breakers.get(key)
+        return breaker is not None and breaker.probing
+
+    def success(self, key: str):
+        self._breakers.pop(key, None)
+
+    def failure(self, key: str, status_code: int | None, now: float) -> bool:
+        """Returns True when this failure opened (or re-opened) the breaker."""
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = _Breaker()
+            self._breakers[key] = breaker
+            while len(self._breakers) > self.max_entries:
+                self._breakers.popitem(last=False)
+        self._breakers.move_to_end(key)
+        breaker.failures += 1
+        breaker.last_status = status_code
+        breaker.last_failure_at = now
+        if breaker.failures < self.failure_threshold and not breaker.probing:
+            return False
+        cooldown = min(self.max_cooldown_secs, self.base_cooldown_secs * (2 ** breaker.opens))
+        breaker.opens += 1
+        breaker.probing = False
+        breaker.open_until = now + cooldown
+        return True
+
+    def snapshot(self, now: float) -> list[dict]:
+        return [
+            {
+                "key": key,
+                "failures": breaker.failures,
+                "opens": breaker.opens,
+                "state": "half_open" if breaker.probing else "open",
+                "cooldown_remaining_secs": round(breaker.open_until - now, 1),
+                "last_status": breaker.last_status,
+            }
+            for key, breaker in self._breakers.items()
+            if breaker.open_until > now
+        ]
+
+    def __len__(self):
+        return len(self._breakers)
+
+
+class HostHealth:
+    """
+    Failure memory + circuit breaker for the snippet fetcher.
+
+    Hosts that keep timing out, refusing connections or throttling (429) open a host breaker after
+    host_failure_threshold consecutive failures; URLs that keep failing (403 with no working Selenium fallback,
+    5xx, 404, 410, ...) open a URL breaker after url_failure_threshold. An open breaker stays open for a cool-down that doubles each time it
+    re-opens (capped at max_cooldown_secs), then lets a single probe through; a success closes it and forgets the
+    history. check() tells the caller whether to fetch; in observe mode it only logs.
+    """
+
+    def __init__(
+        self,
+        mode: str = CIRCUIT_BREAKER_MODE_OBSERVE,
+        host_failure_threshold: int = 3,
+        url_failure_threshold: int = 2,
+        base_cooldown_secs: float = 30,
+        max_cooldown_secs: float = 30 * 60,
+        max_entries: int = 4096,
+    ):
+        self.mode = mode
+        self._hosts = _BreakerSet(host_failure_threshold, base_cooldown_secs, max_cooldown_secs, max_entries)
+        self._urls = _BreakerSet(url_failure_threshold, base_cooldown_secs, max_cooldown_secs, max_entries)
+        self.short_circuited = 0
+        self.would_short_circuit = 0
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).hostname or ""
+
+    def check(self, url: str) -> str | None:
+        """
+        None if the fetch should go ahead, otherwise why it is short-circuited (enforce mode only;
+        observe mode logs and returns None).
+        """
+        if self.mode == CIRCUIT_BREAKER_MODE_OFF:
+            return None
+        now = time.monotonic()
+        host = self._host(url)
+        reason = None
+        if not self._hosts.allow(host, now):
+            reason = f"host circuit open ({host})"
+        elif not self._urls.allow(url, now):
+            reason = "URL circuit open"
+        if reason is None:
+            return None
+        if self.mode == CIRCUIT_BREAKER_MODE_OBSERVE:
+            self.would_short_circuit += 1
+            bt.logging.info(f"{url} | Circuit breaker (observe): would short-circuit: {reason}")
+            return None
+        self.short_circuited += 1
+        return reason
+
+    def record(self, url: str, status_code: int | None):
+        """Report a fetch outcome: the final status code (200 after a Selenium fallback), None if there was no response."""
+        if self.mode == CIRCUIT_BREAKER_MODE_OFF:
+            return
+        now = time.monotonic()
+        host = self._host(url)
+        if status_code is not None and status_code < 400:
+            self._hosts.success(host)
+            self._urls.success(url)
+            return
+
+        if self._urls.failure(url, status_code, now):
+            bt.logging.warning(f"{url} | Circuit breaker: URL circuit opened (last status {status_code})")
+        if status_code is None or status_code in HOST_FAILURE_STATUS_CODES:
+            if self._hosts.failure(host, status_code, now):
+                bt.logging.warning(f"{url} | Circuit breaker: host circuit opened for {host} (last status {status_code})")
+        elif status_code not in URL_ONLY_FAILURE_STATUS_CODES or self._hosts.is_probing(host):
+            # The host answered (a half-open probe that gets any answer but 429 closes the host breaker:
+            # the probe URL may be one of the bogus ones), only this URL is bad
+            self._hosts.success(host)
+
+    def is_host_open(self, host: str) -> bool:
+        return self._hosts.is_open(host, time.monotonic())
+
+    def snapshot(self) -> dict:
+        """Breaker state for inspection (served by the API server)."""
+        now = time.monotonic()
+        return {
+            "mode": self.mode,
+            "open_hosts": self._hosts.snapshot(now),
+            "open_urls": self._urls.snapshot(now),
+            "tracked_hosts": len(self._hosts),
+            "tracked_urls": len(self._urls),
+            "short_circuited": self.short_circuited,
+            "would_short_circuit": self.would_short_circuit,
+        }
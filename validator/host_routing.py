@@ -0,0 +1,114 @@
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import bittensor as bt
+
+HOST_ROUTE_HTTP = "http"  # plain HTTP first (Selenium only as the 403 fallback)
+HOST_ROUTE_SELENIUM = "selenium"  # straight to Selenium: plain HTTP is known to be blocked
+
+# A re-probe that never reported back (fetch raised) is retried after this long
+PROBE_TIMEOUT_SECONDS = 300
+
+
+def route_key(url: str) -> str:
+    """
+    What a learned route applies to: the host plus the first directory of the path ("example.com/news" for
+    https://example.com/news/2024/story, "example.com/" for pages at the root). Sites often block only part of
+    their paths (a paywalled or bot-protected section), and the rest must keep being fetched over plain HTTP.
+    """
+    parts = urlsplit(url)
+    directories = parts.path.split("/")[1:-1]
+    return f"{(parts.hostname or '')}/{directories[0] if directories else ''}"
+
+
+class _HostCapability:
+    def __init__(self):
+        self.route = HOST_ROUTE_HTTP
+        self.blocked_streak = 0  # consecutive 403s on plain HTTP that Selenium then fetched
+        self.routed_at = 0.0  # when the current Selenium route was learned or last confirmed
+        self.probe_started_at = 0.0  # 0 when no plain HTTP re-probe is in flight
+
+
+class HostRouter:
+    """
+    Learns which fetch backend each host needs, per path prefix (keys are route_key(url)).
+
+    A host path prefix whose plain HTTP request was blocked (403) while the Selenium fallback succeeded
+    selenium_after_blocks times in a row is routed straight to Selenium, saving the doomed HTTP round trip and
+    host slot. A Selenium route is re-probed with plain HTTP once it is older than reprobe_secs (sites drop bot
+    protection, or it was a temporary block); a successful HTTP fetch puts the host back on the HTTP route.
+    """
+
+    def __init__(self, selenium_after_blocks: int = 2, reprobe_secs: float = 6 * 60 * 60, max_hosts: int = 4096):
+        self.selenium_after_blocks = selenium_after_blocks
+        self.reprobe_secs = reprobe_secs
+        self.max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, _HostCapability]" = OrderedDict()
+        self.direct_selenium = 0
+        self.reprobes = 0
+
+    def _host(self, key: str) -> _HostCapability:
+        capability = self._hosts.get(key)
+        if capability is None:
+            capability = _HostCapability()
+            self._hosts[key] = capability
+            while len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+        self._hosts.move_to_end(key)
+        return capability
+
+    def route(self, key: str) -> str:
+        """Backend to try first for a route_key."""
+        capability = self._hosts.get(key)
+        if capability is None or capability.route == HOST_ROUTE_HTTP:
+            return HOST_ROUTE_HTTP
+        now = time.monotonic()
+        probe_in_flight = capability.probe_started_at > 0 and now - capability.probe_started_at < PROBE_TIMEOUT_SECONDS
+        if now - capability.routed_at >= self.reprobe_secs and not probe_in_flight:
+            # Stale: let one fetch find out whether plain HTTP works again
+            capability.probe_started_at = now
+            self.reprobes += 1
+            return HOST_ROUTE_HTTP
+        self.direct_selenium += 1
+        return HOST_ROUTE_SELENIUM
+
+    def record_http(self, key: str, status_code: int | None, selenium_ok: bool | None = None):
+        """
+        Outcome of a plain HTTP attempt. selenium_ok is the result of the 403 fallback (None if it did not run).
+        """
+        capability = self._host(key)
+        if status_code is not None and (status_code < 400 or status_code == 404):
+            # The site serves plain HTTP clients
+            if capability.route == HOST_ROUTE_SELENIUM:
+                bt.logging.info(f"Host routing: {key} serves plain HTTP again, routing it to HTTP")
+            capability.route = HOST_ROUTE_HTTP
+            capability.blocked_streak = 0
+            capability.probe_started_at = 0.0
+        elif status_code == 403 and selenium_ok:
+            capability.blocked_streak += 1
+            if capability.blocked_streak >= self.selenium_after_blocks or capability.probe_started_at:
+                if capability.route != HOST_ROUTE_SELENIUM:
+                    bt.logging.info(f"Host routing: {key} blocks plain HTTP, routing it straight to Selenium")
+                capability.route = HOST_ROUTE_SELENIUM
+                capability.routed_at = time.monotonic()
+                capability.probe_started_at = 0.0
+        else:
+            # Timeouts, 5xx, a 403 that Selenium could not get past either: says nothing about the backend
+            capability.probe_started_at = 0.0
+
+    def record_selenium(self, key: str, ok: bool):
+        """Outcome of a direct (routed) Selenium fetch. A failure sends the path prefix back to HTTP-first."""
+        capability = self._host(key)
+        if ok:
+            return
+        capability.route = HOST_ROUTE_HTTP
+        capability.blocked_streak = 0
+
+    def stats(self) -> dict:
+        return {
+            "tracked_hosts": len(self._hosts),
+            "selenium_hosts": sum(1 for c in self._hosts.values() if c.route == HOST_ROUTE_SELENIUM),
+            "direct_selenium": self.direct_selenium,
+            "reprobes": self.reprobes,
+        }
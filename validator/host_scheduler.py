@@ -0,0 +1,209 @@
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+import bittensor as bt
+
+# Status codes that mean "you are sending too much" - back off multiplicatively
+THROTTLE_STATUS_CODES = (403, 429)
+
+
+class _HostState:
+    def __init__(self, initial_limit: float):
+        self.limit = initial_limit
+        self.in_flight = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.ewma_latency_secs: float | None = None
+        self.last_decrease = 0.0
+        self.last_used = time.monotonic()
+        self.throttled_count = 0
+
+
+class HostSlot:
+    """A granted fetch slot for one host. Report the outcome with record() so the host limit can adapt."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.status_code: int | None = None
+        self.latency_secs: float | None = None
+        self.recorded = False
+
+    def record(self, status_code: int | None, latency_secs: float):
+        """status_code None means the request failed without a response (timeout / connection error)."""
+        self.status_code = status_code
+        self.latency_secs = latency_secs
+        self.recorded = True
+
+
+class HostScheduler:
+    """
+    Per-host fetch scheduler replacing the single global semaphore.
+
+    - A global cap bounds total concurrent fetches.
+    - Each host has its own adaptive limit (AIMD): +1/limit per fast successful response,
+      halved (at most once per observed round trip) on 429/403, timeouts or very slow responses.
+    - Waiting requests are queued per host and slots are handed out round-robin between hosts,
+      so one slow or throttled host cannot starve the others.
+    """
+
+    def __init__(
+        self,
+        global_limit: int,
+        initial_host_limit: float = 2,
+        min_host_limit: float = 1,
+        max_host_limit: float = 8,
+        slow_latency_secs: float = 10.0,
+        max_tracked_hosts: int = 4096,
+    ):
+        self.global_limit = global_limit
+        self.initial_host_limit = initial_host_limit
+        self.min_host_limit = min_host_limit
+        self.max_host_limit = max_host_limit
+        self.slow_latency_secs = slow_latency_secs
+        self.max_tracked_hosts = max_tracked_hosts
+        self._hosts: dict[str, _HostState] = {}
+        self._ready_hosts: deque[str] = deque()  # hosts with queued waiters, in round-robin order
+        self._in_flight_total = 0
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            if len(self._hosts) >= self.max_tracked_hosts:
+                self._forget_idle_hosts()
+            state = _HostState(self.initial_host_limit)
+            self._hosts[host] = state
+        state.last_used = time.monotonic()
+        return state
+
+    def _forget_idle_hosts(self):
+        idle = [h for h, s in self._hosts.items() if s.in_flight == 0 and not s.waiters]
+        idle.sort(key=lambda h: self._hosts[h].last_used)
+        for host in idle[: max(1, len(idle) // 2)]:
+            del self._hosts[host]
+
+    def _has_capacity(self, state: _HostState) -> bool:
+        return self._in_flight_total < self.global_limit and state.in_flight < int(state.limit)
+
+    def _start(self, state: _HostState):
+        state.in_flight += 1
+        self._in_flight_total += 1
+
+    async def _acquire(self, host: str) -> _HostState:
+        state = self._host(host)
+        if not state.waiters and self._has_capacity(state):
+            self._start(state)
+            return state
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        if host not in self._ready_hosts:
+            self._ready_hosts.append(host)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as we were cancelled - hand it back
+                self._finish(host, state)
+            else:
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        return state
+
+    def _finish(self, host: str, state: _HostState):
+        state.in_flight -= 1
+        self._in_flight_total -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Grant free slots to queued waiters, one per host per turn (round-robin)."""
+        while self._in_flight_total < self.global_limit and self._ready_hosts:
+            granted = False
+            for _ in range(len(self._ready_hosts)):
+                host = self._ready_hosts.popleft()
+                state = self._hosts.get(host)
+                if state is None:
+                    continue
+                while state.waiters and state.waiters[0].done():
+                    state.waiters.popleft()  # cancelled while waiting
+                if not state.waiters:
+                    continue
+                if state.in_flight >= int(state.limit):
+                    self._ready_hosts.append(host)  # still waiting on its own host limit
+                    continue
+
+                waiter = state.waiters.popleft()
+                self._start(state)
+                waiter.set_result(None)
+                if state.waiters:
+                    self._ready_hosts.append(host)  # back of the line
+                granted = True
+                break
+            if not granted:
+                return
+
+    def _adapt(self, host: str, state: _HostState, slot: HostSlot):
+        if not slot.recorded:
+            return
+
+        latency = slot.latency_secs or 0.0
+        now = time.monotonic()
+        throttled = slot.status_code is None or slot.status_code in THROTTLE_STATUS_CODES
+        too_slow = latency > self.slow_latency_secs
+
+        if throttled or too_slow:
+            # Only one multiplicative decrease per observed round trip, otherwise a burst of
+            # in-flight failures would collapse the limit to the floor at once
+            window = state.ewma_latency_secs or latency
+            if now - state.last_decrease >= window:
+                old_limit = state.limit
+                state.limit = max(self.min_host_limit, state.limit / 2)
+                state.last_decrease = now
+                if throttled:
+                    state.throttled_count += 1
+                bt.logging.info(
+                    f"Host scheduler | {host} | limit {old_limit:.2f} -> {state.limit:.2f} "
+                    f"(status={slot.status_code}, latency={latency:.2f}s)"
+                )
+        else:
+            state.limit = min(self.max_host_limit, state.limit + 1 / state.limit)
+
+        if slot.status_code is not None:
+            state.ewma_latency_secs = latency if state.ewma_latency_secs is None else 0.8 * state.ewma_latency_secs + 0.2 * latency
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """Wait for a fetch slot for host. Usage: async with scheduler.slot(host) as slot: ...; slot.record(status, secs)"""
+        host = host or ""
+        state = await self._acquire(host)
+        slot = HostSlot(host)
+        try:
+            yield slot
+        finally:
+            self._adapt(host, state, slot)
+            self._finish(host, state)
+
+    def host_limit(self, host: str) -> float:
+        state = self._hosts.get(host)
+        return state.limit if state is not None else self.initial_host_limit
+
+    def stats(self) -> dict:
+        return {
+            "global_limit": self.global_limit,
+            "in_flight": self._in_flight_total,
+            "waiting": sum(len(s.waiters) for s in self._hosts.values()),
+            "hosts": {
+                host: {
+                    "limit": round(state.limit, 2),
+                    "in_flight": state.in_flight,
+                    "waiting": len(state.waiters),
+                    "ewma_latency_secs": state.ewma_latency_secs,
+                    "throttled_count": state.throttled_count,
+                }
+                for host, state in self._hosts.items()
+                if state.in_flight or state.waiters or state.limit != self.initial_host_limit
+            },
+        }
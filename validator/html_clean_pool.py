@@ -0,0 +1,93 @@
+import time
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+import bittensor as bt
+
+from validator.html_clean_worker import (
+    HTML_CLEANER_BACKEND_BS4,
+    HTML_CLEANER_BACKEND_LXML,
+    HTML_CLEANER_BACKENDS,
+    _clean_html_bytes,
+    clean_html_page,
+    clean_html_text,
+)
+from validator.process_pool import WorkerProcessPool
+
+
+@dataclass
+class CleanHtmlResult:
+    text: str
+    queue_wait_secs: float  # submit -> a worker started parsing
+    parse_secs: float  # parse + decompose + getText inside the worker
+    in_pool: bool  # False when the page was small enough to clean in a thread instead
+
+
+class HtmlCleanPool:
+    """
+    Runs HTML cleaning in a dedicated process pool so BeautifulSoup never holds the GIL of the event-loop process.
+    Pages under min_pool_bytes are cleaned in a thread instead (pickling + IPC would cost more than the parse).
+
+    Workers are started by a forkserver and only import the light worker modules (see WorkerProcessPool).
+    """
+
+    def __init__(self, max_workers: int, min_pool_bytes: int, backend: str = HTML_CLEANER_BACKEND_BS4):
+        self.max_workers = max_workers
+        self.min_pool_bytes = min_pool_bytes
+        self.backend = backend
+        self._executor: WorkerProcessPool | None = None
+        self.pool_runs = 0
+        self.thread_runs = 0
+
+    def _get_executor(self) -> WorkerProcessPool:
+        if self._executor is None:
+            self._executor = WorkerProcessPool(self.max_workers)
+        return self._executor
+
+    async def _clean_in_thread(self, data: bytes, encoding: str | None) -> CleanHtmlResult:
+        submitted_at = time.time()
+        text, started_at, parse_secs = await asyncio.to_thread(_clean_html_bytes, data, self.backend, encoding)
+        self.thread_runs += 1
+        return CleanHtmlResult(text, max(0.0, started_at - submitted_at), parse_secs, in_pool=False)
+
+    async def clean(self, html: str | bytes, encoding: str | None = None) -> CleanHtmlResult:
+        """
+        html is page text, or the raw HTTP body with its charset in encoding: raw bodies are shipped to the worker
+        as they are and decoded there, so the event loop never decodes (or re-encodes) the page.
+        """
+        if isinstance(html, bytes):
+            data, encoding = html, encoding or "utf-8"
+        else:
+            data, encoding = html.encode("utf-8", "surrogatepass"), None
+        if len(data) < self.min_pool_bytes:
+            return await self._clean_in_thread(data, encoding)
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        try:
+            text, started_at, parse_secs = await loop.run_in_executor(
+                self._get_executor(), _clean_html_bytes, data, self.backend, encoding
+            )
+        except BrokenProcessPool as e:
+            # A worker died (OOM kill, segfault in a parser); start a fresh pool next time and clean this page here
+            bt.logging.warning(f"HTML clean pool broken, recreating: {e}")
+            self.shutdown()
+            return await self._clean_in_thread(data, encoding)
+
+        self.pool_runs += 1
+        return CleanHtmlResult(text, max(0.0, started_at - submitted_at), parse_secs, in_pool=True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "min_pool_bytes": self.min_pool_bytes,
+            "backend": self.backend,
+            "pool_runs": self.pool_runs,
+            "thread_runs": self.thread_runs,
+        }
@@ -0,0 +1,48 @@
+# HTML cleaning as run in HtmlCleanPool workers: keep this module free of bittensor and the models, worker processes
+# import only it (see validator.process_pool)
+import time
+
+from bs4 import BeautifulSoup
+
+from validator.charset import decode_html
+from validator.html_text_extractor import extract_text_from_tree
+
+HTML_CLEANER_BACKEND_BS4 = "bs4"
+HTML_CLEANER_BACKEND_LXML = "lxml"
+HTML_CLEANER_BACKENDS = (HTML_CLEANER_BACKEND_BS4, HTML_CLEANER_BACKEND_LXML)
+
+
+def clean_html_text(html: str, backend: str = HTML_CLEANER_BACKEND_BS4) -> str:
+    """Page text as the snippet fetcher has always produced it (BeautifulSoup + lxml, junk tags removed)."""
+    if backend == HTML_CLEANER_BACKEND_LXML:
+        # Same text without building a BeautifulSoup tree (see tests/unit_tests/test_html_cleaner_backends.py)
+        return extract_text_from_tree(html)
+
+    soup = BeautifulSoup(html, "lxml")  # 5-10x faster than html.parser
+
+    # Single-pass removal using CSS selectors
+    for tag in soup.select("script, iframe, ins, aside, noscript"):
+        tag.decompose()
+
+    return soup.getText(separator=" ", strip=True)
+
+
+def clean_html_page(html: str | bytes, backend: str = HTML_CLEANER_BACKEND_BS4, encoding: str | None = None) -> str:
+    """clean_html_text for a page given as text or as the raw HTTP body (decoded here with its resolved charset)."""
+    if isinstance(html, bytes):
+        html = decode_html(html, encoding or "utf-8")
+    return clean_html_text(html, backend)
+
+
+def _clean_html_bytes(data: bytes, backend: str, encoding: str | None = None) -> tuple[str, float, float]:
+    """
+    Worker entry point. Returns (text, wall-clock start time, parse seconds).
+    encoding is the raw body's charset; None means data is a str page encoded by HtmlCleanPool.clean.
+    """
+    started_at = time.time()
+    parse_start = time.perf_counter()
+    if encoding is None:
+        text = clean_html_text(data.decode("utf-8", "surrogatepass"), backend)
+    else:
+        text = clean_html_page(data, backend, encoding)
+    return text, started_at, time.perf_counter() - parse_start
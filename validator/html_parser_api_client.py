@@ -0,0 +1,199 @@
+import json
+import time
+import asyncio
+from dataclasses import dataclass
+
+import httpx
+import bittensor as bt
+
+# Responses are JSON of page HTML: compresses ~5-10x
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+@dataclass
+class _PendingRender:
+    url: str
+    waiters: list[asyncio.Future]
+    deadline: float  # loop time after which the first caller of this URL gives up on it
+
+
+class HtmlParserApiClient:
+    """
+    Micro-batching client for the remote HTML parser API.
+
+    Concurrent render(url) calls are collected for up to max_wait_secs (or until max_batch_size distinct URLs)
+    and sent as one POST {base_url}/render_batch on a dedicated keep-alive HTTP/2 client that asks for gzip.
+    The same URL requested twice in a batch is rendered once. If the server has no /render_batch (404/405),
+    the client falls back to one POST /render per URL (the original protocol) for the rest of its life.
+
+    Each URL has its own deadline (url_timeout_secs from its render() call): results stream back one per line as
+    the server finishes them, so a slow page does not hold up the rest of its batch, and a URL past its deadline
+    returns None while the others still get their page.
+
+    render_batch protocol (the remote parser service must implement it before USE_HTML_PARSER_API_BATCHING is
+    turned on; today only validator.html_parser_api_stub does, otherwise every batch costs a 404 before the
+    fallback):
+        request  {"urls": ["https://...", ...], "timeout_secs": 30.0}
+        response application/x-ndjson, one line per URL in completion order:
+                 {"url": "https://...", "status_code": 200, "html": "<html>..."}
+                 (a URL not rendered within timeout_secs gets a line with status_code 504; each line is flushed
+                 as it is written, sync-flushed when the body is gzip-encoded)
+        A plain application/json {"results": [...]} body of the same items is accepted too, without the streaming.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_batch_size: int = 16,
+        max_wait_secs: float = 0.02,
+        max_concurrent_batches: int = 4,
+        timeout_secs: float = 60,
+        url_timeout_secs: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_batch_size = max_batch_size
+        self.max_wait_secs = max_wait_secs
+        self.timeout_secs = timeout_secs
+        self.url_timeout_secs = timeout_secs if url_timeout_secs is None else url_timeout_secs
+        self.client = httpx.AsyncClient(
+            http2=transport is None,
+            transport=transport,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            limits=httpx.Limits(max_connections=max_concurrent_batches, max_keepalive_connections=max_concurrent_batches),
+            timeout=timeout_secs,
+        )
+        self._batch_slots = asyncio.Semaphore(max_concurrent_batches)
+        self._pending: dict[str, _PendingRender] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batch_supported = True
+        self.batches = 0
+        self.urls_requested = 0
+        self.urls_deduplicated = 0
+        self.urls_timed_out = 0
+
+    async def render(self, url: str) -> httpx.Response | None:
+        """Rendered page as an httpx.Response (status_code, text); None if the API call failed."""
+        self.urls_requested += 1
+        if not self.batch_supported:
+            return await self._render_single(url)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.get(url)
+        if pending is not None:
+            self.urls_deduplicated += 1
+            pending.waiters.append(future)
+        else:
+            self._pending[url] = _PendingRender(url, [future], loop.time() + self.url_timeout_secs)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_secs, self._flush)
+        # Shielded: a caller that gives up does not cancel the batch for everyone else
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.url_timeout_secs)
+        except asyncio.TimeoutError:
+            self.urls_timed_out += 1
+            bt.logging.warning(f"HTML parser API: {url} not rendered within {self.url_timeout_secs:.0f}s")
+            return None
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = list(self._pending.values()), {}
+        task = asyncio.create_task(self._send_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _page_response(status_code: int, html: str) -> httpx.Response:
+        return httpx.Response(status_code, text=html, headers={"content-type": "text/html; charset=utf-8"})
+
+    @staticmethod
+    def _resolve(pending: _PendingRender, response: httpx.Response | None):
+        for waiter in pending.waiters:
+            if waiter.done():
+                continue
+            # Each caller annotates its response (timings, statuses), so give each its own object
+            waiter.set_result(
+                None if response is None else HtmlParserApiClient._page_response(response.status_code, response.text)
+            )
+
+    async def _send_batch(self, batch: list[_PendingRender]):
+        by_url = {p.url: p for p in batch}
+        try:
+            async with self._batch_slots:
+                start = time.perf_counter()
+                # Nobody waits past the last deadline of the batch, so neither does the request
+                remaining = max(0.0, max(p.deadline for p in batch) - asyncio.get_running_loop().time())
+                await asyncio.wait_for(self._stream_batch(by_url, remaining), remaining)
+                if self.batch_supported:
+                    bt.logging.info(
+                        f"HTML parser API: rendered batch of {len(batch)} URLs in {time.perf_counter() - start:.2f}s"
+                    )
+            if not self.batch_supported:
+                singles = await asyncio.gather(*(self._render_single(p.url) for p in by_url.values()))
+                for pending, response in zip(by_url.values(), singles):
+                    self._resolve(pending, response)
+        except asyncio.TimeoutError:
+            bt.logging.warning(f"HTML parser API: {len(by_url)} of {len(batch)} batched URLs missed their deadline")
+        except Exception as e:
+            bt.logging.error(f"HTML parser API: batch of {len(batch)} URLs failed: {e}")
+        finally:
+            # Partial results: whatever was not rendered (failure, deadline, missing from the reply) gets None
+            for pending in batch:
+                self._resolve(pending, None)
+
+    async def _stream_batch(self, by_url: dict[str, _PendingRender], timeout_secs: float):
+        """POST /render_batch and hand each result to its callers as soon as its line arrives."""
+        async with self.client.stream(
+            "POST", f"{self.base_url}/render_batch", json={"urls": list(by_url), "timeout_secs": timeout_secs}
+        ) as response:
+            if response.status_code in (404, 405):
+                bt.logging.warning("HTML parser API has no /render_batch, falling back to one /render per URL")
+                self.batch_supported = False
+                return
+            response.raise_for_status()
+            self.batches += 1
+            if response.headers.get("content-type", "").startswith("application/json"):
+                items = json.loads(await response.aread()).get("results", [])
+                for item in items:
+                    self._resolve_item(by_url, item)
+                return
+            async for line in response.aiter_lines():
+                if line.strip():
+                    self._resolve_item(by_url, json.loads(line))
+
+    def _resolve_item(self, by_url: dict[str, _PendingRender], item: dict):
+        pending = by_url.pop(item.get("url"), None)
+        if pending is not None:
+            self._resolve(pending, self._page_response(int(item.get("status_code", 200)), item.get("html") or ""))
+
+    async def _render_single(self, url: str) -> httpx.Response | None:
+        try:
+            async with self._batch_slots:
+                return await self.client.post(f"{self.base_url}/render", json={"url": url})
+        except Exception as e:
+            bt.logging.error(f"HTML parser API: /render failed for {url}: {e}")
+            return None
+
+    async def aclose(self):
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "batch_supported": self.batch_supported,
+            "batches": self.batches,
+            "urls_requested": self.urls_requested,
+            "urls_deduplicated": self.urls_deduplicated,
+            "urls_timed_out": self.urls_timed_out,
+        }
@@ -0,0 +1,91 @@
+"""
+Local stand-in for the remote HTML parser API (POST /render and POST /render_batch, gzip responses), for testing
+the snippet fetcher's parser API client offline. Pages are fetched with plain httpx (no browser rendering).
+
+    python -m validator.html_parser_api_stub --port 8089
+    USE_HTML_PARSER_API=True HTML_PARSER_API_URL=http://127.0.0.1:8089 ...
+"""
+import json
+import zlib
+import argparse
+import asyncio
+from typing import Awaitable, Callable
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, StreamingResponse
+
+# (url) -> (status_code, html)
+FetchHtml = Callable[[str], Awaitable[tuple[int, str]]]
+
+
+def create_app(fetch_html: FetchHtml) -> FastAPI:
+    app = FastAPI(title="HTML parser API stub")
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    app.state.render_calls = 0
+    app.state.batch_calls = 0
+    app.state.urls_fetched = 0
+
+    async def _fetch(url: str) -> tuple[int, str]:
+        app.state.urls_fetched += 1
+        return await fetch_html(url)
+
+    @app.post("/render")
+    async def render(request: Request):
+        app.state.render_calls += 1
+        data = await request.json()
+        status_code, html = await _fetch(data["url"])
+        return HTMLResponse(html, status_code=status_code)
+
+    @app.post("/render_batch")
+    async def render_batch(request: Request):
+        app.state.batch_calls += 1
+        data = await request.json()
+        urls = list(dict.fromkeys(data.get("urls", [])))
+        timeout_secs = data.get("timeout_secs")
+
+        async def _fetch_item(url: str) -> dict:
+            try:
+                status_code, html = await asyncio.wait_for(_fetch(url), timeout_secs)
+            except asyncio.TimeoutError:
+                status_code, html = 504, ""
+            return {"url": url, "status_code": status_code, "html": html}
+
+        # Compressed here rather than by GZipMiddleware, which would hold short lines back in its compressor
+        compressor = zlib.compressobj(wbits=31) if "gzip" in request.headers.get("accept-encoding", "") else None
+
+        async def _lines():
+            # One line per URL as soon as it is rendered: a slow page does not hold back the rest
+            for item in asyncio.as_completed([_fetch_item(url) for url in urls]):
+                line = (json.dumps(await item) + "\n").encode()
+                yield line if compressor is None else compressor.compress(line) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if compressor is not None:
+                yield compressor.flush()
+
+        headers = {"Content-Encoding": "gzip"} if compressor is not None else None
+        return StreamingResponse(_lines(), media_type="application/x-ndjson", headers=headers)
+
+    return app
+
+
+def _http_fetcher(client: httpx.AsyncClient) -> FetchHtml:
+    async def fetch_html(url: str) -> tuple[int, str]:
+        try:
+            response = await client.get(url)
+            return response.status_code, response.text
+        except httpx.HTTPError:
+            return 502, ""
+
+    return fetch_html
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+    client = httpx.AsyncClient(follow_redirects=True, timeout=60)
+    uvicorn.run(create_app(_http_fetcher(client)), host=args.host, port=args.port)
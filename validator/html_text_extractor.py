@@ -0,0 +1,162 @@
+import lxml.html
+from lxml import etree
+
+# Tags SnippetFetcher.clean_html decomposes before extracting text (their whole subtree is dropped)
+EXCLUDED_TAGS = frozenset(("script", "iframe", "ins", "aside", "noscript"))
+
+# BeautifulSoup's HTML string containers: strings inside them are Script/Stylesheet/TemplateString/...
+# rather than NavigableString, so getText() leaves them out
+STRING_CONTAINER_TAGS = frozenset(("rt", "rp", "style", "script", "template"))
+
+# Subtrees that contribute no text at all (their tails still do)
+_SKIPPED_SUBTREE_TAGS = EXCLUDED_TAGS | STRING_CONTAINER_TAGS
+
+
+class _TextTarget:
+    """
+    lxml parser target that mirrors how BeautifulSoup builds strings from the same parser events:
+    text is buffered until the next start/end/comment/pi/doctype event, then kept as one string
+    unless it sits inside an excluded tag or a string container.
+    """
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self._data: list[str] = []
+        self._open_tags: list[str] = []
+        self._excluded_depth = 0
+        self._container_depth = 0
+
+    def _flush(self):
+        if not self._data:
+            return
+        text = "".join(self._data)
+        self._data = []
+        if self._excluded_depth or self._container_depth:
+            return
+        text = text.strip()
+        if text:
+            self.strings.append(text)
+
+    def start(self, tag, attrib, nsmap=None):
+        self._flush()
+        self._open_tags.append(tag)
+        if tag in EXCLUDED_TAGS:
+            self._excluded_depth += 1
+        if tag in STRING_CONTAINER_TAGS:
+            self._container_depth += 1
+
+    def end(self, tag):
+        self._flush()
+        # Same as BeautifulSoup._popToTag: close the most recent open tag with this name and
+        # everything opened after it; an end tag that matches nothing open is ignored
+        for i in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[i] == tag:
+                for closed in self._open_tags[i:]:
+                    if closed in EXCLUDED_TAGS:
+                        self._excluded_depth -= 1
+                    if closed in STRING_CONTAINER_TAGS:
+                        self._container_depth -= 1
+                del self._open_tags[i:]
+                break
+
+    def data(self, data):
+        self._data.append(data)
+
+    def comment(self, text):
+        self._flush()
+
+    def pi(self, target, data=None):
+        self._flush()
+
+    def doctype(self, name, pubid, system):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return " ".join(self.strings)
+
+
+class StreamingTextExtractor:
+    """
+    Incremental HTML -> text. Feed decoded chunks as they are downloaded and call close() for the text.
+
+    Produces the same text as SnippetFetcher.clean_html (BeautifulSoup + lxml, decompose
+    script/iframe/ins/aside/noscript, getText(separator=" ", strip=True)) without building a DOM,
+    so most of the parsing happens while the body is still arriving.
+    """
+
+    def __init__(self):
+        self._target = _TextTarget()
+        self._parser = etree.HTMLParser(target=self._target, recover=True)
+        self._started = False
+
+    def feed(self, text: str):
+        if not text:
+            return
+        if not self._started:
+            self._started = True
+            # BeautifulSoup drops a leading BOM before handing str markup to lxml
+            if text[0] == "\N{BYTE ORDER MARK}":
+                text = text[1:]
+                if not text:
+                    return
+        self._parser.feed(text)
+
+    def close(self) -> str:
+        if not self._started:
+            return ""
+        return self._parser.close()
+
+
+def extract_text(html: str) -> str:
+    """One-shot helper: same output as the streaming extractor fed the whole document."""
+    extractor = StreamingTextExtractor()
+    extractor.feed(html)
+    return extractor.close()
+
+
+def extract_text_from_tree(html: str) -> str:
+    """
+    Same output as extract_text / SnippetFetcher.clean_html, built on an lxml.html tree instead of parser callbacks.
+    The tree is parsed in C and walked with iterwalk, skipping excluded subtrees without visiting them.
+    Every .text/.tail is one string, which is exactly where BeautifulSoup splits its strings.
+    """
+    if html and html[0] == "\N{BYTE ORDER MARK}":
+        html = html[1:]
+    if not html:
+        return ""
+
+    # Feed interface like BeautifulSoup: fromstring() rejects str input that carries an XML encoding declaration
+    parser = lxml.html.HTMLParser(recover=True)
+    parser.feed(html)
+    root = parser.close()
+    if root is None:
+        return ""
+
+    strings = []
+
+    def add(text):
+        if text:
+            text = text.strip()
+            if text:
+                strings.append(text)
+
+    # Content after </html> ends up in sibling <html> elements, so walk every top-level node
+    top_level = [*reversed(list(root.itersiblings(preceding=True))), root, *root.itersiblings()]
+    for node in top_level:
+        if not isinstance(node.tag, str):  # comment / processing instruction
+            add(node.tail)
+            continue
+
+        walker = etree.iterwalk(node, events=("start", "end", "comment", "pi"))
+        for event, element in walker:
+            if event == "start":
+                if element.tag in _SKIPPED_SUBTREE_TAGS:
+                    walker.skip_subtree()
+                else:
+                    add(element.text)
+            else:
+                # end of an element, or a comment / processing instruction: only the tail is page text
+                add(element.tail)
+
+    return " ".join(strings)
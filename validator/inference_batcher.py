@@ -0,0 +1,188 @@
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+import bittensor as bt
+
+
+@dataclass
+class _PendingItem:
+    item: Any
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+def length_buckets(lengths: list[int], max_batch_size: int, max_padding_ratio: float) -> list[list[int]]:
+    """
+    Group item indexes into batches of similar length: items are taken shortest first and a batch is closed when it
+    has max_batch_size items or the next item is more than max_padding_ratio times longer than its shortest one
+    (every item in a batch is padded to the longest).
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    buckets: list[list[int]] = []
+    for i in order:
+        bucket = buckets[-1] if buckets else None
+        if (
+            bucket is None
+            or len(bucket) >= max_batch_size
+            or lengths[i] > max(1, lengths[bucket[0]]) * max_padding_ratio
+        ):
+            buckets.append([i])
+        else:
+            bucket.append(i)
+    return buckets
+
+
+class InferenceBatcher:
+    """
+    Dynamic micro-batching for a model forward pass.
+
+    Concurrent submit(item) calls are collected for up to max_wait_secs (or until max_batch_size items) and handed to
+    a worker thread together: each item is encoded with encode(item) -> (features, length), the encoded items are
+    grouped by length (length_buckets) and each group runs as one forward(features_list) -> results call (one padded
+    batch). Results are fanned back to the awaiting callers in submission order; an item whose encode or batch failed
+    gets that exception. Identical items (key(item)) submitted in the same window are computed once.
+    Up to max_concurrent_batches flushed queues are processed at a time.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[Any], tuple[Any, int]],
+        forward: Callable[[list], list],
+        max_batch_size: int = 16,
+        max_wait_secs: float = 0.01,
+        max_padding_ratio: float = 1.5,
+        max_concurrent_batches: int = 2,
+        key: Callable[[Any], Hashable] = lambda item: item,
+        name: str = "inference",
+    ):
+        self.encode = encode
+        self.forward = forward
+        self.max_batch_size = max_batch_size
+        self.max_wait_secs = max_wait_secs
+        self.max_padding_ratio = max_padding_ratio
+        self.key = key
+        self.name = name
+        self._batch_slots = asyncio.Semaphore(max_concurrent_batches)
+        self._pending: dict[Hashable, list[_PendingItem]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.submitted = 0
+        self.deduplicated = 0
+        self.flushes = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.max_batch = 0
+        self.failed_items = 0
+        self.started_items = 0
+        self.queue_wait_secs = 0.0
+        self.max_queue_wait_secs = 0.0
+        self.real_tokens = 0
+        self.padded_tokens = 0
+
+    async def submit(self, item):
+        self.submitted += 1
+        future = asyncio.get_running_loop().create_future()
+        key = self.key(item)
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            self.deduplicated += 1
+            waiters.append(_PendingItem(item, future))
+        else:
+            self._pending[key] = [_PendingItem(item, future)]
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.max_wait_secs, self._flush)
+        # Shielded: a caller that gives up does not cancel the batch for everyone else
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        pending, self._pending = list(self._pending.values()), {}
+        self.flushes += 1
+        task = asyncio.create_task(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _process(self, items: list) -> tuple[list, list[tuple[int, int, int]]]:
+        """Worker thread: (result or exception per item, (batch size, real tokens, padded tokens) per forward pass)."""
+        results: list = [None] * len(items)
+        encoded: dict[int, Any] = {}
+        lengths: dict[int, int] = {}
+        for i, item in enumerate(items):
+            try:
+                encoded[i], lengths[i] = self.encode(item)
+            except Exception as e:
+                results[i] = e
+
+        indexes = list(encoded)
+        batches = []
+        for bucket in length_buckets([lengths[i] for i in indexes], self.max_batch_size, self.max_padding_ratio):
+            bucket = [indexes[b] for b in bucket]
+            try:
+                outputs = self.forward([encoded[i] for i in bucket])
+                for i, output in zip(bucket, outputs):
+                    results[i] = output
+            except Exception as e:
+                for i in bucket:
+                    results[i] = e
+            bucket_lengths = [lengths[i] for i in bucket]
+            batches.append((len(bucket), sum(bucket_lengths), max(bucket_lengths) * len(bucket)))
+        return results, batches
+
+    async def _run(self, pending: list[list[_PendingItem]]):
+        async with self._batch_slots:
+            started = time.perf_counter()
+            for waiters in pending:
+                for waiter in waiters:
+                    wait = started - waiter.enqueued_at
+                    self.started_items += 1
+                    self.queue_wait_secs += wait
+                    self.max_queue_wait_secs = max(self.max_queue_wait_secs, wait)
+            try:
+                results, batches = await asyncio.to_thread(self._process, [waiters[0].item for waiters in pending])
+            except Exception as e:
+                bt.logging.error(f"{self.name} batcher: batch of {len(pending)} items failed: {e}")
+                results, batches = [e] * len(pending), []
+
+        for size, real_tokens, padded_tokens in batches:
+            self.batches += 1
+            self.batched_items += size
+            self.max_batch = max(self.max_batch, size)
+            self.real_tokens += real_tokens
+            self.padded_tokens += padded_tokens
+        for waiters, result in zip(pending, results):
+            for waiter in waiters:
+                if waiter.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    self.failed_items += 1
+                    waiter.future.set_exception(result)
+                else:
+                    waiter.future.set_result(result)
+
+    async def aclose(self):
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "failed_items": self.failed_items,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "avg_queue_wait_ms": 1000 * self.queue_wait_secs / self.started_items if self.started_items else 0.0,
+            "max_queue_wait_ms": 1000 * self.max_queue_wait_secs,
+            # Share of the forward-pass tokens that are real (not padding)
+            "padding_efficiency": self.real_tokens / self.padded_tokens if self.padded_tokens else 1.0,
+        }
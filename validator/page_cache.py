@@ -0,0 +1,173 @@
+import sys
+import time
+import hashlib
+import asyncio
+import dataclasses
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from shared.veridex_protocol import FetchPageResult
+
+
+class PageCache:
+    """
+    In-memory LRU cache of successful FetchPageResult objects keyed by URL.
+    Bounded by the total in-memory size of the cached page text and by a per-entry TTL.
+
+    Identical page text cached under different URLs (mirrors, AMP / print versions, redirect sources) is stored
+    once: entries share one string, found by a BLAKE2b digest of the text. The byte budget counts each stored
+    text once, however many entries share it.
+    """
+
+    def __init__(self, max_bytes: int, ttl_secs: float):
+        self.max_bytes = max_bytes
+        self.ttl_secs = ttl_secs
+        # key -> (result, expires at, text digest)
+        self._entries: "OrderedDict[str, tuple[FetchPageResult, float, bytes]]" = OrderedDict()
+        self._total_bytes = 0
+        # text digest -> [the shared instance, number of entries using it]
+        self._texts: dict[bytes, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+
+    @staticmethod
+    def _entry_size(result: FetchPageResult) -> int:
+        return sys.getsizeof(result.cleaned_html or "")
+
+    @staticmethod
+    def _text_digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass")).digest()
+
+    def get(self, key: str) -> FetchPageResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        result, expires_at, _ = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: FetchPageResult, ttl_secs: float | None = None):
+        """Cache a result. Results without page text are never cached."""
+        if not result.cleaned_html:
+            return
+
+        size = self._entry_size(result)
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        digest = self._text_digest(result.cleaned_html)
+        shared = self._texts.get(digest)
+        if shared is None:
+            self._texts[digest] = [result.cleaned_html, 1]
+            self._total_bytes += size
+        else:
+            shared[1] += 1
+            self.deduplicated += 1
+            if shared[0] is not result.cleaned_html:
+                result = dataclasses.replace(result, cleaned_html=shared[0])
+        expires_at = time.monotonic() + (self.ttl_secs if ttl_secs is None else ttl_secs)
+        self._entries[key] = (result, expires_at, digest)
+
+        # Evict least recently used entries until we are back under the byte budget
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def ttl_remaining(self, key: str) -> float | None:
+        """Seconds until key expires (None if not cached); does not count as a hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return max(0.0, entry[1] - time.monotonic())
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            shared = self._texts.get(entry[2])
+            if shared is not None:
+                shared[1] -= 1
+                if shared[1] <= 0:
+                    del self._texts[entry[2]]
+                    self._total_bytes -= self._entry_size(entry[0])
+
+    def clear(self):
+        self._entries.clear()
+        self._texts.clear()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "unique_texts": len(self._texts),
+            "deduplicated": self.deduplicated,
+        }
+
+
+def as_cache_hit(result: FetchPageResult) -> FetchPageResult:
+    """
+    Copy of a cached result for a caller that did not trigger the fetch.
+    Fetch/cleaning times that ran are reported as 0 (nothing was fetched for this caller); statuses are kept.
+    """
+    return dataclasses.replace(
+        result,
+        fetch_by_http_time_secs=0.0 if result.fetch_by_http_time_secs >= 0 else -1.0,
+        fetch_by_selenium_time_secs=0.0 if result.fetch_by_selenium_time_secs >= 0 else -1.0,
+        cleaning_html_time_secs=0.0 if result.cleaning_html_time_secs >= 0 else -1.0,
+        cleaning_html_queue_wait_secs=0.0 if result.cleaning_html_queue_wait_secs >= 0 else -1.0,
+        cleaning_html_parse_secs=0.0 if result.cleaning_html_parse_secs >= 0 else -1.0,
+        selenium_pool_wait_secs=0.0 if result.selenium_pool_wait_secs >= 0 else -1.0,
+        http_dns_secs=0.0 if result.http_dns_secs >= 0 else -1.0,
+        http_connect_secs=0.0 if result.http_connect_secs >= 0 else -1.0,
+        http_tls_secs=0.0 if result.http_tls_secs >= 0 else -1.0,
+        page_bytes=0 if result.page_bytes >= 0 else -1,
+        from_page_cache=True,
+    )
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one in-flight task.
+    Callers that arrive while the task is running await the same result. A cancelled caller
+    does not cancel the shared task, so the remaining callers still get their result.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+    def is_in_flight(self, key: str) -> bool:
+        return key in self._in_flight
+
+    async def run(self, key: str, factory: Callable[[], Awaitable]):
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _t, _key=key: self._in_flight.pop(_key, None))
+        return await asyncio.shield(task)
+
+    def __len__(self):
+        return len(self._in_flight)
@@ -0,0 +1,118 @@
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable
+
+import bittensor as bt
+
+
+class PagePrefetcher:
+    """
+    Keeps the most-cited evidence pages warm in the page cache.
+
+    record() counts citations per page (cache key). Every interval_secs, while the fetcher is idle, the top
+    max_pages pages cited at least min_citations times whose cache entry is missing or about to expire are
+    re-fetched through refresh(url) -> bytes downloaded, at most max_concurrency at a time and until
+    max_bytes_per_interval have been downloaded in the round. A round stops launching fetches as soon as real
+    work arrives (is_idle() turns False). Counts decay each round so pages that stop being cited drop out.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[str], Awaitable[int]],
+        needs_refresh: Callable[[str], bool],
+        is_idle: Callable[[], bool],
+        max_pages: int = 50,
+        min_citations: int = 3,
+        interval_secs: float = 60,
+        max_concurrency: int = 2,
+        max_bytes_per_interval: int = 20 * 1024 * 1024,
+        decay: float = 0.5,
+        max_tracked: int = 10000,
+    ):
+        self.refresh = refresh
+        self.needs_refresh = needs_refresh
+        self.is_idle = is_idle
+        self.max_pages = max_pages
+        self.min_citations = min_citations
+        self.interval_secs = interval_secs
+        self.max_concurrency = max_concurrency
+        self.max_bytes_per_interval = max_bytes_per_interval
+        self.decay = decay
+        self.max_tracked = max_tracked
+        self._counts: Counter[str] = Counter()
+        self._urls: dict[str, str] = {}
+        self.rounds = 0
+        self.prefetched = 0
+        self.failed = 0
+        self.bytes_fetched = 0
+        self.interrupted = 0
+
+    def record(self, key: str, url: str):
+        self._counts[key] += 1
+        self._urls[key] = url
+
+    def popular(self) -> list[tuple[str, str]]:
+        """(key, url) of the most-cited pages, most cited first."""
+        return [
+            (key, self._urls[key]) for key, count in self._counts.most_common(self.max_pages)
+            if count >= self.min_citations
+        ]
+
+    async def prefetch_once(self) -> int:
+        """One round; returns the number of pages refreshed."""
+        queue = [(key, url) for key, url in self.popular() if self.needs_refresh(key)]
+        budget = {"bytes": 0, "pages": 0}
+
+        async def worker():
+            while queue and budget["bytes"] < self.max_bytes_per_interval:
+                if not self.is_idle():
+                    self.interrupted += 1
+                    return
+                _, url = queue.pop(0)
+                try:
+                    fetched_bytes = await self.refresh(url)
+                    budget["bytes"] += max(0, fetched_bytes)
+                    budget["pages"] += 1
+                except Exception as e:
+                    self.failed += 1
+                    bt.logging.debug(f"Page prefetch failed for {url}: {e}")
+
+        if queue:
+            await asyncio.gather(*(worker() for _ in range(min(self.max_concurrency, len(queue)))))
+        self.rounds += 1
+        self.prefetched += budget["pages"]
+        self.bytes_fetched += budget["bytes"]
+        self._decay()
+        return budget["pages"]
+
+    def _decay(self):
+        for key in list(self._counts):
+            self._counts[key] *= self.decay
+            if self._counts[key] < 0.5:
+                del self._counts[key]
+                self._urls.pop(key, None)
+        if len(self._counts) > self.max_tracked:
+            keep = dict(self._counts.most_common(self.max_tracked))
+            self._counts = Counter(keep)
+            self._urls = {key: self._urls[key] for key in keep}
+
+    async def run(self):
+        """Prefetch forever (started as a background task at validator startup)."""
+        while True:
+            await asyncio.sleep(self.interval_secs)
+            try:
+                pages = await self.prefetch_once()
+                if pages:
+                    bt.logging.info(f"Page prefetch: refreshed {pages} popular pages | {self.stats()}")
+            except Exception as e:
+                bt.logging.warning(f"Page prefetch: round failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "tracked_pages": len(self._counts),
+            "rounds": self.rounds,
+            "prefetched": self.prefetched,
+            "failed": self.failed,
+            "bytes_fetched": self.bytes_fetched,
+            "interrupted": self.interrupted,
+        }
@@ -0,0 +1,165 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, asdict
+
+import bittensor as bt
+
+PAGE_STORE_BACKEND_HTTP = "http"
+PAGE_STORE_BACKEND_SELENIUM = "selenium"
+PAGE_STORE_BACKEND_HTML_PARSER_API = "html_parser_api"
+
+
+@dataclass
+class StoredPage:
+    """Metadata for a page body kept in the DiskPageStore. The body itself lives in a content-addressed blob."""
+    url: str
+    content_hash: str
+    backend: str  # PAGE_STORE_BACKEND_*
+    fetched_at: float  # epoch seconds of the last fetch or successful revalidation
+    ttl_secs: float
+    etag: str = ""
+    last_modified: str = ""
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) < self.fetched_at + self.ttl_secs
+
+    def conditional_headers(self) -> dict:
+        """Headers for a conditional GET; empty when the server gave us no validators."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DiskPageStore:
+    """
+    Persistent, gzip-compressed page store so fetched pages survive validator restarts.
+
+    Layout (under root_dir):
+      index/<url_hash[:2]>/<url_hash>.json        -> StoredPage metadata, keyed by canonical URL
+      blobs/<content_hash[:2]>/<content_hash>.gz  -> page body, keyed by content hash (shared by identical pages)
+
+    All methods do blocking file IO; call them with asyncio.to_thread from async code. prune() walks the whole
+    store and is run periodically by its owner (SnippetFetcher.start_page_store_pruner), never inside a save.
+    """
+
+    def __init__(self, root_dir: str, http_ttl_secs: float, selenium_ttl_secs: float, max_age_secs: float):
+        self.root_dir = root_dir
+        self.http_ttl_secs = http_ttl_secs
+        self.selenium_ttl_secs = selenium_ttl_secs
+        self.max_age_secs = max_age_secs
+        self._index_dir = os.path.join(root_dir, "index")
+        self._blob_dir = os.path.join(root_dir, "blobs")
+
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _index_path(self, key: str) -> str:
+        url_hash = self._hash(key.encode("utf-8"))
+        return os.path.join(self._index_dir, url_hash[:2], f"{url_hash}.json")
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self._blob_dir, content_hash[:2], f"{content_hash}.gz")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def ttl_for_backend(self, backend: str) -> float:
+        # Selenium renders cost seconds of browser time each, so keep them longer
+        return self.selenium_ttl_secs if backend == PAGE_STORE_BACKEND_SELENIUM else self.http_ttl_secs
+
+    def load(self, key: str) -> StoredPage | None:
+        path = self._index_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stored = StoredPage(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            bt.logging.warning(f"Page store: unreadable index entry {path}, ignoring: {e}")
+            return None
+
+        if not os.path.exists(self._blob_path(stored.content_hash)):
+            return None
+        return stored
+
+    def read_body(self, stored: StoredPage) -> str | None:
+        try:
+            with gzip.open(self._blob_path(stored.content_hash), "rb") as f:
+                return f.read().decode("utf-8")
+        except Exception as e:
+            bt.logging.warning(f"Page store: could not read body for {stored.url}: {e}")
+            return None
+
+    def save(self, key: str, body: str, backend: str, etag: str = "", last_modified: str = "") -> StoredPage:
+        data = body.encode("utf-8")
+        content_hash = self._hash(data)
+        blob_path = self._blob_path(content_hash)
+        if not os.path.exists(blob_path):
+            self._write_atomic(blob_path, gzip.compress(data, compresslevel=6))
+
+        stored = StoredPage(
+            url=key,
+            content_hash=content_hash,
+            backend=backend,
+            fetched_at=time.time(),
+            ttl_secs=self.ttl_for_backend(backend),
+            etag=etag or "",
+            last_modified=last_modified or "",
+        )
+        self._write_atomic(self._index_path(key), json.dumps(asdict(stored)).encode("utf-8"))
+        return stored
+
+    def mark_revalidated(self, stored: StoredPage) -> StoredPage:
+        """Record a 304 Not Modified: the stored body is current again for another TTL."""
+        stored.fetched_at = time.time()
+        self._write_atomic(self._index_path(stored.url), json.dumps(asdict(stored)).encode("utf-8"))
+        return stored
+
+    def prune(self):
+        """Drop index entries not refreshed within max_age_secs and blobs no index entry refers to."""
+        started_at = time.time()
+        cutoff = started_at - self.max_age_secs
+        referenced = set()
+        removed = 0
+
+        for dir_path, _, file_names in os.walk(self._index_dir):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        entry = json.load(f)
+                    if entry.get("fetched_at", 0) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                    else:
+                        referenced.add(entry.get("content_hash"))
+                except Exception:
+                    continue
+
+        for dir_path, _, file_names in os.walk(self._blob_dir):
+            for file_name in file_names:
+                if not file_name.endswith(".gz") or file_name[:-3] in referenced:
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    # Skip blobs written in the last minute: their index entry may still be on its way
+                    if os.path.getmtime(path) < started_at - 60:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+
+        bt.logging.info(f"Page store: pruned {removed} files from {self.root_dir}")
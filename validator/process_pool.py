@@ -0,0 +1,85 @@
+import io
+import os
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import context, forkserver, popen_forkserver, reduction, spawn, util
+from typing import Callable
+
+# The one list of modules the forkserver imports before forking workers (set once, for every WorkerProcessPool):
+# the modules whose functions run in workers. Light modules only: no bittensor, no models
+WORKER_PRELOAD_MODULES = ["validator.html_clean_worker", "validator.snippet_matcher"]
+
+_context_lock = threading.Lock()
+_context: "_WorkerContext | None" = None
+
+
+def timed_call(fn: Callable, *args, **kwargs) -> tuple[object, float, float]:
+    """Runs in the worker: (result, started_at (wall clock, comparable across processes), run seconds)."""
+    started_at = time.time()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, started_at, time.perf_counter() - start
+
+
+class _WorkerPopen(popen_forkserver.Popen):
+    """
+    popen_forkserver.Popen whose preparation data leaves out the parent's __main__: a spawn/forkserver child
+    otherwise re-imports the entry point (the validator, which loads the models) before running anything.
+    Per process launch, so nothing process-wide is swapped while other threads run.
+    """
+
+    def _launch(self, process_obj):
+        prep_data = spawn.get_preparation_data(process_obj._name)
+        prep_data.pop("init_main_from_name", None)
+        prep_data.pop("init_main_from_path", None)
+        buf = io.BytesIO()
+        context.set_spawning_popen(self)
+        try:
+            reduction.dump(prep_data, buf)
+            reduction.dump(process_obj, buf)
+        finally:
+            context.set_spawning_popen(None)
+
+        self.sentinel, w = forkserver.connect_to_new_process(self._fds)
+        # Keep a duplicate of the data pipe's write end as a sentinel of the parent process used by the child process
+        _parent_w = os.dup(w)
+        self.finalizer = util.Finalize(self, util.close_fds, (_parent_w, self.sentinel))
+        with open(w, "wb", closefd=True) as f:
+            f.write(buf.getbuffer())
+        self.pid = forkserver.read_signed(self.sentinel)
+
+
+class _WorkerProcess(context.ForkServerProcess):
+    @staticmethod
+    def _Popen(process_obj):
+        return _WorkerPopen(process_obj)
+
+
+class _WorkerContext(context.ForkServerContext):
+    Process = _WorkerProcess
+
+
+def _worker_context() -> _WorkerContext:
+    global _context
+    with _context_lock:
+        if _context is None:
+            # Replaces the default ["__main__"]; process-wide, so it is set here only
+            _context = _WorkerContext()
+            _context.set_forkserver_preload(WORKER_PRELOAD_MODULES)
+        return _context
+
+
+class WorkerProcessPool(ProcessPoolExecutor):
+    """
+    ProcessPoolExecutor for CPU work that must not hold the validator's GIL.
+
+    Workers are started by a forkserver (a fresh single-threaded interpreter), never forked from the validator
+    process itself: that one runs torch, logging and executor threads, and forking a multithreaded process can
+    deadlock the child. Workers get WORKER_PRELOAD_MODULES (imported once in the forkserver) and not the validator
+    entry point (see _WorkerPopen). Submitted functions must be module-level functions of those modules, and their
+    arguments picklable.
+    """
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers, mp_context=_worker_context())
@@ -5,6 +5,15 @@ import asyncio
 import threading
 from transformers import RobertaTokenizer, RobertaForSequenceClassification
 
+from shared.environment_variables import (
+    USE_QUALITY_MODEL_BATCHING,
+    QUALITY_MODEL_BATCH_MAX_SIZE,
+    QUALITY_MODEL_BATCH_MAX_WAIT_MS,
+    QUALITY_MODEL_BATCH_MAX_PADDING_RATIO,
+    QUALITY_MODEL_MAX_CONCURRENT_BATCHES,
+)
+from validator.inference_batcher import InferenceBatcher
+
 class VeridexQualityModel:
     """
     Example Quality Model using roberta-large-mnli (or roberta-base-mnli).
@@ -55,9 +64,36 @@ class VeridexQualityModel:
                 logits = self.model(**inputs).logits
                 # logits.shape = [batch_size, 3]
                 probs_tensor = torch.softmax(logits, dim=-1)[0]  # [3]
-                prob_contra = probs_tensor[0].item()
-                prob_neutral = probs_tensor[1].item()
-                prob_entail = probs_tensor[2].item()
+
+        return self._distribution(probs_tensor.tolist())
+
+    def encode_pair(self, pair: tuple[str, str]) -> (dict, int):
+        """
+        Tokenize one (statement, snippet) pair, unpadded, for forward_pairs.
+        Returns the encoding and its token length.
+        """
+        statement, snippet = pair
+        encoding = self.tokenizer(text=snippet, text_pair=statement, truncation=True)
+        return encoding, len(encoding["input_ids"])
+
+    def forward_pairs(self, encodings: list) -> list:
+        """
+        One forward pass over encode_pair() encodings, padded to the longest.
+        Returns (probs, local_score) per pair, as score_pair_distrib.
+        """
+        inputs = self.tokenizer.pad(encodings, padding=True, return_tensors='pt')
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+        with model_lock:
+            with torch.no_grad():
+                logits = self.model(**inputs).logits
+                probs_tensor = torch.softmax(logits, dim=-1)  # [batch_size, 3]
+
+        return [self._distribution(probs) for probs in probs_tensor.tolist()]
+
+    @staticmethod
+    def _distribution(probs: list) -> (dict, float):
+        prob_contra, prob_neutral, prob_entail = probs
 
         # local_score = (prob_contra + prob_entail) - (prob_neutral)
         # don't minus neutrality score
@@ -111,7 +147,20 @@ model_lock = threading.Semaphore(5)
 async def score_statement_snippets(statement: str, snippet_texts: list) -> (float, list):
     return await asyncio.to_thread(verify_quality_model.score_statement_snippets, statement, snippet_texts)
 
+# Concurrent pairs (all snippets of all in-flight requests) run as padded batches grouped by token length
+quality_model_batcher = InferenceBatcher(
+    verify_quality_model.encode_pair,
+    verify_quality_model.forward_pairs,
+    max_batch_size=QUALITY_MODEL_BATCH_MAX_SIZE,
+    max_wait_secs=QUALITY_MODEL_BATCH_MAX_WAIT_MS / 1000,
+    max_padding_ratio=QUALITY_MODEL_BATCH_MAX_PADDING_RATIO,
+    max_concurrent_batches=QUALITY_MODEL_MAX_CONCURRENT_BATCHES,
+    name="Quality model",
+)
+
 async def score_statement_distribution(statement: str, snippet: str) -> (float, list):
+    if USE_QUALITY_MODEL_BATCHING:
+        return await quality_model_batcher.submit((statement, snippet))
     return await asyncio.to_thread(verify_quality_model.score_pair_distrib,statement, snippet)
 
 async def main(statement:str, snippet: str):
@@ -0,0 +1,129 @@
+import re
+import time
+from dataclasses import dataclass
+
+RENDER_REASON_STABLE = "stable"  # DOM stopped changing and the network went idle
+RENDER_REASON_TIMEOUT = "timeout"  # hit the hard upper bound while the page was still changing
+RENDER_REASON_CHALLENGE_TIMEOUT = "challenge_timeout"  # still on a bot-challenge interstitial at the upper bound
+
+# Whole titles of known bot-challenge interstitials (Cloudflare, DDoS-Guard, Sucuri). Anchored: a real page whose
+# title merely contains "please wait" or "access denied" must not be waited on and dropped as a challenge
+CHALLENGE_TITLE_RE = re.compile(
+    r"just a moment(?:\.\.\.|…)?|attention required! \| cloudflare|please wait\.\.\. \| cloudflare|"
+    r"checking your browser before accessing \S+|ddos-guard|sucuri website firewall - access denied",
+    re.IGNORECASE,
+)
+
+# Snapshot of the page state, evaluated in the browser on every poll. Cheap: no layout (no innerText).
+RENDER_SNAPSHOT_SCRIPT = """
+var resources = performance.getEntriesByType('resource');
+var lastResponseEnd = 0;
+for (var i = 0; i < resources.length; i++) {
+    if (resources[i].responseEnd > lastResponseEnd) { lastResponseEnd = resources[i].responseEnd; }
+}
+var body = document.body;
+return {
+    readyState: document.readyState,
+    title: document.title || '',
+    nodeCount: document.getElementsByTagName('*').length,
+    textLength: body ? (body.textContent || '').length : 0,
+    resourceCount: resources.length,
+    msSinceLastResponse: performance.now() - lastResponseEnd,
+    challengeElement: !!document.querySelector(
+        '#challenge-form, #challenge-running, #cf-challenge-running, .cf-browser-verification, ' +
+        '#challenge-stage, #px-captcha, form[action*="__cf_chl"]'
+    )
+};
+"""
+
+
+@dataclass
+class RenderWaitResult:
+    reason: str  # RENDER_REASON_*
+    waited_secs: float
+    polls: int
+    challenge_seen: bool
+
+
+class RenderCompletionDetector:
+    """
+    Decides when a Selenium page is rendered enough to read page_source, from periodic snapshots
+    (RENDER_SNAPSHOT_SCRIPT). A page is done when:
+      - document.readyState is interactive/complete,
+      - the DOM signature (element count, text length) is unchanged for stable_polls polls in a row,
+      - no resource finished loading in the last network_idle_ms and no new resources appeared,
+      - and it is not a bot-challenge interstitial (those redirect to the real page once solved).
+    """
+
+    def __init__(self, stable_polls: int = 3, network_idle_ms: float = 500):
+        self.stable_polls = stable_polls
+        self.network_idle_ms = network_idle_ms
+        self._last_signature = None
+        self._last_resource_count = None
+        self._stable_count = 0
+        self.challenge_seen = False
+        self.on_challenge = False
+
+    @staticmethod
+    def is_challenge(snapshot: dict) -> bool:
+        title = (snapshot.get("title") or "").strip()
+        return bool(snapshot.get("challengeElement")) or bool(CHALLENGE_TITLE_RE.fullmatch(title))
+
+    def update(self, snapshot: dict) -> bool:
+        """Feed one snapshot; True when the page is considered rendered."""
+        self.on_challenge = self.is_challenge(snapshot)
+        if self.on_challenge:
+            self.challenge_seen = True
+            self._stable_count = 0
+            self._last_signature = None
+            return False
+
+        signature = (snapshot.get("nodeCount"), snapshot.get("textLength"))
+        resource_count = snapshot.get("resourceCount")
+        if signature == self._last_signature and resource_count == self._last_resource_count:
+            self._stable_count += 1
+        else:
+            self._stable_count = 0
+        self._last_signature = signature
+        self._last_resource_count = resource_count
+
+        ready = snapshot.get("readyState") in ("interactive", "complete")
+        network_idle = (snapshot.get("msSinceLastResponse") or 0) >= self.network_idle_ms
+        # The first snapshot has nothing to compare against, so "stable" needs stable_polls repeats after it
+        return ready and network_idle and self._stable_count >= self.stable_polls
+
+
+def wait_for_render_completion(
+    driver,
+    max_wait_secs: float,
+    poll_interval_secs: float = 0.1,
+    stable_polls: int = 3,
+    network_idle_ms: float = 500,
+    challenge_max_wait_secs: float | None = None,
+) -> RenderWaitResult:
+    """
+    Blocking (call from the Selenium worker thread). Polls the page until it is rendered or max_wait_secs passes
+    (then the DOM is read as it stands: pages with tickers or polling beacons never settle). A bot-challenge
+    interstitial is waited on for up to challenge_max_wait_secs (default max_wait_secs) from the start; once it
+    clears, the real page gets max_wait_secs of its own.
+    """
+    if challenge_max_wait_secs is None:
+        challenge_max_wait_secs = max_wait_secs
+    detector = RenderCompletionDetector(stable_polls=stable_polls, network_idle_ms=network_idle_ms)
+    start = time.monotonic()
+    page_start = start
+    polls = 0
+    while True:
+        snapshot = driver.execute_script(RENDER_SNAPSHOT_SCRIPT) or {}
+        polls += 1
+        now = time.monotonic()
+        was_on_challenge = detector.on_challenge
+        if detector.update(snapshot):
+            return RenderWaitResult(RENDER_REASON_STABLE, now - start, polls, detector.challenge_seen)
+        if was_on_challenge and not detector.on_challenge:
+            page_start = now
+        deadline = start + challenge_max_wait_secs if detector.on_challenge else page_start + max_wait_secs
+        if now >= deadline:
+            reason = RENDER_REASON_CHALLENGE_TIMEOUT if detector.on_challenge else RENDER_REASON_TIMEOUT
+            return RenderWaitResult(reason, now - start, polls, detector.challenge_seen)
+        time.sleep(min(poll_interval_secs, max(0.0, deadline - now)))
@@ -0,0 +1,222 @@
+import time
+import asyncio
+from collections import deque
+from typing import Callable
+
+import bittensor as bt
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    bt.logging.warning("psutil not available - Selenium drivers are recycled by page count only")
+
+HEALTH_CHECK_TIMEOUT_SECONDS = 5
+
+
+class PooledDriver:
+    """A Selenium WebDriver plus the bookkeeping the pool needs to decide when to recycle it."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.pages = 0
+        self.wait_secs = 0.0  # how long the current holder waited for this driver
+        self.healthy = True  # set to False by the caller when a fetch fails in a way that may have broken the driver
+
+
+class SeleniumDriverPool:
+    """
+    Fixed-size pool of Selenium WebDrivers (a WebDriver handles one page at a time).
+
+    - prewarm() creates drivers ahead of the first 403 so the fallback does not pay Chrome startup.
+    - Idle drivers are health-checked before they are handed out; dead ones are replaced.
+    - Drivers are recycled (quit + recreated on demand) after max_pages pages or when Chrome's
+      process tree grows beyond max_rss_mb (needs psutil).
+    - stats() exposes occupancy and how long callers waited for a driver.
+    """
+
+    def __init__(
+        self,
+        create_driver: Callable[[], object],
+        max_drivers: int,
+        max_pages: int,
+        max_rss_mb: float,
+    ):
+        self._create_driver = create_driver  # blocking; returns a driver or None
+        self.max_drivers = max_drivers
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._idle: deque[PooledDriver] = deque()
+        self._total = 0  # idle + in use + being created
+        self._in_use = 0
+        self._waiting = 0
+        self._cond = asyncio.Condition()
+        self.created = 0
+        self.recycled = 0
+        self.unhealthy = 0
+        self.acquired = 0
+        self.total_wait_secs = 0.0
+        self.max_wait_secs = 0.0
+
+    async def _new_driver(self) -> PooledDriver | None:
+        """Create a driver for a slot already counted in _total; gives the slot back on failure."""
+        driver = None
+        try:
+            driver = await asyncio.to_thread(self._create_driver)
+        finally:
+            if driver is None:  # creation failed or the caller was cancelled
+                async with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+        if driver is None:
+            return None
+        self.created += 1
+        return PooledDriver(driver)
+
+    async def prewarm(self, count: int):
+        """Start up to count drivers in the background of startup, so the first fallback finds one ready."""
+        started = 0
+        for _ in range(count):
+            async with self._cond:
+                if self._total >= self.max_drivers:
+                    break
+                self._total += 1
+            pooled = await self._new_driver()
+            if pooled is None:
+                break
+            async with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+            started += 1
+        bt.logging.info(f"Selenium driver pool: pre-warmed {started} driver(s)")
+
+    async def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            result = await asyncio.wait_for(
+                asyncio.to_thread(pooled.driver.execute_script, "return 1"),
+                timeout=HEALTH_CHECK_TIMEOUT_SECONDS,
+            )
+            return result == 1
+        except Exception as e:
+            bt.logging.warning(f"Selenium driver pool: health check failed, replacing driver: {e}")
+            return False
+
+    async def acquire(self) -> PooledDriver | None:
+        """Wait for a healthy driver; None if a new driver could not be created."""
+        wait_start = time.perf_counter()
+        while True:
+            pooled = None
+            async with self._cond:
+                self._waiting += 1
+                try:
+                    while not self._idle and self._total >= self.max_drivers:
+                        await self._cond.wait()
+                finally:
+                    self._waiting -= 1
+                if self._idle:
+                    pooled = self._idle.popleft()
+                else:
+                    self._total += 1
+
+            if pooled is None:
+                pooled = await self._new_driver()
+                if pooled is None:
+                    return None
+            elif not await self._is_healthy(pooled):
+                self.unhealthy += 1
+                await self._discard(pooled)
+                continue
+
+            wait_secs = time.perf_counter() - wait_start
+            self._in_use += 1
+            self.acquired += 1
+            self.total_wait_secs += wait_secs
+            self.max_wait_secs = max(self.max_wait_secs, wait_secs)
+            pooled.wait_secs = wait_secs
+            return pooled
+
+    def _rss_mb(self, pooled: PooledDriver) -> float | None:
+        """RSS of chromedriver and every Chrome process it started; None if unknown."""
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            process = psutil.Process(pooled.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            total = 0
+            for p in processes:
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+
+    async def release(self, pooled: PooledDriver):
+        """Return a driver after a page; recycles it if it is broken, worn out or too big."""
+        # Shielded: a caller cancelled mid-release (request timeout) must not leak the driver's slot,
+        # the return to the pool (or the discard) runs to the end regardless
+        await asyncio.shield(self._release(pooled))
+
+    async def _release(self, pooled: PooledDriver):
+        self._in_use -= 1
+        pooled.pages += 1
+
+        reason = None
+        if not pooled.healthy:
+            reason = "failed during fetch"
+        elif pooled.pages >= self.max_pages:
+            reason = f"served {pooled.pages} pages"
+        else:
+            rss_mb = await asyncio.to_thread(self._rss_mb, pooled)
+            if rss_mb is not None and rss_mb > self.max_rss_mb:
+                reason = f"RSS {rss_mb:.0f} MB > {self.max_rss_mb:.0f} MB"
+
+        if reason is not None:
+            bt.logging.info(f"Selenium driver pool: recycling driver ({reason})")
+            self.recycled += 1
+            await self._discard(pooled)
+            return
+
+        try:
+            await asyncio.to_thread(pooled.driver.delete_all_cookies)
+        except Exception as e:
+            bt.logging.warning(f"Selenium driver pool: could not reset driver, recycling it: {e}")
+            self.recycled += 1
+            await self._discard(pooled)
+            return
+
+        async with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    async def _discard(self, pooled: PooledDriver):
+        try:
+            await asyncio.to_thread(pooled.driver.quit)
+        except Exception:
+            pass
+        async with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    async def close(self):
+        async with self._cond:
+            idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            await self._discard(pooled)
+
+    def stats(self) -> dict:
+        return {
+            "max_drivers": self.max_drivers,
+            "total": self._total,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "created": self.created,
+            "recycled": self.recycled,
+            "unhealthy": self.unhealthy,
+            "avg_wait_secs": self.total_wait_secs / self.acquired if self.acquired else 0.0,
+            "max_wait_secs": self.max_wait_secs,
+        }
@@ -0,0 +1,62 @@
+SELENIUM_RENDER_PROFILE_FULL = "full"  # regular Chrome: every resource is downloaded, driver.get waits for onload
+SELENIUM_RENDER_PROFILE_LIGHT = "light"  # text only: no images/fonts/CSS/media, driver.get returns at DOMContentLoaded
+SELENIUM_RENDER_PROFILES = (SELENIUM_RENDER_PROFILE_FULL, SELENIUM_RENDER_PROFILE_LIGHT)
+
+# We only read page_source for clean_html, so anything that does not create DOM text is dead weight
+BLOCKED_EXTENSIONS = (
+    # images
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp",
+    # fonts
+    "woff", "woff2", "ttf", "otf", "eot",
+    # stylesheets
+    "css",
+    # media
+    "mp4", "webm", "m3u8", "ts", "mp3", "ogg", "wav", "m4a", "mov",
+)
+BLOCKED_URL_PATTERNS = [f"*.{ext}" for ext in BLOCKED_EXTENSIONS] + [f"*.{ext}?*" for ext in BLOCKED_EXTENSIONS]
+
+# Chrome features the fetcher never needs; always disabled (IsolateOrigins/site-per-process were disabled before)
+BASE_DISABLED_FEATURES = ["IsolateOrigins", "site-per-process"]
+LIGHT_DISABLED_FEATURES = ["Translate", "MediaRouter", "OptimizationHints", "AutofillServerCommunication"]
+
+LIGHT_CHROME_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    "--autoplay-policy=user-gesture-required",
+]
+
+LIGHT_CONTENT_SETTINGS_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+    "profile.managed_default_content_settings.geolocation": 2,
+}
+
+
+def apply_render_profile_options(chrome_options, profile: str):
+    """Add the profile's Chrome switches, prefs and page-load strategy to a selenium ChromeOptions."""
+    disabled_features = list(BASE_DISABLED_FEATURES)
+    if profile == SELENIUM_RENDER_PROFILE_LIGHT:
+        # Return from driver.get at DOMContentLoaded; render_completion waits for the scripts that matter
+        chrome_options.page_load_strategy = "eager"
+        for argument in LIGHT_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option("prefs", LIGHT_CONTENT_SETTINGS_PREFS)
+        disabled_features += LIGHT_DISABLED_FEATURES
+    # Chrome only honours the last --disable-features switch, so all features go in one
+    chrome_options.add_argument(f"--disable-features={','.join(disabled_features)}")
+
+
+def apply_render_profile_cdp(driver, profile: str):
+    """Block resource downloads in a created driver (DevTools Network.setBlockedURLs); no-op for the full profile."""
+    if profile != SELENIUM_RENDER_PROFILE_LIGHT:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
@@ -1,9 +1,11 @@
 import time
+import codecs
 import asyncio
+import threading
+import dataclasses
 import httpx
 import random
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urldefrag
 
 import bittensor as bt
 import certifi
@@ -21,16 +23,152 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     bt.logging.warning("Selenium not available - bot detection fallback disabled")
 
-from shared.environment_variables import HTML_PARSER_API_URL, USE_HTML_PARSER_API
+from shared.environment_variables import (
+    HTML_PARSER_API_URL,
+    USE_HTML_PARSER_API,
+    USE_HTML_PARSER_API_BATCHING,
+    HTML_PARSER_API_BATCH_MAX_SIZE,
+    HTML_PARSER_API_BATCH_MAX_WAIT_MS,
+    HTML_PARSER_API_MAX_CONCURRENT_BATCHES,
+    USE_PAGE_CACHE,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_TTL_SECONDS,
+    USE_PAGE_STORE,
+    PAGE_STORE_DIR,
+    PAGE_STORE_HTTP_TTL_SECONDS,
+    PAGE_STORE_SELENIUM_TTL_SECONDS,
+    PAGE_STORE_MAX_AGE_SECONDS,
+    PAGE_STORE_PRUNE_INTERVAL_SECONDS,
+    USE_URL_CANONICALIZATION,
+    REDIRECT_MEMORY_MAX_ENTRIES,
+    REDIRECT_MEMORY_TTL_SECONDS,
+    USE_PAGE_PREFETCH,
+    PAGE_PREFETCH_MAX_PAGES,
+    PAGE_PREFETCH_MIN_CITATIONS,
+    PAGE_PREFETCH_INTERVAL_SECONDS,
+    PAGE_PREFETCH_CONCURRENCY,
+    PAGE_PREFETCH_MAX_BYTES_PER_INTERVAL,
+    PAGE_PREFETCH_IDLE_SECONDS,
+    FETCH_GLOBAL_CONCURRENCY,
+    FETCH_HOST_INITIAL_CONCURRENCY,
+    FETCH_HOST_MIN_CONCURRENCY,
+    FETCH_HOST_MAX_CONCURRENCY,
+    FETCH_HOST_SLOW_LATENCY_SECONDS,
+    USE_STREAMING_FETCH,
+    FETCH_MAX_BYTES,
+    USE_STREAMING_EXTRACTION,
+    USE_HTML_CLEAN_POOL,
+    HTML_CLEAN_POOL_WORKERS,
+    HTML_CLEAN_POOL_MIN_BYTES,
+    HTML_CLEANER_BACKEND,
+    SELENIUM_MAX_DRIVERS,
+    SELENIUM_PREWARM_DRIVERS,
+    SELENIUM_DRIVER_MAX_PAGES,
+    SELENIUM_DRIVER_MAX_RSS_MB,
+    SELENIUM_RENDER_PROFILE,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    SNIPPET_FETCHER_MODE,
+    TRAFFIC_ARCHIVE_PATH,
+    TRAFFIC_REPLAY_LATENCY_SCALE,
+    COOKIE_JAR_MAX_HOSTS,
+    COOKIE_JAR_MAX_COOKIES_PER_HOST,
+    USE_DNS_CACHE,
+    DNS_CACHE_TTL_SECONDS,
+    DNS_CACHE_NEGATIVE_TTL_SECONDS,
+    USE_CONNECTION_WARM_POOL,
+    USE_HEDGED_REQUESTS,
+    HEDGE_LATENCY_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_BUDGET_BURST,
+    USE_HOST_ROUTING,
+    HOST_ROUTING_SELENIUM_AFTER_BLOCKS,
+    HOST_ROUTING_REPROBE_SECONDS,
+    CIRCUIT_BREAKER_MODE,
+    CIRCUIT_BREAKER_HOST_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_URL_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_BASE_COOLDOWN_SECONDS,
+    CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS,
+    CONNECTION_WARM_POOL_HOSTS,
+    CONNECTION_WARM_POOL_INTERVAL_SECONDS,
+    SELENIUM_RENDER_MAX_WAIT_SECONDS,
+    SELENIUM_RENDER_CHALLENGE_MAX_WAIT_SECONDS,
+    SELENIUM_RENDER_POLL_INTERVAL_SECONDS,
+    SELENIUM_RENDER_STABLE_POLLS,
+    SELENIUM_RENDER_NETWORK_IDLE_MS,
+)
 from shared.veridex_protocol import (
     FetchPageResult,
     SNIPPET_FETCHER_STATUS_OK,
     SNIPPET_FETCHER_STATUS_ERROR,
     SNIPPET_FETCHER_STATUS_NOT_RUN,
+    SNIPPET_FETCHER_STATUS_SKIPPED,
+    SNIPPET_FETCHER_STATUS_CIRCUIT_OPEN,
+)
+from validator.host_scheduler import HostScheduler
+from validator.html_clean_pool import (
+    HtmlCleanPool,
+    CleanHtmlResult,
+    clean_html_page,
+    HTML_CLEANER_BACKEND_BS4,
+    HTML_CLEANER_BACKENDS,
+)
+from validator.html_text_extractor import StreamingTextExtractor
+from validator.charset import DETECT_BYTES, resolve_charset
+from validator.selenium_driver_pool import SeleniumDriverPool
+from validator.selenium_render_profile import (
+    SELENIUM_RENDER_PROFILE_FULL,
+    SELENIUM_RENDER_PROFILES,
+    apply_render_profile_cdp,
+    apply_render_profile_options,
+)
+from validator.dns_cache import (
+    CachingNetworkBackend,
+    ConnectionTiming,
+    DnsCache,
+    current_connection_timing,
+    install_network_backend,
+)
+from validator.connection_warmer import ConnectionWarmer
+from validator.cookie_jars import CookieJarTransport, HostCookieJars, refusing_cookie_jar
+from validator.traffic_archive import (
+    SELENIUM_METHOD,
+    TRAFFIC_MODE_LIVE,
+    TRAFFIC_MODE_RECORD,
+    TRAFFIC_MODE_REPLAY,
+    TRAFFIC_MODES,
+    ArchivedResponse,
+    RecordingTransport,
+    ReplayTransport,
+    TrafficArchive,
+)
+from validator.html_parser_api_client import HtmlParserApiClient
+from validator.hedging import HedgeBudget, HostLatencyTracker
+from validator.host_routing import HOST_ROUTE_SELENIUM, HostRouter, route_key
+from validator.host_health import CIRCUIT_BREAKER_MODE_OBSERVE, CIRCUIT_BREAKER_MODES, HostHealth
+from validator.render_completion import RENDER_REASON_CHALLENGE_TIMEOUT, wait_for_render_completion
+from validator.page_cache import PageCache, SingleFlight, as_cache_hit
+from validator.url_canonicalizer import RedirectMemory, canonicalize_url
+from validator.page_prefetcher import PagePrefetcher
+from validator.page_store import (
+    DiskPageStore,
+    StoredPage,
+    PAGE_STORE_BACKEND_HTTP,
+    PAGE_STORE_BACKEND_SELENIUM,
+    PAGE_STORE_BACKEND_HTML_PARSER_API,
 )
 
 REQUEST_TIMEOUT_SECONDS = 60
 
+# Content types worth downloading and cleaning; anything else (PDF, images, archives, ...) is skipped
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "application/xml", "text/xml", "text/plain")
+
+# Framing headers that no longer describe a body read with aiter_bytes (already decoded, possibly cut short)
+STREAMED_BODY_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
 # Rotating User-Agents to avoid detection (Strategy: Rotate HTTP Headers / User-Agent)
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -49,29 +187,197 @@ ACCEPT_LANGUAGES = [
     "en-US,en;q=0.9,fr;q=0.8",
 ]
 
+class MockResponse:
+    """httpx.Response-like page rendered by Selenium (there is no HTTP response to return)."""
+
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.headers = {}
+
+
 class SnippetFetcher:
 
     def __init__(self):
         bt.logging.info("SnippetFetcher created")
 
         # Initialize a shared client with cookie support (Strategy: Use Cookies)
-        # Cookies are persisted across requests to mimic real user sessions
-        self.client = httpx.AsyncClient(
+        # Cookies are persisted across requests to mimic real user sessions, in one bounded jar per host
+        # Explicit pool limits: keepalive_expiry outlives the warm pool interval so warmed connections stay open
+        transport = httpx.AsyncHTTPTransport(
             verify=certifi.where(),
-            follow_redirects=True,
             http2=True,
-            cookies=httpx.Cookies(),  # Enable cookie jar for session persistence
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        # Resolves through the DNS cache and records DNS / connect / TLS time for each fetch. With the flag off the
+        # stock httpcore backend is left in place (and the connection timings stay -1)
+        self.dns_cache = None
+        if USE_DNS_CACHE:
+            self.dns_cache = DnsCache(DNS_CACHE_TTL_SECONDS, DNS_CACHE_NEGATIVE_TTL_SECONDS)
+            install_network_backend(transport, CachingNetworkBackend(self.dns_cache))
+
+        # Record / replay: every response is archived, or every fetch is served from the archive (no network)
+        self.traffic_mode = SNIPPET_FETCHER_MODE
+        if self.traffic_mode not in TRAFFIC_MODES:
+            bt.logging.warning(f"Unknown SNIPPET_FETCHER_MODE '{self.traffic_mode}', using '{TRAFFIC_MODE_LIVE}'")
+            self.traffic_mode = TRAFFIC_MODE_LIVE
+        self.traffic_archive = None
+        self.traffic_replay = None
+        html_parser_api_transport = None
+        if self.traffic_mode == TRAFFIC_MODE_RECORD:
+            self.traffic_archive = TrafficArchive(TRAFFIC_ARCHIVE_PATH)
+            transport = RecordingTransport(transport, self.traffic_archive)
+            html_parser_api_transport = RecordingTransport(httpx.AsyncHTTPTransport(http2=True), self.traffic_archive)
+        elif self.traffic_mode == TRAFFIC_MODE_REPLAY:
+            self.traffic_replay = ReplayTransport(TrafficArchive(TRAFFIC_ARCHIVE_PATH).load(), TRAFFIC_REPLAY_LATENCY_SCALE)
+            transport = self.traffic_replay
+            html_parser_api_transport = self.traffic_replay
+        if self.traffic_mode != TRAFFIC_MODE_LIVE:
+            bt.logging.info(f"Snippet fetcher traffic mode: {self.traffic_mode} ({TRAFFIC_ARCHIVE_PATH})")
+
+        self.cookie_jars = HostCookieJars(
+            max_hosts=COOKIE_JAR_MAX_HOSTS,
+            max_cookies_per_host=COOKIE_JAR_MAX_COOKIES_PER_HOST,
+        )
+        self.client = httpx.AsyncClient(
+            transport=CookieJarTransport(transport, self.cookie_jars),  # Per-host cookie jars for session persistence
+            follow_redirects=True,
+            cookies=refusing_cookie_jar(),
             timeout=REQUEST_TIMEOUT_SECONDS,
         )
-        # self.limiter = AsyncLimiter(max_rate=5, time_period=10.0)  # 10 seconds per 10 seconds
-        self.limiter = asyncio.Semaphore(5) # Max 5 concurrent threads
+        # Per-host fetch scheduling: fair round-robin between hosts under a global cap, and each host's
+        # concurrency adapts to how it responds (backs off on 429/403/timeouts, grows while responses are fast)
+        self.scheduler = HostScheduler(
+            global_limit=FETCH_GLOBAL_CONCURRENCY,
+            initial_host_limit=FETCH_HOST_INITIAL_CONCURRENCY,
+            min_host_limit=FETCH_HOST_MIN_CONCURRENCY,
+            max_host_limit=FETCH_HOST_MAX_CONCURRENCY,
+            slow_latency_secs=FETCH_HOST_SLOW_LATENCY_SECONDS,
+        )
+        # Warm requests send the fetch's browser headers and go through the host scheduler like a fetch
+        self.connection_warmer = ConnectionWarmer(
+            self.client,
+            max_hosts=CONNECTION_WARM_POOL_HOSTS,
+            interval_secs=CONNECTION_WARM_POOL_INTERVAL_SECONDS,
+            headers=lambda url: self._get_browser_headers(url=url),
+            scheduler=self.scheduler,
+        ) if USE_CONNECTION_WARM_POOL else None
+        self._connection_warmer_task = None
 
         # Selenium driver pool for concurrent requests (Selenium WebDriver is NOT thread-safe)
         # Each driver can only handle one request at a time, so we need a pool
-        self._selenium_driver_pool = asyncio.Queue(maxsize=5)  # Pool of up to 5 drivers
-        self._selenium_driver_lock = asyncio.Lock()  # Lock for pool operations
-        self._selenium_drivers_created = 0  # Track how many drivers we've created
-        self._max_selenium_drivers = 5  # Maximum concurrent Selenium drivers
+        # Drivers are pre-warmed at startup, health-checked before use and recycled as Chrome grows
+        self.selenium_pool = SeleniumDriverPool(
+            self._create_selenium_driver,
+            max_drivers=SELENIUM_MAX_DRIVERS,
+            max_pages=SELENIUM_DRIVER_MAX_PAGES,
+            max_rss_mb=SELENIUM_DRIVER_MAX_RSS_MB,
+        )
+        # "light" blocks images/fonts/CSS/media and returns from driver.get at DOMContentLoaded (we only need text)
+        self.selenium_render_profile = SELENIUM_RENDER_PROFILE
+        if self.selenium_render_profile not in SELENIUM_RENDER_PROFILES:
+            bt.logging.warning(
+                f"Unknown SELENIUM_RENDER_PROFILE '{self.selenium_render_profile}', using '{SELENIUM_RENDER_PROFILE_FULL}'"
+            )
+            self.selenium_render_profile = SELENIUM_RENDER_PROFILE_FULL
+        # chromedriver binary, resolved once (ChromeDriverManager().install() checks the network every call)
+        self._chromedriver_path = None
+        self._chromedriver_path_lock = threading.Lock()
+
+        # Page cache + single-flight: miners often cite the same URL (several snippets per page),
+        # so concurrent requests share one fetch and recent pages are served from memory
+        self.page_cache = PageCache(PAGE_CACHE_MAX_BYTES, PAGE_CACHE_TTL_SECONDS) if USE_PAGE_CACHE else None
+        self._single_flight = SingleFlight()
+
+        # On-disk page store so popular pages survive restarts (blocking IO runs in threads)
+        self.page_store = DiskPageStore(
+            PAGE_STORE_DIR,
+            http_ttl_secs=PAGE_STORE_HTTP_TTL_SECONDS,
+            selenium_ttl_secs=PAGE_STORE_SELENIUM_TTL_SECONDS,
+            max_age_secs=PAGE_STORE_MAX_AGE_SECONDS,
+        ) if USE_PAGE_STORE else None
+        self._page_store_pruner_task = None
+        self._background_tasks = set()
+
+        # Permanent redirects are remembered so the next fetch of a moved page skips the redirect hop
+        self.redirect_memory = RedirectMemory(
+            max_entries=REDIRECT_MEMORY_MAX_ENTRIES,
+            ttl_secs=REDIRECT_MEMORY_TTL_SECONDS,
+        ) if USE_URL_CANONICALIZATION else None
+
+        # Popularity prefetch: while no fetch is running, the most-cited pages are refreshed into the page cache
+        self._active_fetches = 0
+        self._last_fetch_at = 0.0
+        self.page_prefetcher = PagePrefetcher(
+            self._prefetch_page,
+            self._page_needs_prefetch,
+            self._is_idle,
+            max_pages=PAGE_PREFETCH_MAX_PAGES,
+            min_citations=PAGE_PREFETCH_MIN_CITATIONS,
+            interval_secs=PAGE_PREFETCH_INTERVAL_SECONDS,
+            max_concurrency=PAGE_PREFETCH_CONCURRENCY,
+            max_bytes_per_interval=PAGE_PREFETCH_MAX_BYTES_PER_INTERVAL,
+        ) if USE_PAGE_PREFETCH and self.page_cache is not None else None
+        self._page_prefetcher_task = None
+
+        # Failure memory + circuit breaker: hosts/URLs that keep failing are not fetched again until a cool-down passes
+        circuit_breaker_mode = CIRCUIT_BREAKER_MODE
+        if circuit_breaker_mode not in CIRCUIT_BREAKER_MODES:
+            bt.logging.warning(
+                f"Unknown CIRCUIT_BREAKER_MODE '{circuit_breaker_mode}', using '{CIRCUIT_BREAKER_MODE_OBSERVE}'"
+            )
+            circuit_breaker_mode = CIRCUIT_BREAKER_MODE_OBSERVE
+        self.host_health = HostHealth(
+            mode=circuit_breaker_mode,
+            host_failure_threshold=CIRCUIT_BREAKER_HOST_FAILURE_THRESHOLD,
+            url_failure_threshold=CIRCUIT_BREAKER_URL_FAILURE_THRESHOLD,
+            base_cooldown_secs=CIRCUIT_BREAKER_BASE_COOLDOWN_SECONDS,
+            max_cooldown_secs=CIRCUIT_BREAKER_MAX_COOLDOWN_SECONDS,
+        )
+
+        # HTML parser API: concurrent renders are micro-batched into one /render_batch call on a keep-alive client
+        self.html_parser_api_client = HtmlParserApiClient(
+            HTML_PARSER_API_URL,
+            max_batch_size=HTML_PARSER_API_BATCH_MAX_SIZE,
+            max_wait_secs=HTML_PARSER_API_BATCH_MAX_WAIT_MS / 1000,
+            max_concurrent_batches=HTML_PARSER_API_MAX_CONCURRENT_BATCHES,
+            timeout_secs=REQUEST_TIMEOUT_SECONDS,
+            # Per URL: a slow page in a batch fails on its own, the others are returned as they finish
+            url_timeout_secs=REQUEST_TIMEOUT_SECONDS,
+            transport=html_parser_api_transport,
+        ) if USE_HTML_PARSER_API and USE_HTML_PARSER_API_BATCHING else None
+
+        # Hedged requests: a second request (other User-Agent) when the first is slower than the host's usual p90
+        self.latency_tracker = HostLatencyTracker(min_samples=HEDGE_MIN_SAMPLES) if USE_HEDGED_REQUESTS else None
+        self.hedge_budget = HedgeBudget(HEDGE_BUDGET_RATIO, HEDGE_BUDGET_BURST) if USE_HEDGED_REQUESTS else None
+
+        # Hosts that always block plain HTTP are learned and sent straight to Selenium
+        self.host_router = HostRouter(
+            selenium_after_blocks=HOST_ROUTING_SELENIUM_AFTER_BLOCKS,
+            reprobe_secs=HOST_ROUTING_REPROBE_SECONDS,
+        ) if USE_HOST_ROUTING else None
+
+        self.html_cleaner_backend = HTML_CLEANER_BACKEND
+        if self.html_cleaner_backend not in HTML_CLEANER_BACKENDS:
+            bt.logging.warning(
+                f"Unknown HTML_CLEANER_BACKEND '{self.html_cleaner_backend}', using '{HTML_CLEANER_BACKEND_BS4}'"
+            )
+            self.html_cleaner_backend = HTML_CLEANER_BACKEND_BS4
+
+        # HTML cleaning runs in worker processes so a large page does not stall the event loop
+        self.html_clean_pool = HtmlCleanPool(
+            max_workers=HTML_CLEAN_POOL_WORKERS,
+            min_pool_bytes=HTML_CLEAN_POOL_MIN_BYTES,
+            backend=self.html_cleaner_backend,
+        ) if USE_HTML_CLEAN_POOL else None
+        if self.html_clean_pool is not None and USE_STREAMING_FETCH and USE_STREAMING_EXTRACTION:
+            bt.logging.warning(
+                "USE_STREAMING_EXTRACTION is on: direct HTTP pages are parsed on the event loop and skip the HTML clean pool"
+            )
 
     def _get_browser_headers(self, url: str = None, referer: str = None) -> dict:
         """
@@ -123,6 +429,13 @@ class SnippetFetcher:
         return headers
 
 
+    def _get_chromedriver_path(self) -> str:
+        with self._chromedriver_path_lock:
+            if self._chromedriver_path is None:
+                self._chromedriver_path = ChromeDriverManager().install()
+                bt.logging.info(f"Resolved chromedriver: {self._chromedriver_path}")
+            return self._chromedriver_path
+
     def _create_selenium_driver(self):
         """
         Create a new Selenium WebDriver with stealth options.
@@ -149,9 +462,10 @@ class SnippetFetcher:
 
             # Disable automation indicators (Strategy: Disable Automation Indicator Flags)
             chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+            # Also adds --disable-features=IsolateOrigins,site-per-process (plus the light profile's switches)
+            apply_render_profile_options(chrome_options, self.selenium_render_profile)
 
-            service = Service(ChromeDriverManager().install())
+            service = Service(self._get_chromedriver_path())
             driver = webdriver.Chrome(service=service, options=chrome_options)
 
             # Remove webdriver property (Strategy: Disable Automation Indicator Flags)
@@ -162,63 +476,49 @@ class SnippetFetcher:
                     });
                 '''
             })
+            apply_render_profile_cdp(driver, self.selenium_render_profile)
 
-            bt.logging.info("Selenium WebDriver created for bot detection fallback")
+            bt.logging.info(f"Selenium WebDriver created for bot detection fallback ({self.selenium_render_profile} profile)")
             return driver
         except Exception as e:
             bt.logging.error(f"Failed to create Selenium WebDriver: {e}")
             return None
 
-    async def _get_selenium_driver_from_pool(self):
-        """
-        Get a Selenium driver from the pool, creating a new one if needed.
-        Thread-safe and handles concurrent requests.
-
-        Returns:
-            Selenium WebDriver instance or None
-        """
-        if not SELENIUM_AVAILABLE:
-            return None
+    async def prewarm_selenium_drivers(self):
+        """Start SELENIUM_PREWARM_DRIVERS drivers ahead of the first 403 (called from validator startup)."""
+        if not SELENIUM_AVAILABLE or USE_HTML_PARSER_API or SELENIUM_PREWARM_DRIVERS <= 0 or self.traffic_replay is not None:
+            return
+        await self.selenium_pool.prewarm(SELENIUM_PREWARM_DRIVERS)
+
+    def start_connection_warmer(self):
+        """Start the warm pool background task (called from validator startup); no-op when disabled."""
+        if (
+            self.connection_warmer is None or USE_HTML_PARSER_API or self._connection_warmer_task is not None
+            or self.traffic_replay is not None
+        ):
+            return
+        self._connection_warmer_task = asyncio.create_task(self.connection_warmer.run())
 
-        async with self._selenium_driver_lock:
-            # Try to get an existing driver from the pool
-            try:
-                driver = self._selenium_driver_pool.get_nowait()
-                return driver
-            except asyncio.QueueEmpty:
-                # No driver available, create a new one if under limit
-                if self._selenium_drivers_created < self._max_selenium_drivers:
-                    driver = await asyncio.to_thread(self._create_selenium_driver)
-                    if driver:
-                        self._selenium_drivers_created += 1
-                        return driver
-                # Pool is full, wait for a driver to become available
-                bt.logging.info("Selenium driver pool exhausted, waiting for available driver")
-                return await self._selenium_driver_pool.get()
-
-    async def _return_selenium_driver_to_pool(self, driver):
-        """
-        Return a Selenium driver to the pool for reuse.
+    def start_page_prefetcher(self):
+        """Start the popularity prefetch background task (called from validator startup); no-op when disabled."""
+        if self.page_prefetcher is None or self._page_prefetcher_task is not None or self.traffic_replay is not None:
+            return
+        self._page_prefetcher_task = asyncio.create_task(self.page_prefetcher.run())
 
-        Args:
-            driver: Selenium WebDriver instance to return
-        """
-        if driver is None:
+    def start_page_store_pruner(self):
+        """Start the page store pruning background task (called from validator startup); no-op when disabled."""
+        if self.page_store is None or self._page_store_pruner_task is not None:
             return
+        self._page_store_pruner_task = asyncio.create_task(self._prune_page_store())
 
-        try:
-            # Clear cookies and cache for reuse
-            driver.delete_all_cookies()
-            await self._selenium_driver_pool.put(driver)
-        except Exception as e:
-            # If pool is full or error occurs, close the driver
-            bt.logging.warning(f"Error returning driver to pool, closing driver: {e}")
+    async def _prune_page_store(self):
+        # Walks the whole store: in a thread on its own schedule, so no fetch ever waits for it
+        while True:
+            await asyncio.sleep(PAGE_STORE_PRUNE_INTERVAL_SECONDS)
             try:
-                driver.quit()
-                async with self._selenium_driver_lock:
-                    self._selenium_drivers_created -= 1
-            except:
-                pass
+                await asyncio.to_thread(self.page_store.prune)
+            except Exception as e:
+                bt.logging.warning(f"Page store: prune failed: {e}")
 
     async def _fetch_with_selenium(self, request_id: str, miner_uid: int, url: str) -> httpx.Response:
         """
@@ -234,14 +534,20 @@ class SnippetFetcher:
         Returns:
             Mock httpx.Response-like object with .text and .status_code
         """
+        if self.traffic_replay is not None:
+            return await self._replay_selenium_page(request_id, miner_uid, url)
+
         if not SELENIUM_AVAILABLE:
             bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Selenium not available for fallback")
             return None
 
         # Get a driver from the pool (waits if pool is exhausted)
-        driver = await self._get_selenium_driver_from_pool()
-        if driver is None:
+        pooled = await self.selenium_pool.acquire()
+        if pooled is None:
             return None
+        driver = pooled.driver
+        if pooled.wait_secs > 1:
+            bt.logging.info(f"{request_id} | {miner_uid} | {url} | Waited {pooled.wait_secs:.2f}s for a Selenium driver")
 
         try:
             bt.logging.info(f"{request_id} | {miner_uid} | {url} | Using Selenium fallback for bot detection")
@@ -254,35 +560,70 @@ class SnippetFetcher:
                 WebDriverWait(driver, 30).until(
                     EC.presence_of_element_located((By.TAG_NAME, "body"))
                 )
-                # Additional wait for JavaScript to execute (Cloudflare challenges)
-                time.sleep(2)
-                return driver.page_source
+                # Wait for JavaScript to finish rendering (and Cloudflare challenges to clear) instead of a fixed sleep;
+                # at the cap the DOM is taken as it stands
+                render = wait_for_render_completion(
+                    driver,
+                    max_wait_secs=SELENIUM_RENDER_MAX_WAIT_SECONDS,
+                    challenge_max_wait_secs=SELENIUM_RENDER_CHALLENGE_MAX_WAIT_SECONDS,
+                    poll_interval_secs=SELENIUM_RENDER_POLL_INTERVAL_SECONDS,
+                    stable_polls=SELENIUM_RENDER_STABLE_POLLS,
+                    network_idle_ms=SELENIUM_RENDER_NETWORK_IDLE_MS,
+                )
+                return driver.page_source, render
 
-            html_content = await asyncio.to_thread(selenium_fetch)
+            selenium_start = time.perf_counter()
+            html_content, render = await asyncio.to_thread(selenium_fetch)
+            selenium_secs = time.perf_counter() - selenium_start
+            bt.logging.info(
+                f"{request_id} | {miner_uid} | {url} | Selenium render wait: {render.reason} after "
+                f"{render.waited_secs:.2f}s ({render.polls} polls, challenge seen: {render.challenge_seen})"
+            )
+            if render.reason == RENDER_REASON_CHALLENGE_TIMEOUT:
+                # Still on the bot-challenge interstitial: its text is not the page (and must not be cached)
+                bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Selenium fallback stuck on a bot challenge page")
+                return None
 
-            # Create a mock response object compatible with httpx.Response
-            class MockResponse:
-                def __init__(self, text, status_code=200):
-                    self.text = text
-                    self.status_code = status_code
-                    self.headers = {}
+            if self.traffic_archive is not None:
+                await self._record_selenium_page(url, html_content, selenium_secs)
 
             bt.logging.success(f"{request_id} | {miner_uid} | {url} | Selenium fallback successful")
-            return MockResponse(html_content, 200)
+            response = MockResponse(html_content, 200)
+            response.selenium_pool_wait_secs = pooled.wait_secs
+            return response
 
         except Exception as e:
             bt.logging.error(f"{request_id} | {miner_uid} | {url} | Selenium fallback failed: {e}")
-            # If driver is broken, don't return it to pool - close it
-            try:
-                driver.quit()
-                async with self._selenium_driver_lock:
-                    self._selenium_drivers_created -= 1
-            except:
-                pass
+            # The driver may be broken (crashed tab, hung renderer): the pool replaces it instead of reusing it
+            pooled.healthy = False
             return None
         finally:
-            # Always return driver to pool for reuse (if still valid)
-            await self._return_selenium_driver_to_pool(driver)
+            await self.selenium_pool.release(pooled)
+
+    async def _record_selenium_page(self, url: str, html_content: str, elapsed_secs: float):
+        entry = ArchivedResponse(
+            method=SELENIUM_METHOD,
+            url=url,
+            request_body_sha1="",
+            status_code=200,
+            headers=[("content-type", "text/html; charset=utf-8")],
+            body=html_content.encode("utf-8", "surrogatepass"),
+            elapsed_secs=elapsed_secs,
+        )
+        try:
+            await asyncio.to_thread(self.traffic_archive.append, entry)
+        except Exception as e:
+            bt.logging.warning(f"Traffic archive: could not record Selenium page {url}: {e}")
+
+    async def _replay_selenium_page(self, request_id: str, miner_uid: int, url: str):
+        entry = self.traffic_replay.next_response(SELENIUM_METHOD, url)
+        if entry is None:
+            bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Selenium page not in traffic archive")
+            return None
+        await self.traffic_replay.wait(entry)
+        response = MockResponse(entry.body.decode("utf-8", "surrogatepass"), entry.status_code)
+        response.selenium_pool_wait_secs = 0.0
+        return response
 
     # Implement async context manager methods
     async def __aenter__(self):
@@ -290,15 +631,21 @@ class SnippetFetcher:
 
     async def __aexit__(self, exc_type, exc, tb):
         print("Snippet fetcher closing")
+        if self._connection_warmer_task is not None:
+            self._connection_warmer_task.cancel()
+        if self._page_prefetcher_task is not None:
+            self._page_prefetcher_task.cancel()
+        if self._page_store_pruner_task is not None:
+            self._page_store_pruner_task.cancel()
         await self.client.aclose()
+        if self.traffic_archive is not None:
+            self.traffic_archive.close()
+        if self.html_parser_api_client is not None:
+            await self.html_parser_api_client.aclose()
+        if self.html_clean_pool is not None:
+            self.html_clean_pool.shutdown()
         # Close all Selenium drivers in the pool
-        while not self._selenium_driver_pool.empty():
-            try:
-                driver = await self._selenium_driver_pool.get()
-                driver.quit()
-            except Exception as e:
-                bt.logging.warning(f"Error closing Selenium driver: {e}")
-        self._selenium_drivers_created = 0
+        await self.selenium_pool.close()
 
     async def send_get_request(
         self, request_id: str, miner_uid: int, endpoint: str, headers: dict = None, referer: str = None
@@ -326,17 +673,33 @@ class SnippetFetcher:
         if headers:
             browser_headers.update(headers)
 
+        if self.connection_warmer is not None:
+            self.connection_warmer.record(endpoint)
+
+        # Filled in by the network backend when this request has to open a new connection
+        connection_timing = ConnectionTiming()
+        timing_token = current_connection_timing.set(connection_timing)
         try:
             bt.logging.info(
                 f"{request_id} | {miner_uid} | {endpoint} | Sending request"
             )
 
             # Strategy: Use Cookies - cookies are automatically managed by httpx.Cookies()
-            response = await self.client.get(
-                endpoint,
-                timeout=REQUEST_TIMEOUT_SECONDS,
-                headers=browser_headers
-            )
+            try:
+                if USE_STREAMING_FETCH:
+                    response = await self._stream_get(request_id, miner_uid, endpoint, browser_headers)
+                else:
+                    response = await self.client.get(
+                        endpoint,
+                        timeout=REQUEST_TIMEOUT_SECONDS,
+                        headers=browser_headers
+                    )
+                    self._resolve_response_charset(response, response.content[:DETECT_BYTES])
+            finally:
+                current_connection_timing.reset(timing_token)
+            response.connection_timing = connection_timing
+            if self.redirect_memory is not None and response.history:
+                self.redirect_memory.record_history(response.history, str(response.url))
 
             duration = time.perf_counter() - start
 
@@ -346,7 +709,7 @@ class SnippetFetcher:
                     f"{request_id} | {miner_uid} | {endpoint} | "
                     f"403 Forbidden - Possible bot detection | {duration:.4f} seconds"
                 )
-                # Mark response for Selenium fallback (will be handled outside semaphore)
+                # Mark response for Selenium fallback (will be handled outside the host slot)
                 response._needs_selenium_fallback = True
             elif response.status_code == 429:
                 bt.logging.warning(
@@ -394,6 +757,132 @@ class SnippetFetcher:
             )
             return None
 
+    @staticmethod
+    def _is_html_content_type(content_type: str) -> bool:
+        """Missing Content-Type is given the benefit of the doubt (many servers omit it for HTML)."""
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return not media_type or media_type in HTML_CONTENT_TYPES
+
+    @staticmethod
+    def _resolve_response_charset(response: httpx.Response, prefix: bytes):
+        """
+        Decide how the body is decoded from its first bytes (BOM, HTTP charset, <meta charset>, bounded detection)
+        instead of httpx's utf-8 default, which turns pages labelled only in <meta> into mojibake.
+        Sets response.encoding (so .text agrees) and response.charset_source.
+        """
+        encoding, source = resolve_charset(response.headers.get("content-type"), prefix)
+        response.encoding = encoding
+        response.charset_source = source
+
+    async def _stream_get(self, request_id: str, miner_uid: int, endpoint: str, headers: dict) -> httpx.Response:
+        """
+        GET that never holds more than FETCH_MAX_BYTES of (decoded) body in memory.
+        Content-Type is checked before reading: non-HTML 200 responses are not downloaded and get .skipped_reason.
+        Bodies over the budget are cut at FETCH_MAX_BYTES and get .truncated = True.
+        With USE_STREAMING_EXTRACTION, 200 bodies are also parsed to text chunk by chunk as they arrive:
+        .extracted_text holds the clean_html-equivalent text (None if not extracted) and .extraction_secs
+        the parsing time.
+
+        Returns:
+            A fully read httpx.Response (usable like the one from client.get)
+        """
+        truncated = False
+        skipped_reason = None
+        chunks = []
+        extractor = None
+        extracted_text = None
+        extraction_secs = 0.0
+        charset = None
+        decoder = None
+
+        async with self.client.stream(
+            "GET", endpoint, timeout=REQUEST_TIMEOUT_SECONDS, headers=headers
+        ) as response:
+            content_type = response.headers.get("content-type", "")
+            if response.status_code == 200 and not self._is_html_content_type(content_type):
+                skipped_reason = f"non-HTML content type '{content_type}'"
+            else:
+                content_length = response.headers.get("content-length", "")
+                if content_length.isdigit() and int(content_length) > FETCH_MAX_BYTES:
+                    bt.logging.warning(
+                        f"{request_id} | {miner_uid} | {endpoint} | "
+                        f"Content-Length {content_length} exceeds {FETCH_MAX_BYTES} bytes, reading the first {FETCH_MAX_BYTES} only"
+                    )
+
+                if USE_STREAMING_EXTRACTION and response.status_code == 200:
+                    extractor = StreamingTextExtractor()
+
+                received = 0
+                async for chunk in response.aiter_bytes():
+                    remaining = FETCH_MAX_BYTES - received
+                    if len(chunk) > remaining:
+                        chunk = chunk[:remaining]
+                        truncated = True
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if charset is None:
+                        # Held back until the first bytes decide the charset (at most DETECT_BYTES)
+                        charset = resolve_charset(content_type, b"".join(chunks), final=False)
+                        chunk = b"".join(chunks) if charset is not None else b""
+                    if extractor is not None and chunk:
+                        extraction_start = time.perf_counter()
+                        try:
+                            if decoder is None:
+                                # Same decoding as response.text, so the text matches clean_html(response.text)
+                                decoder = codecs.getincrementaldecoder(charset[0])(errors="replace")
+                            extractor.feed(decoder.decode(chunk))
+                        except Exception as e:
+                            bt.logging.warning(
+                                f"{request_id} | {miner_uid} | {endpoint} | Streaming extraction failed, falling back to clean_html: {e}"
+                            )
+                            extractor = None
+                        extraction_secs += time.perf_counter() - extraction_start
+                    if truncated:
+                        break
+
+                pending = b""
+                if charset is None:
+                    # Short or truncated body: decide from whatever arrived
+                    pending = b"".join(chunks)
+                    charset = resolve_charset(content_type, pending)
+                if extractor is not None:
+                    extraction_start = time.perf_counter()
+                    try:
+                        if decoder is None:
+                            decoder = codecs.getincrementaldecoder(charset[0])(errors="replace")
+                        extractor.feed(decoder.decode(pending, final=True))
+                        extracted_text = extractor.close()
+                    except Exception as e:
+                        bt.logging.warning(
+                            f"{request_id} | {miner_uid} | {endpoint} | Streaming extraction failed, falling back to clean_html: {e}"
+                        )
+                    extraction_secs += time.perf_counter() - extraction_start
+
+            capped = httpx.Response(
+                response.status_code,
+                headers=[
+                    (name, value) for name, value in response.headers.multi_items()
+                    if name.lower() not in STREAMED_BODY_HEADERS
+                ],
+                content=b"".join(chunks),
+                request=response.request,
+                extensions=response.extensions,
+            )
+
+        # Redirects followed on the way (for the redirect memory)
+        capped.history = response.history
+        if charset is not None:
+            capped.encoding, capped.charset_source = charset
+        capped.truncated = truncated
+        capped.skipped_reason = skipped_reason
+        capped.extracted_text = extracted_text
+        capped.extraction_secs = extraction_secs
+        if truncated:
+            bt.logging.warning(
+                f"{request_id} | {miner_uid} | {endpoint} | Body truncated at {FETCH_MAX_BYTES} bytes"
+            )
+        return capped
+
     async def send_html_parser_api_request(
         self, request_id: str, miner_uid: int, endpoint: str, headers: dict = None
     ):
@@ -402,14 +891,19 @@ class SnippetFetcher:
             bt.logging.info(
                 f"{request_id} | {miner_uid} | {endpoint} | Snippet Fetcher: Sending request"
             )
-            request = {
-                "url" : endpoint
-            }
-            response = await self.client.post(
-                f"{HTML_PARSER_API_URL}/render",
-                json=request,
-                timeout=REQUEST_TIMEOUT_SECONDS
-            )
+            if self.html_parser_api_client is not None:
+                response = await self.html_parser_api_client.render(endpoint)
+                if response is None:
+                    raise RuntimeError("HTML parser API batch request failed")
+            else:
+                request = {
+                    "url" : endpoint
+                }
+                response = await self.client.post(
+                    f"{HTML_PARSER_API_URL}/render",
+                    json=request,
+                    timeout=REQUEST_TIMEOUT_SECONDS
+                )
 
             duration = time.perf_counter() - start
 
@@ -427,7 +921,7 @@ class SnippetFetcher:
     async def render_page(self, request_id: str, miner_uid: int, endpoint: str, headers: dict = None, referer: str = None):
         """
         Render a webpage with anti-bot detection measures.
-        Semaphore limits HTTP requests only - Selenium has its own concurrency control (driver pool).
+        The host scheduler limits HTTP requests only - Selenium has its own concurrency control (driver pool).
 
         Args:
             request_id: Request identifier for logging
@@ -439,14 +933,18 @@ class SnippetFetcher:
         Returns:
             httpx.Response if successful, None if failed
         """
+        host = urlparse(endpoint).hostname or ""
         bt.logging.info(
-            f"{request_id} | {miner_uid} | {endpoint} | Snippet Fetcher: Rendering page - waiting for semaphore"
+            f"{request_id} | {miner_uid} | {endpoint} | Snippet Fetcher: Rendering page - waiting for host slot ({host})"
         )
 
         if USE_HTML_PARSER_API:
-            async with self.limiter:
+            # Scheduled by the target host as well: the parser API fetches the page on our behalf,
+            # so its 429s/slow responses still reflect how hard we are hitting that site
+            async with self.scheduler.slot(host) as slot:
                 http_start = time.perf_counter()
                 resp = await self.send_html_parser_api_request(request_id, miner_uid, endpoint, headers)
+                slot.record(resp.status_code if resp is not None else None, time.perf_counter() - http_start)
                 if resp is not None:
                     resp.http_time_secs = time.perf_counter() - http_start
                     resp.selenium_time_secs = "NA"
@@ -454,24 +952,37 @@ class SnippetFetcher:
                     resp.selenium_status = SNIPPET_FETCHER_STATUS_NOT_RUN
                 return resp
         else:
-            # Semaphore limits HTTP requests (fast, ~milliseconds)
-            # Selenium fallback happens outside semaphore since it has its own pool limit
-            # Time only the request (inside semaphore), not the wait - matches USE_HTML_PARSER_API path
-            async with self.limiter:
+            if (self.host_router is not None and SELENIUM_AVAILABLE and
+                    self.host_router.route(route_key(endpoint)) == HOST_ROUTE_SELENIUM):
+                selenium_response = await self._render_with_selenium_first(request_id, miner_uid, endpoint)
+                if selenium_response is not None:
+                    return selenium_response
+                # Direct Selenium failed: the host is back on HTTP-first, try the normal path below
+
+            # The scheduler limits HTTP requests (fast, ~milliseconds)
+            # Selenium fallback happens outside the host slot since it has its own pool limit
+            # Time only the request (inside the slot), not the wait - matches USE_HTML_PARSER_API path
+            async with self.scheduler.slot(host) as slot:
                 bt.logging.info(
-                    f"{request_id} | {miner_uid} | {endpoint} | Snippet Fetcher: Rendering page - fetching snippet - passed semaphore"
+                    f"{request_id} | {miner_uid} | {endpoint} | Snippet Fetcher: Rendering page - fetching snippet - got host slot"
                 )
                 http_start = time.perf_counter()
-                response = await self.send_get_request(request_id, miner_uid, endpoint, headers, referer=referer)
+                if self.hedge_budget is not None:
+                    response = await self._send_hedged_get_request(request_id, miner_uid, host, endpoint, headers, referer)
+                else:
+                    response = await self.send_get_request(request_id, miner_uid, endpoint, headers, referer=referer)
                 http_time_secs = time.perf_counter() - http_start if response is not None else "NA"
+                slot.record(response.status_code if response is not None else None, time.perf_counter() - http_start)
 
             if response is not None:
                 response.http_time_secs = http_time_secs if isinstance(http_time_secs, (int, float)) else "NA"
                 response.selenium_time_secs = "NA"
                 response.http_status = SNIPPET_FETCHER_STATUS_OK if response.status_code == 200 else SNIPPET_FETCHER_STATUS_ERROR
                 response.selenium_status = SNIPPET_FETCHER_STATUS_NOT_RUN
+                if getattr(response, "skipped_reason", None):
+                    response.http_status = SNIPPET_FETCHER_STATUS_SKIPPED
 
-            # Check if Selenium fallback is needed (outside semaphore context)
+            # Check if Selenium fallback is needed (outside the host slot)
             # This allows other HTTP requests to proceed while Selenium runs
             if (response is not None and
                 response.status_code == 403 and
@@ -481,7 +992,7 @@ class SnippetFetcher:
 
                 bt.logging.info(
                     f"{request_id} | {miner_uid} | {endpoint} | "
-                    f"Attempting Selenium fallback for 403 response (outside HTTP semaphore)"
+                    f"Attempting Selenium fallback for 403 response (outside HTTP host slot)"
                 )
                 selenium_start = time.perf_counter()
                 selenium_response = await self._fetch_with_selenium(request_id, miner_uid, endpoint)
@@ -489,9 +1000,12 @@ class SnippetFetcher:
 
                 if selenium_response and selenium_response.status_code == 200:
                     selenium_response.http_time_secs = response.http_time_secs
+                    selenium_response.connection_timing = getattr(response, "connection_timing", None)
                     selenium_response.selenium_time_secs = selenium_time_secs if isinstance(selenium_time_secs, (int, float)) else "NA"
                     selenium_response.http_status = SNIPPET_FETCHER_STATUS_ERROR  # HTTP got 403
                     selenium_response.selenium_status = SNIPPET_FETCHER_STATUS_OK
+                    if self.host_router is not None:
+                        self.host_router.record_http(route_key(endpoint), 403, selenium_ok=True)
                     return selenium_response
                 else:
                     bt.logging.warning(
@@ -502,21 +1016,101 @@ class SnippetFetcher:
                     response.http_status = SNIPPET_FETCHER_STATUS_ERROR  # HTTP already failed (403); keep explicit when Selenium fails
                     response.selenium_status = SNIPPET_FETCHER_STATUS_ERROR  # Selenium was tried and failed
 
+            if self.host_router is not None:
+                selenium_ok = False if response is not None and response.selenium_status == SNIPPET_FETCHER_STATUS_ERROR else None
+                self.host_router.record_http(
+                    route_key(endpoint), response.status_code if response is not None else None, selenium_ok
+                )
             return response
 
-    async def clean_html(
-        self, request_id: str, miner_uid: int, url: str, html: str
-    ) -> str:
-        bt.logging.info(f"{request_id} | {miner_uid} | {url} | Cleaning html")
-        soup = BeautifulSoup(html, "lxml")  # 5-10x faster than html.parser
+    async def _timed_get_request(self, request_id, miner_uid, host, endpoint, headers, referer):
+        start = time.perf_counter()
+        response = await self.send_get_request(request_id, miner_uid, endpoint, headers, referer=referer)
+        if response is not None:
+            self.latency_tracker.record(host, time.perf_counter() - start)
+        return response
 
-        bt.logging.info(f"{request_id} | {miner_uid} | {url} | Decomposing  html")
+    async def _send_hedged_get_request(
+        self, request_id: str, miner_uid: int, host: str, endpoint: str, headers: dict = None, referer: str = None
+    ):
+        """
+        send_get_request with hedging: if no response arrives within the host's HEDGE_LATENCY_PERCENTILE latency
+        (needs HEDGE_MIN_SAMPLES of history) and the global hedge budget allows, a second request with a different
+        User-Agent is sent; the first 200 wins and the other request is cancelled.
+        """
+        self.hedge_budget.on_request()
+        primary_user_agent, hedge_user_agent = random.sample(USER_AGENTS, 2)
+        primary = asyncio.ensure_future(self._timed_get_request(
+            request_id, miner_uid, host, endpoint, {**(headers or {}), "User-Agent": primary_user_agent}, referer
+        ))
+        pending = {primary}
+        try:
+            delay = self.latency_tracker.percentile(host, HEDGE_LATENCY_PERCENTILE)
+            if delay is None:
+                return await primary
 
-        # Single-pass removal using CSS selectors
-        for tag in soup.select("script, iframe, ins, aside, noscript"):
-            tag.decompose()
+            done, _ = await asyncio.wait({primary}, timeout=max(delay, HEDGE_MIN_DELAY_SECONDS))
+            if done or not self.hedge_budget.try_spend():
+                return await primary
+
+            bt.logging.info(
+                f"{request_id} | {miner_uid} | {endpoint} | No response after p{HEDGE_LATENCY_PERCENTILE:g} "
+                f"({delay:.2f}s) for {host}, sending hedged request"
+            )
+            hedge = asyncio.ensure_future(self._timed_get_request(
+                request_id, miner_uid, host, endpoint, {**(headers or {}), "User-Agent": hedge_user_agent}, referer
+            ))
+            pending = {primary, hedge}
+            fallback = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    response = task.result()
+                    if response is not None and response.status_code == 200:
+                        if task is hedge:
+                            self.hedge_budget.hedge_wins += 1
+                            bt.logging.info(f"{request_id} | {miner_uid} | {endpoint} | Hedged request won")
+                        return response
+                    # Neither succeeded (yet): keep a failed response to return, preferring the primary's
+                    if response is not None and (fallback is None or task is primary):
+                        fallback = response
+            return fallback
+        finally:
+            # The losing request (or both, if the caller was cancelled) is abandoned
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    async def _render_with_selenium_first(self, request_id: str, miner_uid: int, endpoint: str):
+        """Selenium fetch for a host the router knows blocks plain HTTP (no HTTP attempt, no host slot)."""
+        host = urlparse(endpoint).hostname or ""
+        bt.logging.info(
+            f"{request_id} | {miner_uid} | {endpoint} | Host routing: {host} blocks plain HTTP, fetching with Selenium directly"
+        )
+        selenium_start = time.perf_counter()
+        selenium_response = await self._fetch_with_selenium(request_id, miner_uid, endpoint)
+        ok = selenium_response is not None and selenium_response.status_code == 200
+        self.host_router.record_selenium(route_key(endpoint), ok)
+        if not ok:
+            return None
+        selenium_response.http_time_secs = "NA"
+        selenium_response.selenium_time_secs = time.perf_counter() - selenium_start
+        selenium_response.http_status = SNIPPET_FETCHER_STATUS_NOT_RUN
+        selenium_response.selenium_status = SNIPPET_FETCHER_STATUS_OK
+        return selenium_response
+
+    async def clean_html(
+        self, request_id: str, miner_uid: int, url: str, html: str | bytes, encoding: str | None = None
+    ) -> CleanHtmlResult:
+        """html is page text, or the raw HTTP body with its resolved charset (decoded off the event loop)."""
+        bt.logging.info(f"{request_id} | {miner_uid} | {url} | Cleaning html")
+        if self.html_clean_pool is not None:
+            return await self.html_clean_pool.clean(html, encoding)
 
-        return await asyncio.to_thread(soup.getText, separator=" ", strip=True)
+        # Pool disabled: the whole decode/parse/decompose/getText step still runs off the event-loop thread
+        parse_start = time.perf_counter()
+        text = await asyncio.to_thread(clean_html_page, html, self.html_cleaner_backend, encoding)
+        return CleanHtmlResult(text, 0.0, time.perf_counter() - parse_start, in_pool=False)
 
     def _time_to_float(self, x) -> float:
         """Convert time value to float; return -1 if NA or not a number."""
@@ -526,20 +1120,198 @@ class SnippetFetcher:
             return float(x)
         return -1.0
 
+    def _page_cache_key(self, url: str) -> str:
+        """
+        Key for the page cache, page store and single-flight: the canonical URL (http/https and tracking parameters
+        share one key; AMP and trailing-slash variants do not), or just the URL without its fragment when disabled.
+        """
+        if USE_URL_CANONICALIZATION:
+            return canonicalize_url(url)
+        return urldefrag(url).url
+
     async def fetch_entire_page(
         self, request_id: str, miner_uid: int, url: str
     ) -> FetchPageResult:
         """
         Pull the final rendered HTML (post-JS) using http request.
+        Served from the page cache when possible; concurrent calls for the same URL share one fetch.
         Returns FetchPageResult (cleaned_html, fetch_by_* times, cleaning_html_time_secs, fetch_by_* status).
         """
+        # A page known to have moved permanently is fetched (and cached) at its new address
+        if self.redirect_memory is not None:
+            resolved_url = self.redirect_memory.resolve(url)
+            if resolved_url != url:
+                bt.logging.info(f"{request_id} | {miner_uid} | {url} | Permanently redirected to {resolved_url}")
+                url = resolved_url
+
+        key = self._page_cache_key(url)
+        if self.page_prefetcher is not None:
+            self.page_prefetcher.record(key, url)
+        if self.page_cache is not None:
+            cached = self.page_cache.get(key)
+            if cached is not None:
+                bt.logging.info(f"{request_id} | {miner_uid} | {url} | Page cache hit")
+                return as_cache_hit(cached)
+
+        if self._single_flight.is_in_flight(key):
+            bt.logging.info(f"{request_id} | {miner_uid} | {url} | Joining in-flight fetch for the same url")
+
+        self._active_fetches += 1
+        try:
+            result = await self._single_flight.run(
+                key, lambda: self._fetch_and_cache_page(request_id, miner_uid, url, key)
+            )
+        finally:
+            self._active_fetches -= 1
+            self._last_fetch_at = time.monotonic()
+        # Each caller gets its own copy so the cached instance is never mutated
+        return dataclasses.replace(result)
+
+    def _is_idle(self) -> bool:
+        """No validation fetch running or finished within the last PAGE_PREFETCH_IDLE_SECONDS."""
+        return self._active_fetches == 0 and time.monotonic() - self._last_fetch_at >= PAGE_PREFETCH_IDLE_SECONDS
+
+    def _page_needs_prefetch(self, key: str) -> bool:
+        """Not cached, or expiring before the next prefetch round could refresh it."""
+        remaining = self.page_cache.ttl_remaining(key)
+        return remaining is None or remaining < PAGE_PREFETCH_INTERVAL_SECONDS * 2
+
+    async def _prefetch_page(self, url: str) -> int:
+        """Background refresh of one page into the page cache; returns the bytes downloaded."""
+        key = self._page_cache_key(url)
+        if self._single_flight.is_in_flight(key):
+            return 0
+        result = await self._single_flight.run(
+            key, lambda: self._fetch_and_cache_page("prefetch", -1, url, key)
+        )
+        return max(0, result.page_bytes)
+
+    async def _fetch_and_cache_page(
+        self, request_id: str, miner_uid: int, url: str, key: str
+    ) -> FetchPageResult:
+        result = await self._fetch_and_clean_page(request_id, miner_uid, url, key)
+        if self.page_cache is not None:
+            self.page_cache.put(key, result)
+            # Redirected this time: the final URL gets the page too (the cache stores the text once)
+            if self.redirect_memory is not None:
+                final_key = self._page_cache_key(self.redirect_memory.resolve(url))
+                if final_key != key:
+                    self.page_cache.put(final_key, result)
+        return result
+
+    def _run_in_background(self, coro):
+        """Fire-and-forget work that must not hold up the caller; keeps a reference until it finishes."""
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _load_stored_page(self, request_id: str, miner_uid: int, url: str, key: str) -> StoredPage | None:
+        if self.page_store is None:
+            return None
+        try:
+            return await asyncio.to_thread(self.page_store.load, key)
+        except Exception as e:
+            bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Page store lookup failed: {e}")
+            return None
+
+    async def _read_stored_body(self, request_id: str, miner_uid: int, url: str, stored: StoredPage) -> str | None:
+        try:
+            return await asyncio.to_thread(self.page_store.read_body, stored)
+        except Exception as e:
+            bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Page store read failed: {e}")
+            return None
+
+    async def _save_page(self, request_id: str, miner_uid: int, url: str, key: str, response, backend: str):
+        try:
+            headers = getattr(response, "headers", None) or {}
+            etag, last_modified = headers.get("etag", ""), headers.get("last-modified", "")
+            # response.text decodes the whole body: do that in the worker thread too
+            await asyncio.to_thread(
+                lambda: self.page_store.save(key, response.text, backend, etag, last_modified)
+            )
+        except Exception as e:
+            bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Page store save failed: {e}")
+
+    async def _mark_revalidated(self, request_id: str, miner_uid: int, url: str, stored: StoredPage):
+        try:
+            await asyncio.to_thread(self.page_store.mark_revalidated, stored)
+        except Exception as e:
+            bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Page store revalidation update failed: {e}")
+
+    @staticmethod
+    def _stored_page_statuses(stored: StoredPage) -> tuple[float, float, str, str]:
+        """(http_time, selenium_time, http_status, selenium_status) for a page served from the store without a fetch."""
+        if stored.backend == PAGE_STORE_BACKEND_SELENIUM:
+            return -1.0, 0.0, SNIPPET_FETCHER_STATUS_NOT_RUN, SNIPPET_FETCHER_STATUS_OK
+        return 0.0, -1.0, SNIPPET_FETCHER_STATUS_OK, SNIPPET_FETCHER_STATUS_NOT_RUN
+
+    def _page_store_backend(self, response) -> str:
+        if USE_HTML_PARSER_API:
+            return PAGE_STORE_BACKEND_HTML_PARSER_API
+        if getattr(response, "selenium_status", SNIPPET_FETCHER_STATUS_NOT_RUN) == SNIPPET_FETCHER_STATUS_OK:
+            return PAGE_STORE_BACKEND_SELENIUM
+        return PAGE_STORE_BACKEND_HTTP
+
+    async def _fetch_and_clean_page(
+        self, request_id: str, miner_uid: int, url: str, key: str
+    ) -> FetchPageResult:
+        """Fetch the page (page store, HTTP, Selenium fallback or HTML parser API) and clean it. No in-memory caching."""
         bt.logging.info(f"{request_id} | {miner_uid} | {url} | Fetching entire page")
         try:
             start = time.perf_counter()
 
+            # Fresh copy on disk: no network round trip at all
+            stored = await self._load_stored_page(request_id, miner_uid, url, key)
+            if stored is not None and stored.is_fresh():
+                html = await self._read_stored_body(request_id, miner_uid, url, stored)
+                if html is not None:
+                    bt.logging.info(f"{request_id} | {miner_uid} | {url} | Serving page from page store ({stored.backend})")
+                    http_time_secs, selenium_time_secs, http_status, selenium_status = self._stored_page_statuses(stored)
+                    return await self._clean_fetched_page(
+                        request_id, miner_uid, url, html, start,
+                        http_time_secs, selenium_time_secs, http_status, selenium_status,
+                        from_page_store=True,
+                    )
+
+            # Stale copy with validators: ask the server whether it changed
+            conditional_headers = None
+            if stored is not None and stored.backend == PAGE_STORE_BACKEND_HTTP:
+                conditional_headers = stored.conditional_headers() or None
+
+            # Host or URL kept failing recently: do not spend another timeout / Selenium attempt on it
+            circuit_reason = self.host_health.check(url)
+            if circuit_reason is not None:
+                bt.logging.warning(f"{request_id} | {miner_uid} | {url} | Not fetching: {circuit_reason}")
+                return FetchPageResult(fetch_by_http_status=SNIPPET_FETCHER_STATUS_CIRCUIT_OPEN)
+
             response = await self.render_page(
-                request_id, miner_uid, url
+                request_id, miner_uid, url, headers=conditional_headers
             )
+            self.host_health.record(url, response.status_code if response is not None else None)
+
+            if response is not None and response.status_code == 304 and conditional_headers:
+                html = await self._read_stored_body(request_id, miner_uid, url, stored)
+                if html is not None:
+                    bt.logging.info(f"{request_id} | {miner_uid} | {url} | 304 Not Modified - reusing page store body")
+                    self._run_in_background(self._mark_revalidated(request_id, miner_uid, url, stored))
+                    return await self._clean_fetched_page(
+                        request_id, miner_uid, url, html, start,
+                        self._time_to_float(getattr(response, "http_time_secs", "NA")),
+                        -1.0,
+                        SNIPPET_FETCHER_STATUS_OK,
+                        SNIPPET_FETCHER_STATUS_NOT_RUN,
+                        from_page_store=True,
+                    )
+
+            if response is not None and getattr(response, "skipped_reason", None):
+                bt.logging.warning(
+                    f"{request_id} | {miner_uid} | {url} | Skipping page: {response.skipped_reason}"
+                )
+                return FetchPageResult(
+                    fetch_by_http_time_secs=self._time_to_float(getattr(response, "http_time_secs", "NA")),
+                    fetch_by_http_status=SNIPPET_FETCHER_STATUS_SKIPPED,
+                )
 
             if response is None or response.status_code != 200:
                 bt.logging.error(f"{request_id} | {miner_uid} | {url} | Error occurred | Returning empty html : {response}")
@@ -556,28 +1328,31 @@ class SnippetFetcher:
                     )
                 return FetchPageResult(fetch_by_http_status=SNIPPET_FETCHER_STATUS_ERROR)
 
-            http_time_secs = getattr(response, "http_time_secs", "NA")
-            selenium_time_secs = getattr(response, "selenium_time_secs", "NA")
-            http_status = getattr(response, "http_status", SNIPPET_FETCHER_STATUS_ERROR)
-            selenium_status = getattr(response, "selenium_status", SNIPPET_FETCHER_STATUS_NOT_RUN)
-
-            cleaning_start = time.perf_counter()
-            cleaned_html: str = await self.clean_html(
-                request_id, miner_uid, url, response.text
-            )
-            cleaning_html_time_secs = time.perf_counter() - cleaning_start
+            truncated = getattr(response, "truncated", False)
+            # Truncated bodies are not stored: a later hit could not tell they were cut short
+            if self.page_store is not None and not truncated:
+                self._run_in_background(
+                    self._save_page(request_id, miner_uid, url, key, response, self._page_store_backend(response))
+                )
 
-            duration = time.perf_counter() - start
-            bt.logging.info(
-                f"{request_id} | {miner_uid} | {url} | Fetched html | {duration:.4f} seconds"
-            )
-            return FetchPageResult(
-                cleaned_html=cleaned_html,
-                fetch_by_http_time_secs=self._time_to_float(http_time_secs),
-                fetch_by_selenium_time_secs=self._time_to_float(selenium_time_secs),
-                cleaning_html_time_secs=cleaning_html_time_secs,
-                fetch_by_http_status=http_status,
-                fetch_by_selenium_status=selenium_status,
+            # Direct HTTP responses hand over the raw body and its charset; the cleaner decodes it off the event loop
+            if isinstance(response, httpx.Response):
+                html, encoding = response.content, response.encoding
+            else:
+                html, encoding = response.text, None
+            return await self._clean_fetched_page(
+                request_id, miner_uid, url, html, start,
+                self._time_to_float(getattr(response, "http_time_secs", "NA")),
+                self._time_to_float(getattr(response, "selenium_time_secs", "NA")),
+                getattr(response, "http_status", SNIPPET_FETCHER_STATUS_ERROR),
+                getattr(response, "selenium_status", SNIPPET_FETCHER_STATUS_NOT_RUN),
+                truncated=truncated,
+                selenium_pool_wait_secs=getattr(response, "selenium_pool_wait_secs", -1.0),
+                connection_timing=getattr(response, "connection_timing", None),
+                # Only the direct HTTP response carries streamed text; a Selenium fallback page is cleaned as usual
+                extracted_text=getattr(response, "extracted_text", None),
+                extraction_secs=getattr(response, "extraction_secs", 0.0),
+                encoding=encoding,
             )
         except Exception as e:
             bt.logging.error(
@@ -585,6 +1360,67 @@ class SnippetFetcher:
             )
             return FetchPageResult(fetch_by_http_status=SNIPPET_FETCHER_STATUS_ERROR)
 
+    async def _clean_fetched_page(
+        self,
+        request_id: str,
+        miner_uid: int,
+        url: str,
+        html: str | bytes,
+        start: float,
+        http_time_secs: float,
+        selenium_time_secs: float,
+        http_status: str,
+        selenium_status: str,
+        from_page_store: bool = False,
+        truncated: bool = False,
+        extracted_text: str | None = None,
+        extraction_secs: float = 0.0,
+        selenium_pool_wait_secs: float = -1.0,
+        connection_timing: ConnectionTiming | None = None,
+        encoding: str | None = None,
+    ) -> FetchPageResult:
+        if extracted_text is not None:
+            # Text was already extracted while the body streamed in; report the parsing time spent on it
+            cleaned_html = extracted_text
+            cleaning_html_time_secs = extraction_secs
+            cleaning_html_queue_wait_secs = 0.0
+            cleaning_html_parse_secs = extraction_secs
+        else:
+            cleaning_start = time.perf_counter()
+            cleaned = await self.clean_html(
+                request_id, miner_uid, url, html, encoding
+            )
+            cleaned_html = cleaned.text
+            cleaning_html_time_secs = time.perf_counter() - cleaning_start
+            cleaning_html_queue_wait_secs = cleaned.queue_wait_secs
+            cleaning_html_parse_secs = cleaned.parse_secs
+            bt.logging.info(
+                f"{request_id} | {miner_uid} | {url} | Cleaned html {'in pool' if cleaned.in_pool else 'in thread'} | "
+                f"wait {cleaning_html_queue_wait_secs:.4f}s parse {cleaning_html_parse_secs:.4f}s total {cleaning_html_time_secs:.4f}s"
+            )
+
+        duration = time.perf_counter() - start
+        bt.logging.info(
+            f"{request_id} | {miner_uid} | {url} | Fetched html | {duration:.4f} seconds"
+        )
+        return FetchPageResult(
+            cleaned_html=cleaned_html,
+            fetch_by_http_time_secs=http_time_secs,
+            fetch_by_selenium_time_secs=selenium_time_secs,
+            cleaning_html_time_secs=cleaning_html_time_secs,
+            cleaning_html_queue_wait_secs=cleaning_html_queue_wait_secs,
+            cleaning_html_parse_secs=cleaning_html_parse_secs,
+            fetch_by_http_status=http_status,
+            fetch_by_selenium_status=selenium_status,
+            from_page_store=from_page_store,
+            truncated=truncated,
+            selenium_pool_wait_secs=selenium_pool_wait_secs,
+            http_dns_secs=connection_timing.dns_secs if connection_timing is not None else -1.0,
+            http_connect_secs=connection_timing.connect_secs if connection_timing is not None else -1.0,
+            http_tls_secs=connection_timing.tls_secs if connection_timing is not None else -1.0,
+            page_bytes=-1 if from_page_store else len(html),
+        )
+
 
 snippet_fetcher = SnippetFetcher()
 
@@ -594,7 +1430,3 @@ async def fetch_entire_page(
 ) -> FetchPageResult:
     """Returns FetchPageResult (cleaned_html, fetch_by_* times, cleaning_html_time_secs, fetch_by_* status)."""
     return await snippet_fetcher.fetch_entire_page(request_id, miner_uid, url)
-
-
-
-
@@ -0,0 +1,180 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Sequence
+
+# python-Levenshtein required: without it, fuzz.partial_ratio uses a buggy pure-Python path
+# that returns wrong low scores for short-vs-long (snippet vs page).
+from fuzzywuzzy import fuzz
+
+from validator.text_normalizer import normalize_page_text
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Fewer distinct snippets than this are looked up with str.find: building the automaton is not worth it
+AHOCORASICK_MIN_SNIPPETS = 3
+
+
+@dataclass
+class SnippetMatch:
+    found: bool
+    exact: bool = False
+    ratio: float | None = None  # fuzzy ratio in [0, 1] when the fuzzy fallback ran
+
+
+def find_exact_matches(page: str, snippets: Sequence[str]) -> list[bool]:
+    """
+    snippet in page for every snippet. With pyahocorasick and enough distinct snippets, one automaton over the
+    snippets finds them all in a single scan of the page (stopping once every snippet has been seen); otherwise one
+    str.find per distinct snippet.
+    """
+    distinct = {snippet for snippet in snippets if snippet}
+    if AHOCORASICK_AVAILABLE and len(distinct) >= AHOCORASICK_MIN_SNIPPETS:
+        automaton = ahocorasick.Automaton()
+        for snippet in distinct:
+            automaton.add_word(snippet, snippet)
+        automaton.make_automaton()
+        found = set()
+        for _, snippet in automaton.iter(page):
+            found.add(snippet)
+            if len(found) == len(distinct):
+                break
+    else:
+        found = {snippet for snippet in distinct if snippet in page}
+    # "" in page is True, as in the per-snippet check this replaces
+    return [not snippet or snippet in found for snippet in snippets]
+
+
+def fuzzy_ratio(snippet: str, page: str) -> float:
+    """Best match of snippet against any substring of page, in [0, 1] (fuzz.partial_ratio)."""
+    return fuzz.partial_ratio(snippet, page) / 100.0
+
+
+def verify_snippets_in_page(
+    page: str, snippets: Sequence[str], fuzzy_threshold: float, min_fuzzy_length: int
+) -> list[SnippetMatch]:
+    """
+    Verify normalized snippets against one normalized page: exact matches for all of them in one pass, then the
+    fuzzy fallback for each distinct miss at least min_fuzzy_length long (character-level differences only).
+    """
+    exact = find_exact_matches(page, snippets)
+    fuzzy: dict[str, SnippetMatch] = {}
+    matches = []
+    for snippet, is_exact in zip(snippets, exact):
+        if is_exact:
+            matches.append(SnippetMatch(found=True, exact=True))
+        elif len(snippet) >= min_fuzzy_length and page:
+            if snippet not in fuzzy:
+                ratio = fuzzy_ratio(snippet, page)
+                fuzzy[snippet] = SnippetMatch(found=ratio >= fuzzy_threshold, ratio=ratio)
+            matches.append(fuzzy[snippet])
+        else:
+            matches.append(SnippetMatch(found=False))
+    return matches
+
+
+def verify_snippets_in_page_text(
+    page_text: str, snippets: Sequence[str], fuzzy_threshold: float, min_fuzzy_length: int
+) -> list[SnippetMatch]:
+    """
+    verify_snippets_in_page for the page text as fetched: normalized here (cached per process), so a compute pool
+    worker receives each page once and returns only the matches.
+    """
+    return verify_snippets_in_page(normalize_page_text(page_text), snippets, fuzzy_threshold, min_fuzzy_length)
+
+
+@dataclass
+class _PendingPage:
+    snippets: list[str]
+    waiters: list[asyncio.Future]
+
+
+class PageSnippetBatcher:
+    """
+    Groups snippet verifications by page. Concurrent verify(page_text, snippet) calls for the same page text (several
+    statements, or several miners, citing one source; snippets already normalized) are verified together with
+    verify_snippets_in_page_text, so the page is normalized and scanned once for all of their exact matches.
+    A snippet for a page with no batch running is sent on the next loop iteration (no fixed wait; calls made in
+    the same iteration join it); while one is running, further snippets for that page are collected for up to
+    max_wait_secs (or until max_batch_size snippets). run(fn, *args) runs the batch (e.g. on a compute pool);
+    without it, on the event loop.
+    """
+
+    def __init__(
+        self,
+        fuzzy_threshold: float,
+        min_fuzzy_length: int,
+        max_wait_secs: float = 0.005,
+        max_batch_size: int = 64,
+        run: Callable[..., Awaitable] | None = None,
+    ):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_fuzzy_length = min_fuzzy_length
+        self.max_wait_secs = max_wait_secs
+        self.max_batch_size = max_batch_size
+        self.run = run
+        self._pending: dict[str, _PendingPage] = {}
+        self._flush_handles: dict[str, asyncio.Handle] = {}
+        self._running: dict[str, int] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.snippets = 0
+
+    async def verify(self, page: str, snippet: str) -> SnippetMatch:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.get(page)
+        if pending is None:
+            pending = self._pending[page] = _PendingPage([], [])
+            if self._running.get(page):
+                self._flush_handles[page] = loop.call_later(self.max_wait_secs, self._flush, page)
+            else:
+                self._flush_handles[page] = loop.call_soon(self._flush, page)
+        pending.snippets.append(snippet)
+        pending.waiters.append(future)
+        if len(pending.snippets) >= self.max_batch_size:
+            self._flush(page)
+        return await future
+
+    def _flush(self, page: str):
+        handle = self._flush_handles.pop(page, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self._pending.pop(page, None)
+        if pending is None:
+            return
+        self.batches += 1
+        self.snippets += len(pending.snippets)
+        self._running[page] = self._running.get(page, 0) + 1
+        task = asyncio.create_task(self._run_batch(page, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, page: str, pending: _PendingPage):
+        args = (page, pending.snippets, self.fuzzy_threshold, self.min_fuzzy_length)
+        try:
+            if self.run is not None:
+                matches = await self.run(verify_snippets_in_page_text, *args)
+            else:
+                matches = verify_snippets_in_page_text(*args)
+            for waiter, match in zip(pending.waiters, matches):
+                if not waiter.done():
+                    waiter.set_result(match)
+        except Exception as e:
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        finally:
+            self._running[page] -= 1
+            if not self._running[page]:
+                del self._running[page]
+            # Batch task cancelled (shutdown) or its result was short: no caller is left waiting forever
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.cancel()
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "snippets": self.snippets}
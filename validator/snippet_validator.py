@@ -1,18 +1,13 @@
 import time
 import typing
-import unicodedata
+import functools
 from dataclasses import dataclass
 import bittensor as bt
 import tldextract
 import ipaddress
-import re
 import os
 from urllib.parse import urlparse, parse_qs, unquote_plus
 
-# python-Levenshtein required: without it, fuzz.partial_ratio uses a buggy pure-Python path
-# that returns wrong low scores for short-vs-long (snippet vs page).
-from fuzzywuzzy import fuzz
-
 from shared.blacklisted_domain_cache import is_blacklisted_domain
 from shared.exceptions import InsecureProtocolError
 from shared.top_site_cache import is_approved_site
@@ -27,9 +22,16 @@ from validator.context_similarity_validator import calculate_similarity_score
 from validator.domain_validator import domain_is_recently_registered
 from validator.quality_model import score_statement_distribution
 from validator.snippet_fetcher import fetch_entire_page
+from validator.text_normalizer import normalize_page_text, normalize_text
+from validator.snippet_matcher import PageSnippetBatcher, verify_snippets_in_page_text
+from validator.compute_pool import compute_pool, STAGE_EMBEDDING, STAGE_TEXT_MATCH
 from validator.similarity_quality_model import verify_text_similarity, SENTENCE_SIMILARITY_THRESHOLD
 
 from shared.debug_util import DEBUG_LOCAL
+from shared.environment_variables import (
+    USE_SNIPPET_VERIFICATION_BATCHING,
+    SNIPPET_VERIFICATION_BATCH_MAX_WAIT_MS,
+)
 
 from shared.scores import (
     NO_SNIPPET_PROVIDED,
@@ -68,6 +70,14 @@ class StatementExcerptCheckResult:
 FUZZY_VERIFY_THRESHOLD = 0.94  # ratio in [0, 1]; only accept if best match >= this (character-level tolerance only)
 MIN_SNIPPET_LENGTH_FOR_FUZZY = 25  # minimum normalized snippet length to run fuzzy check (avoids trivial matches)
 
+# Snippets citing the same page around the same time (statements of one response, or several miners) are verified together
+snippet_batcher = PageSnippetBatcher(
+    FUZZY_VERIFY_THRESHOLD,
+    MIN_SNIPPET_LENGTH_FOR_FUZZY,
+    max_wait_secs=SNIPPET_VERIFICATION_BATCH_MAX_WAIT_MS / 1000,
+    run=functools.partial(compute_pool.run, STAGE_TEXT_MATCH),
+)
+
 class SnippetValidator:
 
     def _extract_assessment_signals(self, assessment_result: dict) -> dict:
@@ -160,43 +170,31 @@ class SnippetValidator:
         self, request_id: str, miner_uid: int, page_text: str, snippet_text: str, url: str
     ) -> bool:
         try:
-            def normalize_text(text):
-                # Unicode normalization: same character, different bytes (e.g. quotes, accents, compatibility variants)
-                text = unicodedata.normalize("NFKC", text or "")
-                # Remove patterns like [ 1 ], [12], [ 123 ]
-                text = re.sub(r"\[\s*\d+\s*\]", '', text)
-                # Standardize quotes
-                text = re.sub(r'["“”‘’`´]', "'", text)
-                # Standardize dashes
-                text = re.sub(r'[–—−]', '-', text)
-                # Remove or standardize other punctuation (keep only alphanumerics, spaces, hyphens, and single quotes)
-                text = re.sub(r"[^\w\s'-]", '', text)
-                # Convert to lowercase
-                text = text.lower()
-                # Normalize whitespace: replace multiple spaces with a single space, strip leading/trailing
-                text = re.sub(r'\s+', ' ', text).strip()
-                return text
-
             try:
                 normalized_snippet = normalize_text(snippet_text)
-                normalized_page = normalize_text(page_text)
                 if DEBUG_LOCAL:
                     bt.logging.info(f"{request_id} | {miner_uid} | {url} | Normalised text:{normalized_snippet}")
-                    self.write_file(request_id, normalized_page)
-
-                if normalized_snippet in normalized_page:
+                    self.write_file(request_id, normalize_page_text(page_text))
+
+                # Exact match, then fuzzy fallback: same text with character-level differences only (no paraphrase).
+                # The page is normalized and matched in one compute pool call
+                if USE_SNIPPET_VERIFICATION_BATCHING:
+                    match = await snippet_batcher.verify(page_text, normalized_snippet)
+                else:
+                    match = (await compute_pool.run(
+                        STAGE_TEXT_MATCH, verify_snippets_in_page_text,
+                        page_text, [normalized_snippet], FUZZY_VERIFY_THRESHOLD, MIN_SNIPPET_LENGTH_FOR_FUZZY,
+                    ))[0]
+
+                if match.exact:
                     bt.logging.info(f"{request_id} | {miner_uid} | {url} | Web page is EXACTLY the same as the snippet (normalized).")
                     return True
 
-                # Fuzzy fallback: same text with character-level differences only (no paraphrase)
-                if len(normalized_snippet) >= MIN_SNIPPET_LENGTH_FOR_FUZZY and normalized_page:
-                    # partial_ratio: best match of snippet against any substring of page (0-100)
-                    ratio = fuzz.partial_ratio(normalized_snippet, normalized_page) / 100.0
-                    if ratio >= FUZZY_VERIFY_THRESHOLD:
-                        bt.logging.info(
-                            f"{request_id} | {miner_uid} | {url} | Snippet verified via fuzzy match (ratio={ratio:.2f}, threshold={FUZZY_VERIFY_THRESHOLD})."
-                        )
-                        return True
+                if match.found:
+                    bt.logging.info(
+                        f"{request_id} | {miner_uid} | {url} | Snippet verified via fuzzy match (ratio={match.ratio:.2f}, threshold={FUZZY_VERIFY_THRESHOLD})."
+                    )
+                    return True
 
                 bt.logging.info(f"{request_id} | {miner_uid} | {url} | Web page is NOT exactly the same as the snippet (normalized)")
                 return False
@@ -750,16 +748,18 @@ class SnippetValidator:
                 cleaning_html_time_taken_secs=fetch_result.cleaning_html_time_secs,
                 fetch_by_http_status=fetch_result.fetch_by_http_status,
                 fetch_by_selenium_status=fetch_result.fetch_by_selenium_status,
+                page_truncated=fetch_result.truncated,
                 timing=self._make_statement_timing(
                     0, fetch_page_time_taken_secs, 0.0,
                     http_secs, selenium_secs, total_secs,
                     fetch_result.cleaning_html_time_secs,
                     fetch_result.fetch_by_http_status, fetch_result.fetch_by_selenium_status,
+                    fetch_result=fetch_result,
                 ),
             )
             return vericore_miner_response
 
-        if is_search_web_page(page_text):
+        if await compute_pool.run(STAGE_EMBEDDING, is_search_web_page, page_text):
             snippet_score = IS_SEARCH_WEB_PAGE
             return VericoreStatementResponse(
                 url=miner_evidence.url,
@@ -778,11 +778,13 @@ class SnippetValidator:
                 cleaning_html_time_taken_secs=fetch_result.cleaning_html_time_secs,
                 fetch_by_http_status=fetch_result.fetch_by_http_status,
                 fetch_by_selenium_status=fetch_result.fetch_by_selenium_status,
+                page_truncated=fetch_result.truncated,
                 timing=self._make_statement_timing(
                     0, fetch_page_time_taken_secs, 0.0,
                     http_secs, selenium_secs, total_secs,
                     fetch_result.cleaning_html_time_secs,
                     fetch_result.fetch_by_http_status, fetch_result.fetch_by_selenium_status,
+                    fetch_result=fetch_result,
                 ),
             )
 
@@ -828,11 +830,13 @@ class SnippetValidator:
                     cleaning_html_time_taken_secs=fetch_result.cleaning_html_time_secs,
                     fetch_by_http_status=fetch_result.fetch_by_http_status,
                     fetch_by_selenium_status=fetch_result.fetch_by_selenium_status,
+                    page_truncated=fetch_result.truncated,
                     timing=self._make_statement_timing(
                         0, fetch_page_time_taken_secs, assess_statement_time_taken_secs,
                         http_secs, selenium_secs, total_secs,
                         fetch_result.cleaning_html_time_secs,
                         fetch_result.fetch_by_http_status, fetch_result.fetch_by_selenium_status,
+                        fetch_result=fetch_result,
                     ),
                 )
             elif snippet_result == "FAKE":
@@ -857,11 +861,13 @@ class SnippetValidator:
                     cleaning_html_time_taken_secs=fetch_result.cleaning_html_time_secs,
                     fetch_by_http_status=fetch_result.fetch_by_http_status,
                     fetch_by_selenium_status=fetch_result.fetch_by_selenium_status,
+                    page_truncated=fetch_result.truncated,
                     timing=self._make_statement_timing(
                         0, fetch_page_time_taken_secs, assess_statement_time_taken_secs,
                         http_secs, selenium_secs, total_secs,
                         fetch_result.cleaning_html_time_secs,
                         fetch_result.fetch_by_http_status, fetch_result.fetch_by_selenium_status,
+                        fetch_result=fetch_result,
                     ),
                 )
             elif is_search_url:
@@ -886,11 +892,13 @@ class SnippetValidator:
                     cleaning_html_time_taken_secs=fetch_result.cleaning_html_time_secs,
                     fetch_by_http_status=fetch_result.fetch_by_http_status,
                     fetch_by_selenium_status=fetch_result.fetch_by_selenium_status,
+                    page_truncated=fetch_result.truncated,
                     timing=self._make_statement_timing(
                         0, fetch_page_time_taken_secs, assess_statement_time_taken_secs,
                         http_secs, selenium_secs, total_secs,
                         fetch_result.cleaning_html_time_secs,
                         fetch_result.fetch_by_http_status, fetch_result.fetch_by_selenium_status,
+                        fetch_result=fetch_result,
                     ),
                 )
 
@@ -927,16 +935,20 @@ class SnippetValidator:
                 cleaning_html_time_taken_secs=fetch_result.cleaning_html_time_secs,
                 fetch_by_http_status=fetch_result.fetch_by_http_status,
                 fetch_by_selenium_status=fetch_result.fetch_by_selenium_status,
+                page_truncated=fetch_result.truncated,
                 timing=self._make_statement_timing(
                     0, fetch_page_time_taken_secs, assess_statement_time_taken_secs,
                     http_secs, selenium_secs, total_secs,
                     fetch_result.cleaning_html_time_secs,
                     fetch_result.fetch_by_http_status, fetch_result.fetch_by_selenium_status,
+                    fetch_result=fetch_result,
                 ),
             )
             return vericore_miner_response
 
-        context_similarity_score = calculate_similarity_score(
+        context_similarity_score = await compute_pool.run(
+            STAGE_EMBEDDING,
+            calculate_similarity_score,
             statement=original_statement.strip(),
             excerpt=miner_evidence.excerpt
         )
@@ -1004,11 +1016,13 @@ class SnippetValidator:
             cleaning_html_time_taken_secs=fetch_result.cleaning_html_time_secs,
             fetch_by_http_status=fetch_result.fetch_by_http_status,
             fetch_by_selenium_status=fetch_result.fetch_by_selenium_status,
+            page_truncated=fetch_result.truncated,
             timing=self._make_statement_timing(
                 0, fetch_page_time_taken_secs, assess_statement_time_taken_secs,
                 http_secs, selenium_secs, total_secs,
                 fetch_result.cleaning_html_time_secs,
                 fetch_result.fetch_by_http_status, fetch_result.fetch_by_selenium_status,
+                fetch_result=fetch_result,
             ),
         )
         other_time = total_time - fetch_page_time_taken_secs - assess_statement_time_taken_secs
@@ -1042,8 +1056,13 @@ class SnippetValidator:
         cleaning_secs: float,
         http_status: str,
         selenium_status: str,
+        fetch_result: FetchPageResult | None = None,
     ) -> StatementResponseTiming:
-        """Build StatementResponseTiming for web snippet responses. Reusable for consistent timing shape."""
+        """
+        Build StatementResponseTiming for web snippet responses. Reusable for consistent timing shape.
+        fetch_result (when given) supplies the connection setup breakdown of the HTTP fetch.
+        """
+        fetch_result = fetch_result or FetchPageResult()
         return StatementResponseTiming(
             verify_miner_time_taken_secs=verify_secs,
             fetch_page_time_taken_secs=fetch_page_secs,
@@ -1054,6 +1073,10 @@ class SnippetValidator:
             cleaning_html_time_taken_secs=cleaning_secs,
             fetch_by_http_status=http_status,
             fetch_by_selenium_status=selenium_status,
+            http_dns_secs=fetch_result.http_dns_secs,
+            http_connect_secs=fetch_result.http_connect_secs,
+            http_tls_secs=fetch_result.http_tls_secs,
+            selenium_pool_wait_secs=fetch_result.selenium_pool_wait_secs,
         )
 
 
@@ -0,0 +1,113 @@
+import re
+import sys
+import unicodedata
+from collections import OrderedDict
+
+from shared.environment_variables import NORMALIZED_TEXT_CACHE_MAX_BYTES
+
+# Citation markers like [ 1 ], [12], [ 123 ]
+_CITATION_RE = re.compile(r"\[\s*\d+\s*\]")
+# Everything but alphanumerics, whitespace, hyphens and single quotes
+_PUNCTUATION_RE = re.compile(r"[^\w\s'-]")
+
+_QUOTES = '"“”‘’`´'
+_DASHES = "–—−"
+
+
+class _NormalizeTable(dict):
+    """
+    str.translate table doing the quote, dash and punctuation passes in one: quotes -> ', dashes -> -, other
+    punctuation (anything _PUNCTUATION_RE matches) deleted, everything else kept. Characters are classified on
+    first sight and remembered, so the regex only ever runs once per distinct character.
+    """
+
+    def __missing__(self, codepoint: int):
+        value = None if _PUNCTUATION_RE.match(chr(codepoint)) else codepoint
+        self[codepoint] = value
+        return value
+
+
+_TABLE = _NormalizeTable({ord(c): "'" for c in _QUOTES})
+_TABLE.update({ord(c): "-" for c in _DASHES})
+
+
+def normalize_text(text: str | None) -> str:
+    """
+    Text as compared by snippet verification: NFKC, citation markers removed, quotes and dashes standardized,
+    other punctuation removed, lowercased, whitespace collapsed to single spaces and stripped.
+    """
+    # Unicode normalization: same character, different bytes (e.g. quotes, accents, compatibility variants)
+    text = unicodedata.normalize("NFKC", text or "")
+    # Citation markers go first: removing the brackets as punctuation would leave their digits behind
+    if "[" in text:
+        text = _CITATION_RE.sub("", text)
+    text = text.translate(_TABLE).lower()
+    # str.split() splits on exactly the characters \s matches
+    return " ".join(text.split())
+
+
+class NormalizedTextCache:
+    """
+    LRU of normalize_text() results keyed by the page text itself (its hash is computed once per str and then
+    cached by Python, lookups confirm by equality), bounded by the total size of the cached strings.
+    Five snippets citing the same page normalize it once.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[str, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str | None) -> str | None:
+        """Cached normalize_text(text), or None."""
+        entry = self._entries.get(text or "")
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(text or "")
+        self.hits += 1
+        return entry[0]
+
+    def put(self, text: str | None, normalized: str):
+        text = text or ""
+        size = sys.getsizeof(text) + sys.getsizeof(normalized)
+        if size > self.max_bytes or text in self._entries:
+            return
+        self._entries[text] = (normalized, size)
+        self._total_bytes += size
+        while self._total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+
+    def normalize(self, text: str | None) -> str:
+        normalized = self.get(text)
+        if normalized is None:
+            normalized = normalize_text(text)
+            self.put(text, normalized)
+        return normalized
+
+    def clear(self):
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+page_text_cache = NormalizedTextCache(NORMALIZED_TEXT_CACHE_MAX_BYTES)
+
+
+def normalize_page_text(text: str | None) -> str:
+    """normalize_text() for page text, cached per page for the life of the process (see NormalizedTextCache)."""
+    return page_text_cache.normalize(text)
+
+
+def page_text_cache_stats() -> dict:
+    return page_text_cache.stats()
@@ -0,0 +1,246 @@
+import gzip
+import json
+import time
+import base64
+import asyncio
+import hashlib
+import threading
+from dataclasses import dataclass
+
+import httpx
+import bittensor as bt
+
+TRAFFIC_MODE_LIVE = "live"  # fetch from the web (default)
+TRAFFIC_MODE_RECORD = "record"  # fetch from the web and append every response to the archive
+TRAFFIC_MODE_REPLAY = "replay"  # serve every fetch from the archive, no network at all
+TRAFFIC_MODES = (TRAFFIC_MODE_LIVE, TRAFFIC_MODE_RECORD, TRAFFIC_MODE_REPLAY)
+
+# Headers that describe the encoded body, dropped when only the decoded body is available
+DECODED_BODY_HEADERS = ("content-encoding", "content-length")
+
+# Pseudo-method for pages rendered by the Selenium fallback (there is no HTTP exchange to record)
+SELENIUM_METHOD = "SELENIUM"
+
+
+@dataclass
+class ArchivedResponse:
+    method: str
+    url: str
+    request_body_sha1: str  # "" for requests without a body; POSTs to the parser API differ only by body
+    status_code: int
+    headers: list[tuple[str, str]]  # as received: body still content-encoded
+    body: bytes  # as far as the reader consumed it (a capped or skipped read records a cut-short body)
+    elapsed_secs: float  # request sent -> response closed
+    http_version: str = "HTTP/1.1"
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.method, self.url, self.request_body_sha1
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "method": self.method,
+            "url": self.url,
+            "request_body_sha1": self.request_body_sha1,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "body": base64.b64encode(self.body).decode("ascii"),
+            "elapsed_secs": self.elapsed_secs,
+            "http_version": self.http_version,
+        })
+
+    @classmethod
+    def from_json(cls, line: str) -> "ArchivedResponse":
+        data = json.loads(line)
+        return cls(
+            method=data["method"],
+            url=data["url"],
+            request_body_sha1=data.get("request_body_sha1", ""),
+            status_code=int(data["status_code"]),
+            headers=[(name, value) for name, value in data["headers"]],
+            body=base64.b64decode(data["body"]),
+            elapsed_secs=float(data["elapsed_secs"]),
+            http_version=data.get("http_version", "HTTP/1.1"),
+        )
+
+
+def request_body_sha1(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest() if body else ""
+
+
+class TrafficArchive:
+    """
+    Append-only, gzip-compressed JSON-lines file of recorded responses. Each record is flushed as it is written,
+    so an archive cut short by a crash still loads up to its last complete record.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+        self.records = 0
+
+    def append(self, entry: ArchivedResponse):
+        """Blocking (compresses the body): call from a worker thread."""
+        line = entry.to_json() + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self.records += 1
+
+    def load(self) -> dict[tuple[str, str, str], list[ArchivedResponse]]:
+        """All recorded responses grouped by (method, url, request body hash), in recording order."""
+        entries: dict[tuple[str, str, str], list[ArchivedResponse]] = {}
+        count = 0
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = ArchivedResponse.from_json(line)
+                    except (ValueError, KeyError) as e:
+                        bt.logging.warning(f"Traffic archive {self.path}: skipping bad record: {e}")
+                        continue
+                    entries.setdefault(entry.key, []).append(entry)
+                    count += 1
+        except FileNotFoundError:
+            bt.logging.warning(f"Traffic archive {self.path} does not exist, replaying nothing")
+        except (EOFError, gzip.BadGzipFile) as e:
+            bt.logging.warning(f"Traffic archive {self.path} is truncated, replaying the {count} records before it: {e}")
+        bt.logging.info(f"Traffic archive {self.path}: loaded {count} responses for {len(entries)} requests")
+        return entries
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """
+    Raw response body passed through to the reader as it is consumed, archived when the response is closed. Only
+    the bytes the reader actually consumed are recorded: a reader that stops early (body cap, non-HTML skip) never
+    downloads the rest, in record mode as in live mode.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, archive: TrafficArchive, entry: ArchivedResponse, start: float):
+        self.stream = stream
+        self.archive = archive
+        self.entry = entry
+        self.start = start
+        self._chunks: list[bytes] = []
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            self._chunks.append(chunk)
+            yield chunk
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.stream.aclose()
+        finally:
+            self.entry.body = b"".join(self._chunks)
+            self.entry.elapsed_secs = time.perf_counter() - self.start
+            try:
+                await asyncio.to_thread(self.archive.append, self.entry)
+            except Exception as e:
+                bt.logging.warning(f"Traffic archive: could not record {self.entry.method} {self.entry.url}: {e}")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Passes requests through to transport and archives every response (each redirect hop separately). The body is
+    recorded from the stream as the caller reads it, so capped and skipped reads behave as they do live.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, archive: TrafficArchive):
+        self.transport = transport
+        self.archive = archive
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body_sha1 = request_body_sha1(await request.aread())
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        headers = list(response.headers.multi_items())
+        http_version = response.extensions.get("http_version", b"HTTP/1.1")
+        entry = ArchivedResponse(
+            method=request.method,
+            url=str(request.url),
+            request_body_sha1=body_sha1,
+            status_code=response.status_code,
+            headers=headers,
+            body=b"",
+            elapsed_secs=0.0,
+            http_version=http_version.decode("ascii", "replace") if isinstance(http_version, bytes) else str(http_version),
+        )
+        if response.is_stream_consumed:
+            # Already read (and decoded) by the wrapped transport: archive the decoded body
+            entry.headers = [(name, value) for name, value in headers if name.lower() not in DECODED_BODY_HEADERS]
+            stream = _RecordingStream(httpx.ByteStream(response.content), self.archive, entry, start)
+        else:
+            # Raw bytes: decompression happens above the transport, in replay as it did live
+            stream = _RecordingStream(response.stream, self.archive, entry, start)
+
+        return httpx.Response(
+            response.status_code,
+            headers=entry.headers,
+            stream=stream,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+        self.archive.close()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves requests from recorded responses, never from the network. Each recorded response of a request is
+    served in recording order (so a recorded 403-then-200 replays the same way), the last one repeating.
+    Latencies are the recorded ones times latency_scale (0 = answer immediately).
+    Requests that were never recorded fail with httpx.ConnectError, like an unreachable host.
+    """
+
+    def __init__(self, entries: dict[tuple[str, str, str], list[ArchivedResponse]], latency_scale: float = 1.0):
+        self.entries = entries
+        self.latency_scale = latency_scale
+        self._served: dict[tuple[str, str, str], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def next_response(self, method: str, url: str, body_sha1: str = "") -> ArchivedResponse | None:
+        key = (method, url, body_sha1)
+        recorded = self.entries.get(key)
+        if not recorded:
+            self.misses += 1
+            return None
+        index = self._served.get(key, 0)
+        self._served[key] = index + 1
+        self.hits += 1
+        return recorded[min(index, len(recorded) - 1)]
+
+    async def wait(self, entry: ArchivedResponse):
+        if self.latency_scale > 0 and entry.elapsed_secs > 0:
+            await asyncio.sleep(entry.elapsed_secs * self.latency_scale)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body_sha1 = request_body_sha1(await request.aread())
+        entry = self.next_response(request.method, str(request.url), body_sha1)
+        if entry is None:
+            raise httpx.ConnectError(f"Not in traffic archive: {request.method} {request.url}", request=request)
+        await self.wait(entry)
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            stream=httpx.ByteStream(entry.body),
+            extensions={"http_version": entry.http_version.encode("ascii")},
+        )
+
+    def stats(self) -> dict:
+        return {"requests": len(self.entries), "hits": self.hits, "misses": self.misses}
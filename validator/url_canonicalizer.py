@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click; the page is the same without them
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_hsenc", "_hsmi", "mkt_tok", "ref_src", "ref_url", "cmpid", "ncid", "ocid", "sr_share", "spm",
+})
+TRACKING_PARAM_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+
+# 301 and 308 say "use the new URL from now on"; 302/303/307 are per-request and are not remembered
+PERMANENT_REDIRECT_STATUS_CODES = (301, 308)
+# Longest remembered redirect chain followed by RedirectMemory.resolve
+MAX_REDIRECT_HOPS = 5
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Key under which variants of the same page are cached: https, lower-case host without default port, no fragment,
+    no tracking query parameters (the rest sorted). Only variants that serve the same document are folded: AMP
+    versions and trailing-slash paths can serve different markup, so they keep keys of their own (identical text
+    under several keys is still stored once by the page cache). Only for cache keys: the page is always fetched
+    from a real URL.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.rstrip(".")
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+    return urlunsplit(("https", host, parts.path or "/", urlencode(query), ""))
+
+
+class RedirectMemory:
+    """
+    Permanent redirects seen by the fetcher (canonical source URL -> target URL), so a page that moved is fetched
+    from its new address directly instead of following the same 301 on every fetch. LRU-bounded, entries expire
+    after ttl_secs (sites do undo "permanent" redirects).
+    """
+
+    def __init__(self, max_entries: int = 50000, ttl_secs: float = 24 * 60 * 60):
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self._targets: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self.recorded = 0
+        self.resolved = 0
+
+    def record(self, source_url: str, target_url: str):
+        # Kept even when both share a cache key (http -> https): it still saves the extra hop
+        if source_url == target_url:
+            return
+        source_key = canonicalize_url(source_url)
+        self._targets[source_key] = (target_url, time.monotonic() + self.ttl_secs)
+        self._targets.move_to_end(source_key)
+        self.recorded += 1
+        while len(self._targets) > self.max_entries:
+            self._targets.popitem(last=False)
+
+    def record_history(self, history: list, final_url: str):
+        """Remember the permanent hops of a followed redirect chain (httpx Response.history + the final URL)."""
+        targets = [str(hop.url) for hop in history[1:]] + [final_url]
+        for hop, target_url in zip(history, targets):
+            if hop.status_code in PERMANENT_REDIRECT_STATUS_CODES:
+                self.record(str(hop.url), target_url)
+
+    def _lookup(self, url: str) -> str | None:
+        key = canonicalize_url(url)
+        entry = self._targets.get(key)
+        if entry is None:
+            return None
+        target_url, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._targets[key]
+            return None
+        self._targets.move_to_end(key)
+        return target_url
+
+    def resolve(self, url: str) -> str:
+        """URL to fetch for url: the end of its remembered permanent-redirect chain, or url itself."""
+        resolved = url
+        seen = {canonicalize_url(url)}
+        for _ in range(MAX_REDIRECT_HOPS):
+            target_url = self._lookup(resolved)
+            if target_url is None or target_url == resolved:
+                break
+            resolved = target_url
+            key = canonicalize_url(target_url)
+            if key in seen:
+                # Back at a known key (a loop, or a hop that only changed the scheme)
+                break
+            seen.add(key)
+        if resolved != url:
+            self.resolved += 1
+        return resolved
+
+    def __len__(self):
+        return len(self._targets)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._targets), "recorded": self.recorded, "resolved": self.resolved}